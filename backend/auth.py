@@ -1,32 +1,104 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from database import SessionLocal
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from cache import TTLCache
+from database import get_async_db
+from metrics import stage_duration
 from models import User
+from shared_cache import CACHE_BACKEND, SharedCache
 
 # 설정
 SECRET_KEY = "your-secret-key-here-change-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 비밀번호 해시 전용 스레드 수와 대기열 한도 (실행 중 + 대기 중 작업이 넘치면 429)
+HASH_WORKERS = int(os.getenv("HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", str(HASH_WORKERS * 8)))
+
+# 인증 사용자 캐시 (토큰 subject 기준, 항목 수명은 토큰 만료 시각을 넘지 않음)
+# 이 서버의 ORM 으로 바꾼 사용자는 커밋 시 바로 무효화된다 (CACHE_BACKEND=shared 면 모든 워커에서).
+# 그 밖의 경로(다른 서버, 관리 스크립트, query().update() 같은 일괄 갱신)로 바뀌었거나 무효화와
+# 동시에 진행 중이던 조회가 이전 값을 다시 넣은 경우에는 최대 USER_CACHE_TTL 초 동안 이전 값이 보인다.
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "60"))  # 초
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+# CACHE_BACKEND=shared 일 때 칸 크기 (pickle 한 User 가 이보다 크면 캐시하지 않음)
+USER_CACHE_SLOT_BYTES = int(os.getenv("USER_CACHE_SLOT_BYTES", "2048"))
+# 서명 검증이 끝난 토큰 캐시 크기 (0 이면 사용하지 않음)
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "0"))
+
+# passlib import 와 bcrypt 백엔드 확인이 무거우므로 처음 사용할 때 생성 (get_pwd_context)
+_pwd_context = None
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+if CACHE_BACKEND == "shared":
+    # serve.py 처럼 fork 하는 경우 워커 하나에서 무효화하면 다른 워커도 이전 값을 보지 않도록 공유
+    user_cache = SharedCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL, slot_bytes=USER_CACHE_SLOT_BYTES)
+else:
+    user_cache = TTLCache(maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL)
+token_cache = TTLCache(maxsize=TOKEN_CACHE_SIZE, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60) if TOKEN_CACHE_SIZE > 0 else None
+
+def get_pwd_context():
+    global _pwd_context
+    if _pwd_context is None:
+        from passlib.context import CryptContext
+        _pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_context
 
 def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 def get_password_hash(password):
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
+
+class PasswordHasher:
+    """bcrypt 해시/검증을 이벤트 루프 밖의 제한된 스레드 풀에서 실행
+
+    bcrypt 는 계산 중 GIL 을 놓으므로 스레드만으로 병렬 처리된다.
+    대기열이 가득 차면 작업을 쌓지 않고 바로 429 를 돌려준다.
+    """
+
+    def __init__(self, workers: int = HASH_WORKERS, queue_limit: int = HASH_QUEUE_LIMIT):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(workers + queue_limit)
+
+    async def _run(self, func, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login requests, please retry shortly",
+                headers={"Retry-After": "1"},
+            )
+        # 요청이 취소돼도 실제 해시 작업이 끝날 때 자리를 반환
+        future = self._executor.submit(self._timed, func, *args)
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    @staticmethod
+    def _timed(func, *args):
+        with stage_duration.time("bcrypt"):
+            return func(*args)
+
+    async def hash(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+password_hasher = PasswordHasher()
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode = data.copy()
@@ -38,21 +110,65 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def invalidate_user(email: str):
+    """사용자 정보가 바뀌었을 때 캐시에서 제거 (SQLAlchemy 이벤트는 쓰기를 한 프로세스에서만 발생)"""
+    user_cache.delete(email)
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(mapper, connection, target):
+    # 이메일이 바뀐 경우 이전 이메일 항목도 제거 (query().update() 같은 일괄 갱신은 감지하지 못함)
+    history = inspect(target).attrs.email.history
+    for email in [target.email, *(history.deleted or ())]:
+        invalidate_user(email)
+
+def decode_token(token: str) -> dict:
+    """JWT 서명/만료 검증 후 payload 반환 (토큰 캐시 사용 시 검증 결과 재사용)"""
+    if token_cache is not None:
+        payload = token_cache.get(token)
+        if payload is not None and payload["exp"] > time.time():
+            return payload
+    
+    payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    if token_cache is not None and "exp" in payload:
+        token_cache.set(token, payload, ttl=payload["exp"] - time.time())
+    return payload
+
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_token(token)
         email: str = payload.get("sub")
         if email is None:
             raise credentials_exception
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == email).first()
+    user = user_cache.get(email)
     if user is None:
+        user = (await db.execute(select(User).where(User.email == email))).scalar_one_or_none()
+        if user is None:
+            raise credentials_exception
+        # 세션과 분리한 읽기 전용 사본을 캐시 (관계 속성은 지연 로딩되지 않음)
+        db.expunge(user)
+        ttl = USER_CACHE_TTL
+        if "exp" in payload:
+            ttl = min(ttl, payload["exp"] - time.time())
+        user_cache.set(email, user, ttl=ttl)
+    
+    if user.is_active is False:
         raise credentials_exception
-    return user
\ No newline at end of file
+    return user
+
+async def get_optional_user(token: Optional[str] = Depends(optional_oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    """로그인한 경우에만 사용자 반환 (토큰이 없거나 유효하지 않으면 None)"""
+    if token is None:
+        return None
+    try:
+        return await get_current_user(token, db)
+    except HTTPException:
+        return None
@@ -0,0 +1,90 @@
+# baseline.py
+"""벤치마크 결과 기준값(baseline) 저장/비교
+
+결과는 {"지표 이름": 값} 평면 딕셔너리로 다루며, 이름 끝으로 좋고 나쁨의 방향을 정한다.
+- *_ns, *_ms, *_mb, *_xref : 작을수록 좋음 (기준보다 tolerance 이상 커지면 회귀)
+- *_rps           : 클수록 좋음 (기준보다 tolerance 이상 작아지면 회귀)
+그 밖의 값(요청 수, 오류 수 등)은 기록만 하고 비교하지 않는다.
+
+기준값은 benchmarks/baselines/<이름>.json 에 측정 환경 정보와 함께 저장한다.
+"""
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+LOWER_IS_BETTER = ("_ns", "_ms", "_mb", "_xref")
+HIGHER_IS_BETTER = ("_rps",)
+
+
+def baseline_path(name: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def save_baseline(name: str, metrics: dict, config: dict):
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    with open(baseline_path(name), "w", encoding="utf-8") as f:
+        json.dump({
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "environment": environment(),
+            "config": config,
+            "metrics": metrics,
+        }, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+    print(f"baseline saved: {baseline_path(name)}")
+
+
+def compare_baseline(name: str, metrics: dict, config: dict, tolerance: float) -> list:
+    """기준값 대비 회귀한 지표 목록 [(이름, 기준값, 현재값, 변화율), ...] (기준 파일이 없으면 빈 목록)"""
+    path = baseline_path(name)
+    if not os.path.exists(path):
+        print(f"baseline not found: {path} (--save-baseline 로 먼저 저장)")
+        return []
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("config") != config:
+        print(f"warning: 기준값과 설정이 다릅니다 baseline={baseline.get('config')} current={config}")
+
+    regressions = []
+    print(f"{'metric':<44} {'baseline':>12} {'current':>12} {'change':>8}")
+    for key, current in sorted(metrics.items()):
+        base = baseline["metrics"].get(key)
+        if not isinstance(base, (int, float)) or not base:
+            continue
+        change = (current - base) / base
+        worse = (key.endswith(LOWER_IS_BETTER) and change > tolerance) or \
+                (key.endswith(HIGHER_IS_BETTER) and change < -tolerance)
+        flag = "  REGRESSION" if worse else ""
+        print(f"{key:<44} {base:>12.3f} {current:>12.3f} {change:>+7.1%}{flag}")
+        if worse:
+            regressions.append((key, base, current, change))
+    return regressions
+
+
+def finish(name: str, metrics: dict, config: dict, save: bool, compare: bool, tolerance: float):
+    """--save-baseline / --compare 처리 (회귀가 있으면 종료 코드 1)"""
+    if save:
+        save_baseline(name, metrics, config)
+    if compare:
+        regressions = compare_baseline(name, metrics, config, tolerance)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {tolerance:.0%}")
+            sys.exit(1)
+        print(f"no regressions beyond {tolerance:.0%}")
+
+
+def add_arguments(parser):
+    parser.add_argument("--save-baseline", action="store_true", help="결과를 기준값으로 저장")
+    parser.add_argument("--compare", action="store_true", help="저장된 기준값과 비교 (회귀 시 종료 코드 1)")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="회귀로 보는 변화율 (기본 25%%)")
@@ -0,0 +1,86 @@
+# bench_db_mix.py
+"""회원가입(/register) + 내 정보(/me) 혼합 동시 부하 테스트
+
+처음에 로그인용 사용자를 하나 만들고, 이후 요청마다 --register-ratio 확률로 새 이메일 가입,
+나머지는 토큰으로 /me 를 호출한다. 같은 옵션으로 변경 전/후 백엔드에 각각 실행해 비교한다.
+
+사용법 (backend 디렉터리에서):
+    uvicorn main:app --port 8000 &
+    python benchmarks/bench_db_mix.py --url http://127.0.0.1:8000 --concurrency 50 --requests 2000
+"""
+import argparse
+import asyncio
+import random
+import statistics
+import time
+import uuid
+
+import httpx
+
+TEST_PASSWORD = "bench-password"
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(url: str, concurrency: int, total: int, register_ratio: float, seed: int):
+    latencies = {"register": [], "me": []}
+    status_counts = {}
+    counter = iter(range(total))
+    rng = random.Random(seed)
+    run_id = uuid.uuid4().hex[:8]
+
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        email = f"bench-{run_id}@example.com"
+        await client.post("/register", json={"email": email, "name": "bench", "password": TEST_PASSWORD})
+        response = await client.post("/token", data={"username": email, "password": TEST_PASSWORD})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+        async def worker():
+            for i in counter:
+                start = time.perf_counter()
+                if rng.random() < register_ratio:
+                    kind = "register"
+                    response = await client.post("/register", json={
+                        "email": f"bench-{run_id}-{i}@example.com", "name": "bench", "password": TEST_PASSWORD
+                    })
+                else:
+                    kind = "me"
+                    response = await client.get("/me", headers=headers)
+                latencies[kind].append(time.perf_counter() - start)
+                key = f"{kind}:{response.status_code}"
+                status_counts[key] = status_counts.get(key, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return latencies, status_counts, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--register-ratio", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    latencies, status_counts, elapsed = asyncio.run(
+        run(args.url, args.concurrency, args.requests, args.register_ratio, args.seed)
+    )
+    total = sum(len(values) for values in latencies.values())
+    print(f"requests={total} concurrency={args.concurrency} elapsed={elapsed:.1f}s "
+          f"throughput={total / elapsed:.1f} req/s")
+    print(f"status={dict(sorted(status_counts.items()))}")
+    for kind, values in latencies.items():
+        if values:
+            print(f"{kind:<9} n={len(values):<6} p50={statistics.median(values) * 1000:.1f}ms "
+                  f"p99={percentile(values, 99) * 1000:.1f}ms max={max(values) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
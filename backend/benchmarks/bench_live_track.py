@@ -0,0 +1,196 @@
+# bench_live_track.py
+"""실시간 위치 추적(/ws/track) 부하 테스트
+
+uvicorn 서버 프로세스를 띄우고 --tracks 개의 WebSocket 연결을 동시에 열어, 연결마다
+보행 속도(--speed-mps)로 무작위로 걷는 경로의 GPS 좌표를 --interval 초마다 보낸다.
+(--batch 개씩 모아 보내면 단말이 좌표를 모아 보내는 경우를 흉내 낸다.)
+
+결과:
+- 서버가 처리한 좌표 수 / 서버 프로세스 CPU 시간 = CPU 코어 1개당 초당 처리 좌표 수
+  (부하 생성기와 서버가 같은 CPU 를 나눠 쓰더라도 서버가 쓴 CPU 시간만으로 나눔)
+- 실제 처리량, 칸 이동/알림 수, 연결 유지 중 서버 메모리
+
+사용법 (backend 디렉터리에서):
+    python benchmarks/bench_live_track.py --tracks 2000 --duration 20
+    python benchmarks/bench_live_track.py --compare
+    python benchmarks/bench_live_track.py --save-baseline
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+import websockets
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from baseline import add_arguments, finish  # noqa: E402
+from bench_mixed_load import SEOUL_CORE, process_memory_mb, wait_ready  # noqa: E402
+
+METERS_PER_DEGREE = 111_320.0
+# 동시에 연결을 여는 최대 수 (한꺼번에 열면 accept 대기열이 넘침)
+CONNECT_CONCURRENCY = 100
+
+
+def server_cpu_seconds(pid: int) -> float:
+    """프로세스 사용자 + 커널 CPU 시간 (/proc/<pid>/stat)"""
+    with open(f"/proc/{pid}/stat") as f:
+        # 두 번째 필드(실행 파일 이름)에 공백이 있을 수 있어 마지막 ')' 뒤부터 나눔
+        fields = f.read().rsplit(")", 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+
+class Walker:
+    """무작위 보행 경로 (몇 걸음마다 방향을 조금씩 바꿈)"""
+
+    def __init__(self, rng: random.Random, speed_mps: float):
+        min_lat, min_lng, max_lat, max_lng = SEOUL_CORE
+        self.rng = rng
+        self.lat, self.lng = rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng)
+        self.heading = rng.uniform(0, 2 * math.pi)
+        self.speed = speed_mps
+
+    def step(self, seconds: float) -> dict:
+        self.heading += self.rng.gauss(0, 0.3)
+        meters = self.speed * seconds
+        self.lat += meters * math.cos(self.heading) / METERS_PER_DEGREE
+        self.lng += meters * math.sin(self.heading) / (METERS_PER_DEGREE * math.cos(math.radians(self.lat)))
+        # GPS 오차 (약 5m)
+        return {"lat": self.lat + self.rng.gauss(0, 5) / METERS_PER_DEGREE,
+                "lng": self.lng + self.rng.gauss(0, 5) / METERS_PER_DEGREE}
+
+
+async def open_tracks(url: str, count: int) -> list:
+    semaphore = asyncio.Semaphore(CONNECT_CONCURRENCY)
+
+    async def connect():
+        async with semaphore:
+            return await websockets.connect(url, max_queue=None, ping_interval=None)
+
+    return await asyncio.gather(*(connect() for _ in range(count)))
+
+
+async def run_track(websocket, walker: Walker, interval: float, batch: int, stop_at: float, totals: dict):
+    """stop_at 까지 interval 초마다 좌표 batch 개를 보내고, 받은 메시지를 종류별로 셈"""
+
+    async def receive():
+        async for message in websocket:
+            kind = json.loads(message)["type"]
+            totals[kind] = totals.get(kind, 0) + 1
+
+    receiver = asyncio.create_task(receive())
+    # 연결마다 보내는 시점을 흩어 놓음
+    await asyncio.sleep(walker.rng.uniform(0, interval))
+    while time.monotonic() < stop_at:
+        fixes = [walker.step(interval / batch) for _ in range(batch)]
+        await websocket.send(json.dumps(fixes if batch > 1 else fixes[0]))
+        totals["sent"] += batch
+        await asyncio.sleep(interval)
+    # 마지막으로 보낸 좌표의 응답을 받을 시간
+    await asyncio.sleep(0.5)
+    receiver.cancel()
+
+
+async def drive(url: str, server_pid: int, args) -> dict:
+    rng = random.Random(args.seed)
+    walkers = [Walker(random.Random(rng.random()), args.speed_mps) for _ in range(args.tracks)]
+    opened = time.perf_counter()
+    connections = await open_tracks(f"ws://{url}/ws/track", args.tracks)
+    connect_seconds = time.perf_counter() - opened
+
+    async with httpx.AsyncClient(base_url=f"http://{url}", timeout=30) as client:
+        before = (await client.get("/cache-stats")).json()["live_tracks"]
+        cpu_before = server_cpu_seconds(server_pid)
+        totals = {"sent": 0}
+        start = time.perf_counter()
+        stop_at = time.monotonic() + args.duration
+        await asyncio.gather(*(run_track(websocket, walker, args.interval, args.batch, stop_at, totals)
+                               for websocket, walker in zip(connections, walkers)))
+        elapsed = time.perf_counter() - start
+        cpu_seconds = server_cpu_seconds(server_pid) - cpu_before
+        after = (await client.get("/cache-stats")).json()["live_tracks"]
+        rss_mb, _ = process_memory_mb(server_pid)
+    await asyncio.gather(*(websocket.close() for websocket in connections))
+
+    counts = {key: after[key] - before[key] for key in ("fixes", "cell_changes", "alerts", "rejected")}
+    return {
+        "connect_seconds": connect_seconds,
+        "elapsed": elapsed,
+        "cpu_seconds": cpu_seconds,
+        "rss_mb": rss_mb,
+        "sent": totals["sent"],
+        "errors": totals.get("error", 0),
+        **counts,
+    }
+
+
+def run_uvicorn(args, env: dict) -> dict:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(args.port), "--log-level", "warning",
+         "--backlog", "4096"],
+        cwd=BACKEND_DIR, env={**os.environ, **env},
+    )
+    try:
+        url = f"127.0.0.1:{args.port}"
+        wait_ready(f"http://{url}", "/ready")
+        return asyncio.run(drive(url, server.pid, args))
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tracks", type=int, default=2000)
+    parser.add_argument("--duration", type=float, default=20, help="측정 시간 (초)")
+    parser.add_argument("--interval", type=float, default=1.0, help="연결마다 메시지를 보내는 간격 (초)")
+    parser.add_argument("--batch", type=int, default=1, help="메시지 하나에 담는 좌표 수")
+    parser.add_argument("--speed-mps", type=float, default=1.4, help="보행 속도 (m/s)")
+    parser.add_argument("--port", type=int, default=8110)
+    parser.add_argument("--seed", type=int, default=1)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-live-track-")
+    env = {
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        "RISK_TILE_CACHE_DIR": os.path.join(workdir, "tiles"),
+        "LOG_LEVEL": "WARNING",
+    }
+    result = run_uvicorn(args, env)
+
+    fixes_per_core = result["fixes"] / result["cpu_seconds"] if result["cpu_seconds"] else 0.0
+    throughput = result["fixes"] / result["elapsed"]
+    metrics = {
+        "fixes_per_core_rps": round(fixes_per_core, 1),
+        "fixes_per_sec": round(throughput, 1),
+        "rss_mb": round(result["rss_mb"], 1),
+        "fixes": result["fixes"],
+        "cell_changes": result["cell_changes"],
+        "alerts": result["alerts"],
+        "errors": result["errors"] + result["rejected"],
+    }
+    print(f"tracks={args.tracks} interval={args.interval}s batch={args.batch} connect={result['connect_seconds']:.1f}s "
+          f"elapsed={result['elapsed']:.1f}s")
+    print(f"sent={result['sent']} processed={result['fixes']} cell_changes={result['cell_changes']} "
+          f"alerts={result['alerts']} errors={metrics['errors']}")
+    print(f"throughput={throughput:.0f} fixes/s server_cpu={result['cpu_seconds']:.2f}s "
+          f"-> {fixes_per_core:.0f} fixes/s per core, rss={result['rss_mb']:.0f}MB")
+
+    config = {"tracks": args.tracks, "duration": args.duration, "interval": args.interval, "batch": args.batch,
+              "speed_mps": args.speed_mps, "seed": args.seed}
+    finish("live_track", metrics, config, args.save_baseline, args.compare, args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# bench_login_load.py
+"""로그인 폭주 중 처리량과 다른 API 지연 측정
+
+테스트 사용자로 /token 로그인을 동시에 보내면서, 같은 시간 동안 /predict-risk 를
+일정 간격으로 호출해 지연 분포를 잰다. bcrypt 가 이벤트 루프를 막으면 /predict-risk 의
+꼬리 지연이 로그인 시간만큼 늘어난다.
+
+사용법 (backend 디렉터리에서):
+    uvicorn main:app --port 8000 &
+    python benchmarks/bench_login_load.py --url http://127.0.0.1:8000 --concurrency 32 --logins 200
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+TEST_EMAIL = "bench-login@example.com"
+TEST_PASSWORD = "bench-password"
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(url: str, concurrency: int, total: int, probe_interval: float):
+    login_latencies = []
+    probe_latencies = []
+    status_counts = {}
+    counter = iter(range(total))
+    done = asyncio.Event()
+
+    async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+        # 이미 있으면 400 이므로 결과는 무시
+        await client.post("/register", json={"email": TEST_EMAIL, "name": "bench", "password": TEST_PASSWORD})
+
+        async def login_worker():
+            for _ in counter:
+                start = time.perf_counter()
+                response = await client.post("/token", data={"username": TEST_EMAIL, "password": TEST_PASSWORD})
+                login_latencies.append(time.perf_counter() - start)
+                status_counts[response.status_code] = status_counts.get(response.status_code, 0) + 1
+
+        async def probe():
+            while not done.is_set():
+                start = time.perf_counter()
+                await client.post("/predict-risk", json={"latitude": 37.5665, "longitude": 126.9780})
+                probe_latencies.append(time.perf_counter() - start)
+                await asyncio.sleep(probe_interval)
+
+        probe_task = asyncio.create_task(probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(login_worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        await probe_task
+
+    return login_latencies, probe_latencies, status_counts, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--probe-interval-ms", type=float, default=10)
+    args = parser.parse_args()
+
+    logins, probes, status_counts, elapsed = asyncio.run(
+        run(args.url, args.concurrency, args.logins, args.probe_interval_ms / 1000)
+    )
+    succeeded = status_counts.get(200, 0)
+    print(f"logins={len(logins)} concurrency={args.concurrency} status={dict(sorted(status_counts.items()))}")
+    print(f"login throughput={succeeded / elapsed:.1f} ok/s "
+          f"p50={statistics.median(logins) * 1000:.1f}ms p99={percentile(logins, 99) * 1000:.1f}ms")
+    print(f"/predict-risk during logins: n={len(probes)} "
+          f"p50={statistics.median(probes) * 1000:.1f}ms p99={percentile(probes, 99) * 1000:.1f}ms "
+          f"max={max(probes) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
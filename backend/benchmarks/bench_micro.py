@@ -0,0 +1,125 @@
+# bench_micro.py
+"""경로/거리 계산 함수 마이크로 벤치마크
+
+시드 고정으로 만든 위험지역 --sizes 개에 대해 다음 함수의 1회 호출 시간을 잰다.
+- calculate_distance       : 한 지점에서 모든 위험지역까지 (호출 1회당)
+- is_point_near_line       : 모든 위험지역이 한 선분 근처인지 (호출 1회당)
+- generate_safe_waypoints  : 출발/도착 쌍 하나에 대해 위험지역 전체로 우회점 생성
+- estimate_travel_time     : 위 결과 경유지 목록의 소요 시간
+
+각 항목은 timeit 으로 --repeat 번 반복한 중 최솟값(ns)이다. 공유 CPU 에서는 같은 코드도 실행마다
+시간이 크게 흔들리므로, 매 반복 직전에 고정 참조 루프를 함께 재서 "참조 루프 대비 배수"(*_xref)를
+기준값 비교에 쓰고 ns 값(*_ns_raw)은 참고용으로만 기록한다.
+
+사용법 (backend 디렉터리에서):
+    python benchmarks/bench_micro.py --sizes 10 100 1000 10000
+    python benchmarks/bench_micro.py --compare          # 저장된 기준값 대비 회귀 확인
+    python benchmarks/bench_micro.py --save-baseline    # 현재 결과를 기준값으로 저장
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import tempfile
+import timeit
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from baseline import add_arguments, finish  # noqa: E402
+from bench_zone_index import make_zones  # noqa: E402
+
+
+def import_app():
+    """main 모듈 import (DB/타일 캐시는 임시 디렉터리 사용)"""
+    workdir = tempfile.mkdtemp(prefix="bench-micro-")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(workdir, 'bench.db')}")
+    os.environ.setdefault("RISK_TILE_CACHE_DIR", os.path.join(workdir, "tiles"))
+    import main
+    return main
+
+
+def reference_loop():
+    """CPU 속도 보정용 고정 작업 (순수 파이썬 산술 루프)"""
+    total = 0.0
+    for i in range(200):
+        total += math.sin(i) * 1.0001
+    return total
+
+
+def per_call_ns(func, repeat: int) -> tuple:
+    """(1회 호출 ns, 참조 루프 대비 배수) - 둘 다 반복 중 최솟값"""
+    timer, reference = timeit.Timer(func), timeit.Timer(reference_loop)
+    number, _ = timer.autorange()
+    reference_number, _ = reference.autorange()
+    timings, ratios = [], []
+    for _ in range(repeat):
+        reference_ns = reference.timeit(reference_number) / reference_number
+        elapsed = timer.timeit(number) / number
+        timings.append(elapsed * 1e9)
+        ratios.append(elapsed / reference_ns)
+    return min(timings), min(ratios)
+
+
+def run(sizes: list, repeat: int, seed: int) -> dict:
+    app = import_app()
+    rng = random.Random(seed)
+    results = {}
+
+    print(f"{'zones':>8} {'distance(ns)':>13} {'near_line(ns)':>14} {'waypoints(us)':>14} "
+          f"{'travel_time(us)':>16} {'detours':>8}")
+    for size in sizes:
+        zones = make_zones(size, seed=seed)
+        lat, lng = rng.uniform(37.45, 37.65), rng.uniform(126.85, 127.15)
+        # 출발/도착 중간점이 위험지역 근처에 오도록 잡아 우회점이 생기게 함
+        center = zones[0]
+        start = (center["lat"] - 0.02, center["lng"] - 0.02)
+        end = (center["lat"] + 0.02, center["lng"] + 0.02)
+        waypoints = app.generate_safe_waypoints(start[0], start[1], end[0], end[1], zones)
+
+        def distances():
+            for zone in zones:
+                app.calculate_distance(lat, lng, zone["lat"], zone["lng"])
+
+        def near_line():
+            for zone in zones:
+                app.is_point_near_line(start[0], start[1], end[0], end[1], zone["lat"], zone["lng"], 0.5)
+
+        measured = {
+            "calculate_distance": per_call_ns(distances, repeat),
+            "is_point_near_line": per_call_ns(near_line, repeat),
+            "generate_safe_waypoints": per_call_ns(
+                lambda: app.generate_safe_waypoints(start[0], start[1], end[0], end[1], zones), repeat),
+            "estimate_travel_time": per_call_ns(lambda: app.estimate_travel_time(waypoints), repeat),
+        }
+        # 위험지역 전체를 도는 두 항목은 지역 1개당 값으로 환산
+        for name in ("calculate_distance", "is_point_near_line"):
+            measured[name] = (measured[name][0] / size, measured[name][1] / size)
+        for name, (ns, ratio) in measured.items():
+            results[f"{name}_{size}_ns_raw"] = round(ns, 1)
+            results[f"{name}_{size}_xref"] = round(ratio, 4)
+        results[f"detour_waypoints_{size}"] = len(waypoints) - 2
+        distance_ns, near_line_ns = measured["calculate_distance"][0], measured["is_point_near_line"][0]
+        waypoints_ns, travel_ns = measured["generate_safe_waypoints"][0], measured["estimate_travel_time"][0]
+        print(f"{size:>8} {distance_ns:>13.0f} {near_line_ns:>14.0f} {waypoints_ns / 1000:>14.1f} "
+              f"{travel_ns / 1000:>16.1f} {len(waypoints) - 2:>8}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--seed", type=int, default=42)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    metrics = run(args.sizes, args.repeat, args.seed)
+    config = {"sizes": args.sizes, "seed": args.seed}
+    finish("micro", metrics, config, args.save_baseline, args.compare, args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+# bench_mixed_load.py
+"""혼합 워크로드 부하 테스트 (앱 내부 호출 / uvicorn 서버)
+
+시드 고정 난수로 아래 비율의 요청을 --concurrency 개 동시 작업자가 보낸다.
+    /predict-risk 60%, /safe-route 20%, /search-location-combined 15%, /token 5%
+검색은 로컬 카카오 스텁(benchmarks/kakao_stub.py)을 별도 프로세스로 띄워 사용하고,
+DB/타일 캐시는 임시 디렉터리에 만든다.
+
+--mode inprocess : 같은 프로세스에서 httpx.ASGITransport 로 앱을 직접 호출 (네트워크/서버 비용 제외)
+--mode uvicorn   : uvicorn 서버 프로세스를 띄워 HTTP 로 호출
+
+결과: 전체 처리량, 엔드포인트별 p50/p99, 서버 프로세스 메모리(RSS 최대치).
+
+사용법 (backend 디렉터리에서):
+    python benchmarks/bench_mixed_load.py --mode inprocess --requests 3000
+    python benchmarks/bench_mixed_load.py --mode uvicorn --compare
+    python benchmarks/bench_mixed_load.py --mode uvicorn --save-baseline
+"""
+import argparse
+import asyncio
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from baseline import add_arguments, finish  # noqa: E402
+
+WORKLOAD = (
+    ("predict", 0.60),
+    ("route", 0.20),
+    ("search", 0.15),
+    ("token", 0.05),
+)
+TEST_EMAIL = "bench-mixed@example.com"
+TEST_PASSWORD = "bench-password"
+SEOUL_CORE = (37.48, 126.90, 37.62, 127.10)
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def make_plan(total: int, seed: int, unique_queries: int) -> list:
+    """요청 순서를 미리 만들어 두어 실행마다 같은 요청이 같은 순서로 나가게 함"""
+    rng = random.Random(seed)
+    kinds = [kind for kind, _ in WORKLOAD]
+    weights = [weight for _, weight in WORKLOAD]
+    min_lat, min_lng, max_lat, max_lng = SEOUL_CORE
+    plan = []
+    for _ in range(total):
+        kind = rng.choices(kinds, weights)[0]
+        if kind == "predict":
+            payload = {"latitude": rng.uniform(min_lat, max_lat), "longitude": rng.uniform(min_lng, max_lng)}
+        elif kind == "route":
+            payload = {
+                "start_latitude": rng.uniform(min_lat, max_lat), "start_longitude": rng.uniform(min_lng, max_lng),
+                "end_latitude": rng.uniform(min_lat, max_lat), "end_longitude": rng.uniform(min_lng, max_lng),
+            }
+        elif kind == "search":
+            # 일부는 키워드 결과가 없어 주소 검색으로 넘어가는 검색어
+            prefix = "주소:" if rng.random() < 0.2 else ""
+            payload = f"{prefix}강남역 {rng.randrange(unique_queries)}"
+        else:
+            payload = None
+        plan.append((kind, payload))
+    return plan
+
+
+async def drive(client: httpx.AsyncClient, plan: list, concurrency: int) -> tuple:
+    await client.post("/register", json={"email": TEST_EMAIL, "name": "bench", "password": TEST_PASSWORD})
+    latencies = {kind: [] for kind, _ in WORKLOAD}
+    errors = {kind: 0 for kind, _ in WORKLOAD}
+    rejected = {kind: 0 for kind, _ in WORKLOAD}  # 429 (로그인 해시 대기열 초과 등 의도된 거절)
+    counter = iter(plan)
+
+    async def send(kind: str, payload):
+        if kind == "predict":
+            return await client.post("/predict-risk", json=payload)
+        if kind == "route":
+            return await client.post("/safe-route", json=payload)
+        if kind == "search":
+            return await client.get("/search-location-combined", params={"query": payload})
+        return await client.post("/token", data={"username": TEST_EMAIL, "password": TEST_PASSWORD})
+
+    async def worker():
+        for kind, payload in counter:
+            start = time.perf_counter()
+            response = await send(kind, payload)
+            latencies[kind].append(time.perf_counter() - start)
+            if response.status_code == 429:
+                rejected[kind] += 1
+            elif response.status_code != 200 or (kind == "search" and response.json().get("error")):
+                errors[kind] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, rejected, time.perf_counter() - start
+
+
+def wait_ready(url: str, path: str, timeout: float = 60.0):
+    """path 가 500 미만 상태 코드로 응답할 때까지 대기 (/ready 는 준비 전 503)"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url + path, timeout=1).status_code < 500:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} 가 {timeout:.0f}초 안에 준비되지 않았습니다.")
+
+
+def process_memory_mb(pid: int) -> tuple:
+    """(현재 RSS, 최대 RSS) MB - /proc 에서 읽음"""
+    values = {}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            key, _, rest = line.partition(":")
+            if key in ("VmRSS", "VmHWM"):
+                values[key] = int(rest.split()[0]) / 1024
+    return values.get("VmRSS", 0.0), values.get("VmHWM", 0.0)
+
+
+def start_stub(port: int, latency_ms: float) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [sys.executable, os.path.join(BENCH_DIR, "kakao_stub.py"), "--port", str(port), "--latency-ms", str(latency_ms)],
+        cwd=BACKEND_DIR,
+    )
+    wait_ready(f"http://127.0.0.1:{port}", "/stats")
+    return process
+
+
+def app_environment(workdir: str, stub_port: int) -> dict:
+    return {
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        "RISK_TILE_CACHE_DIR": os.path.join(workdir, "tiles"),
+        "KAKAO_API_BASE_URL": f"http://127.0.0.1:{stub_port}",
+        "KAKAO_API_KEY": "stub",
+        "LOG_LEVEL": "WARNING",
+    }
+
+
+async def run_inprocess(plan: list, concurrency: int) -> tuple:
+    import main
+
+    # startup/shutdown 훅 실행 (uvicorn 이 하는 lifespan 처리와 같음)
+    async with main.app.router.lifespan_context(main.app):
+        # 백그라운드 준비(위험지역 인덱스, 모델 예열, 지명 사전)가 끝난 뒤 측정
+        await main.app.state.warm_up
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+            result = await drive(client, plan, concurrency)
+    rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return result, rss_mb, rss_mb
+
+
+def run_uvicorn(plan: list, concurrency: int, port: int, env: dict) -> tuple:
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env={**os.environ, **env},
+    )
+    try:
+        url = f"http://127.0.0.1:{port}"
+        wait_ready(url, "/ready")
+
+        async def go():
+            async with httpx.AsyncClient(base_url=url, timeout=60) as client:
+                return await drive(client, plan, concurrency)
+
+        result = asyncio.run(go())
+        rss_mb, peak_mb = process_memory_mb(server.pid)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+    return result, rss_mb, peak_mb
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=("inprocess", "uvicorn"), default="inprocess")
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--unique-queries", type=int, default=200)
+    parser.add_argument("--stub-latency-ms", type=float, default=30)
+    parser.add_argument("--port", type=int, default=8109)
+    parser.add_argument("--stub-port", type=int, default=8181)
+    parser.add_argument("--seed", type=int, default=1)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    plan = make_plan(args.requests, args.seed, args.unique_queries)
+    workdir = tempfile.mkdtemp(prefix="bench-mixed-")
+    env = app_environment(workdir, args.stub_port)
+    stub = start_stub(args.stub_port, args.stub_latency_ms)
+    try:
+        if args.mode == "inprocess":
+            os.environ.update(env)
+            (latencies, errors, rejected, elapsed), rss_mb, peak_mb = asyncio.run(run_inprocess(plan, args.concurrency))
+        else:
+            (latencies, errors, rejected, elapsed), rss_mb, peak_mb = run_uvicorn(plan, args.concurrency, args.port, env)
+    finally:
+        stub.terminate()
+        stub.wait(timeout=30)
+
+    total = sum(len(values) for values in latencies.values())
+    metrics = {
+        "throughput_rps": round(total / elapsed, 1),
+        "rss_mb": round(rss_mb, 1),
+        "peak_rss_mb": round(peak_mb, 1),
+    }
+    print(f"mode={args.mode} requests={total} concurrency={args.concurrency} elapsed={elapsed:.1f}s "
+          f"throughput={total / elapsed:.1f} req/s rss={rss_mb:.0f}MB peak={peak_mb:.0f}MB")
+    for kind, values in latencies.items():
+        if not values:
+            continue
+        p50, p99 = statistics.median(values) * 1000, percentile(values, 99) * 1000
+        metrics[f"{kind}_p50_ms"] = round(p50, 2)
+        metrics[f"{kind}_p99_ms"] = round(p99, 2)
+        metrics[f"{kind}_errors"] = errors[kind]
+        metrics[f"{kind}_rejected"] = rejected[kind]
+        print(f"{kind:<8} n={len(values):<6} errors={errors[kind]:<4} rejected={rejected[kind]:<4} "
+              f"p50={p50:.1f}ms p99={p99:.1f}ms")
+
+    config = {"mode": args.mode, "requests": args.requests, "concurrency": args.concurrency,
+              "unique_queries": args.unique_queries, "stub_latency_ms": args.stub_latency_ms, "seed": args.seed}
+    finish(f"mixed_{args.mode}", metrics, config, args.save_baseline, args.compare, args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# bench_prediction_history.py
+"""예측 기록 조회(/predictions/history) 지연 시간 벤치마크
+
+임시 SQLite DB 에 시드 고정 난수로 --rows 건의 예측 기록(--users 명, 최근 --days 일, 서울 범위)을 만들고
+fetch_history 로 기간 조회 / 근처+기간 조회 / 키셋으로 깊은 페이지 조회를 반복해 p50/p99 를 잰다.
+비교용으로 같은 깊이의 페이지를 OFFSET 으로 읽는 시간도 함께 출력한다.
+
+사용법 (backend 디렉터리에서):
+    python benchmarks/bench_prediction_history.py --rows 2000000 --users 200
+    python benchmarks/bench_prediction_history.py --db /tmp/history.db   # 만든 DB 재사용
+"""
+import argparse
+import asyncio
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+SEOUL_BBOX = (37.413294, 126.734086, 37.715133, 127.269311)
+SEED_BATCH = 50000
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def seed_rows(path: str, rows: int, users: int, days: int, seed: int, now: datetime):
+    """시드 고정 난수로 사용자/예측 기록 생성 (사용자마다 자주 다니는 지점 몇 곳 주변에 몰리게)"""
+    from geo import geohash_encode
+    from prediction_writer import GEOHASH_PRECISION
+
+    rng = random.Random(seed)
+    min_lat, min_lng, max_lat, max_lng = SEOUL_BBOX
+    hotspots = [
+        [(rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng)) for _ in range(5)]
+        for _ in range(users)
+    ]
+    connection = sqlite3.connect(path)
+    connection.executemany(
+        "INSERT INTO users (id, email, name, hashed_password, is_active, created_at) VALUES (?, ?, ?, '', 1, ?)",
+        [(user_id, f"bench-{user_id}@example.com", "bench", now.isoformat(" ")) for user_id in range(1, users + 1)],
+    )
+    span = days * 86400
+    for start in range(0, rows, SEED_BATCH):
+        batch = []
+        for _ in range(min(SEED_BATCH, rows - start)):
+            user_id = rng.randint(1, users)
+            lat, lng = rng.choice(hotspots[user_id - 1])
+            lat += rng.gauss(0, 0.01)
+            lng += rng.gauss(0, 0.01)
+            date = now - timedelta(seconds=rng.random() * span)
+            batch.append((user_id, lat, lng, rng.random(), date.isoformat(" "), geohash_encode(lat, lng, GEOHASH_PRECISION)))
+        connection.executemany(
+            "INSERT INTO risk_predictions (user_id, latitude, longitude, risk_score, prediction_date, geohash) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            batch,
+        )
+        connection.commit()
+    connection.execute("ANALYZE")
+    connection.commit()
+    connection.close()
+
+
+async def measure(name: str, queries: list, run) -> list:
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        await run(*query)
+        latencies.append(time.perf_counter() - start)
+    print(f"{name:<22} n={len(latencies):<5} p50={statistics.median(latencies) * 1000:.2f}ms "
+          f"p99={percentile(latencies, 99) * 1000:.2f}ms max={max(latencies) * 1000:.2f}ms")
+    return latencies
+
+
+async def run_benchmark(args, now: datetime):
+    from sqlalchemy import select, text
+    from database import AsyncSessionLocal, async_engine
+    from models import RiskPrediction
+    from prediction_history import fetch_history, encode_cursor
+
+    rng = random.Random(args.seed + 1)
+    min_lat, min_lng, max_lat, max_lng = SEOUL_BBOX
+    month_ago = now - timedelta(days=30)
+
+    async with AsyncSessionLocal() as db:
+        plan = (await db.execute(text(
+            "EXPLAIN QUERY PLAN SELECT id FROM risk_predictions WHERE user_id = 1 AND geohash >= 'wydm' "
+            "AND geohash < 'wydm~' AND prediction_date >= '2000-01-01' ORDER BY prediction_date DESC, id DESC LIMIT 50"
+        ))).all()
+        print("근처 조회 실행 계획:", " / ".join(row[-1] for row in plan))
+
+        async def range_query(user_id):
+            await fetch_history(db, user_id, since=month_ago, limit=args.limit)
+
+        async def near_query(user_id, lat, lng):
+            await fetch_history(db, user_id, lat, lng, args.radius_km, since=month_ago, limit=args.limit)
+
+        async def keyset_page(user_id, cursor, depth):
+            await fetch_history(db, user_id, limit=args.limit, cursor=cursor)
+
+        async def offset_page(user_id, cursor, depth):
+            (await db.execute(
+                select(RiskPrediction).where(RiskPrediction.user_id == user_id)
+                .order_by(RiskPrediction.prediction_date.desc(), RiskPrediction.id.desc())
+                .offset(depth).limit(args.limit)
+            )).scalars().all()
+
+        users = [(rng.randint(1, args.users),) for _ in range(args.queries)]
+        # 근처 조회 중심: 절반은 그 사용자의 실제 기록 위치, 절반은 서울 안 임의 지점
+        points = []
+        for (user_id,) in users:
+            if rng.random() < 0.5:
+                row = (await db.execute(
+                    select(RiskPrediction.latitude, RiskPrediction.longitude)
+                    .where(RiskPrediction.user_id == user_id).limit(1).offset(rng.randrange(100))
+                )).first()
+                points.append((user_id, row.latitude, row.longitude))
+            else:
+                points.append((user_id, rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng)))
+        await measure("range (30d)", users, range_query)
+        await measure(f"near {args.radius_km}km + 30d", points, near_query)
+        # 같은 깊이(--depth 행 뒤)의 한 페이지: 키셋은 그 위치의 커서에서, OFFSET 은 앞의 행을 건너뛰며 읽음
+        deep = []
+        for (user_id,) in users:
+            depth = rng.randrange(args.depth + 1)
+            row = (await db.execute(
+                select(RiskPrediction.prediction_date, RiskPrediction.id).where(RiskPrediction.user_id == user_id)
+                .order_by(RiskPrediction.prediction_date.desc(), RiskPrediction.id.desc()).offset(depth).limit(1)
+            )).first()
+            if row is not None:
+                deep.append((user_id, encode_cursor(row.prediction_date, row.id), depth + 1))
+        db.expunge_all()
+        await measure(f"keyset page <={args.depth}", deep, keyset_page)
+        await measure(f"offset page <={args.depth}", deep, offset_page)
+
+    await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--db", help="DB 파일 경로 (없으면 임시 파일, 이미 있으면 시드 생략)")
+    parser.add_argument("--rows", type=int, default=2000000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--depth", type=int, default=5000, help="깊은 페이지 비교 시 건너뛸 최대 행 수")
+    parser.add_argument("--radius-km", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(), "history.db")
+    exists = os.path.exists(path)
+    # database 모듈이 읽기 전에 벤치마크용 DB 로 지정
+    os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    from database import Base, engine
+    import models  # noqa: F401  (테이블 등록)
+
+    now = datetime(2024, 1, 1)
+    if not exists:
+        Base.metadata.create_all(bind=engine)
+        start = time.perf_counter()
+        seed_rows(path, args.rows, args.users, args.days, args.seed, now)
+        print(f"seeded rows={args.rows} users={args.users} in {time.perf_counter() - start:.1f}s ({path})")
+    asyncio.run(run_benchmark(args, now))
+
+
+if __name__ == "__main__":
+    main()
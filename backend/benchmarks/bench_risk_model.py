@@ -0,0 +1,99 @@
+# bench_risk_model.py
+"""위험도 모델 단건 추론 vs 마이크로 배치 추론 비교
+
+시드 고정 난수로 --zones 개 위험지역과 --requests 개 예측 지점을 만들고,
+--concurrency 개의 동시 요청이 (1) 각자 risk_model.score 를 호출할 때와
+(2) MicroBatcher 로 묶여 한 번에 추론될 때의 처리량과 요청 지연을 잰다.
+
+사용법 (backend 디렉터리에서):
+    python benchmarks/bench_risk_model.py --zones 5000 --requests 5000 --concurrency 64
+    RISK_MODEL_PATH=model.npz python benchmarks/bench_risk_model.py
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+
+import numpy as np
+from starlette.concurrency import run_in_threadpool
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from geo import SEOUL_BBOX  # noqa: E402
+from micro_batch import MicroBatcher  # noqa: E402
+from risk import ZoneArrays  # noqa: E402
+from risk_model import load_risk_model  # noqa: E402
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def make_points(count: int, seed: int) -> list:
+    rng = random.Random(seed)
+    min_lat, min_lng, max_lat, max_lng = SEOUL_BBOX
+    return [(rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng)) for _ in range(count)]
+
+
+async def run(score_one, points: list, concurrency: int):
+    latencies = []
+    results = [None] * len(points)
+    counter = iter(range(len(points)))
+
+    async def worker():
+        for i in counter:
+            start = time.perf_counter()
+            results[i] = await score_one(points[i])
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, results, time.perf_counter() - start
+
+
+def report(name: str, latencies: list, elapsed: float):
+    print(f"{name:<8} throughput={len(latencies) / elapsed:.0f} req/s "
+          f"p50={statistics.median(latencies) * 1000:.2f}ms p99={percentile(latencies, 99) * 1000:.2f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--zones", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--window-ms", type=float, default=2.0)
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    zones = ZoneArrays([
+        {"lat": lat, "lng": lng, "risk": round(rng.uniform(0.5, 0.95), 2)}
+        for lat, lng in make_points(args.zones, args.seed)
+    ])
+    points = make_points(args.requests, args.seed + 1)
+    model = load_risk_model()
+    print(f"model={model.name} zones={args.zones} requests={args.requests} concurrency={args.concurrency}")
+
+    def score_batch(batch: list) -> list:
+        coords = np.array(batch, dtype=np.float64).reshape(-1, 2)
+        return model.score(coords[:, 0], coords[:, 1], zones).tolist()
+
+    async def single(point):
+        return (await run_in_threadpool(score_batch, [point]))[0]
+
+    batcher = MicroBatcher(score_batch, window_ms=args.window_ms, max_batch=args.max_batch)
+
+    latencies, single_results, elapsed = asyncio.run(run(single, points, args.concurrency))
+    report("single", latencies, elapsed)
+    latencies, batched_results, elapsed = asyncio.run(run(batcher.submit, points, args.concurrency))
+    report("batched", latencies, elapsed)
+    print(f"batches={batcher.stats()} identical={single_results == batched_results}")
+
+
+if __name__ == "__main__":
+    main()
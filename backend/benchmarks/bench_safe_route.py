@@ -0,0 +1,141 @@
+# bench_safe_route.py
+"""위험도 가중 도로 경로 탐색 벤치마크 (고정 출발/도착 쌍)
+
+실제 그래프(--graph, road_graph.py 로 만든 .npz 또는 .osm)가 없으면
+서울 경계를 덮는 합성 격자 도로망(--synthetic 행/열 수)으로 측정한다.
+
+사용법 (backend 디렉터리에서):
+    python benchmarks/bench_safe_route.py --graph road_graph.npz
+    python benchmarks/bench_safe_route.py --synthetic 400 --repeat 5
+    python benchmarks/bench_safe_route.py --graph road_graph.npz --index route_index/
+    python benchmarks/bench_safe_route.py --synthetic 250 --compare   # 같은 쌍으로 A* 와 CCH 비교
+
+--compare 는 A* 와 CCH 인덱스를 같은 그래프/같은 쌍으로 측정해 구간 거리가 같은지 확인하고,
+p50/p99, 속도 향상 배율, 인덱스 생성 시간과 최대 메모리(RSS)를 함께 출력한다.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geo import SEOUL_BBOX
+from risk_model import load_risk_model
+from road_graph import RoadGraph
+from route_index import RouteIndex
+from zone_store import load_zone_arrays
+
+# 서울 주요 지점 간 고정 출발/도착 쌍 (위도, 경도)
+ROUTE_PAIRS = [
+    ("서울역 -> 강남역", (37.5547, 126.9707), (37.4979, 127.0276)),
+    ("홍대입구 -> 잠실", (37.5572, 126.9245), (37.5133, 127.1001)),
+    ("여의도 -> 청량리", (37.5219, 126.9245), (37.5804, 127.0470)),
+    ("신림 -> 노원", (37.4842, 126.9297), (37.6552, 127.0613)),
+    ("김포공항 -> 수서", (37.5622, 126.8013), (37.4873, 127.1018)),
+    ("명동 -> 성수", (37.5636, 126.9826), (37.5446, 127.0557)),
+    ("종로3가 -> 서초", (37.5716, 126.9918), (37.4837, 127.0324)),
+    ("상암 -> 천호", (37.5776, 126.8899), (37.5386, 127.1236)),
+]
+
+
+def make_grid_graph(size: int, seed: int = 1) -> RoadGraph:
+    """서울 경계를 덮는 size x size 합성 격자 도로망 (일부 구간 제거, 좌표 흔들림)"""
+    rng = random.Random(seed)
+    min_lat, min_lng, max_lat, max_lng = SEOUL_BBOX
+    coords = {}
+    for row in range(size):
+        for col in range(size):
+            lat = min_lat + (max_lat - min_lat) * (row + rng.uniform(-0.3, 0.3)) / (size - 1)
+            lng = min_lng + (max_lng - min_lng) * (col + rng.uniform(-0.3, 0.3)) / (size - 1)
+            coords[row * size + col] = (lat, lng)
+
+    ways = []
+    for row in range(size):
+        for col in range(size - 1):
+            if rng.random() > 0.1:
+                ways.append([row * size + col, row * size + col + 1])
+    for col in range(size):
+        for row in range(size - 1):
+            if rng.random() > 0.1:
+                ways.append([row * size + col, (row + 1) * size + col])
+    return RoadGraph.from_ways(ways, coords)
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def peak_rss_mb() -> float:
+    """현재 프로세스의 최대 RSS (MB, 측정할 수 없으면 nan)"""
+    if resource is None:
+        return float("nan")
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def measure(router, repeat: int, label: str = ""):
+    """고정 쌍을 repeat 번씩 탐색해 (전체 지연 목록, 쌍별 결과) 반환"""
+    latencies, results = [], []
+    for name, (start_lat, start_lng), (end_lat, end_lng) in ROUTE_PAIRS:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = router.route(start_lat, start_lng, end_lat, end_lng)
+            times.append(time.perf_counter() - start)
+        latencies.extend(times)
+        results.append(result)
+        distance = f"{result[1]:.2f}km" if result else "경로 없음"
+        print(f"{label}{name:<16} {distance:>10} {statistics.median(times) * 1000:>9.1f}ms")
+    print(f"{label}p50={statistics.median(latencies) * 1000:.1f}ms p99={percentile(latencies, 99) * 1000:.1f}ms")
+    return latencies, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--graph", help="도로 그래프 파일 (.npz 또는 .osm)")
+    parser.add_argument("--synthetic", type=int, default=300, help="합성 격자 한 변의 교차점 수")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--index", nargs="?", const="", help="CCH 인덱스 디렉터리 (값 없이 주면 새로 생성)")
+    parser.add_argument("--compare", action="store_true", help="A* 와 CCH 를 같은 쌍으로 비교")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    graph = RoadGraph.load(args.graph) if args.graph else make_grid_graph(args.synthetic)
+    graph.set_risk_weights(load_zone_arrays(None), load_risk_model())
+    print(f"graph: nodes={graph.num_nodes} edges={graph.num_edges} load={time.perf_counter() - start:.2f}s "
+          f"rss={peak_rss_mb():.0f}MB")
+
+    if args.compare:
+        astar, astar_results = measure(graph, args.repeat, "A*  ")
+    if args.index is None and not args.compare:
+        measure(graph, args.repeat)
+        return
+
+    start = time.perf_counter()
+    index = RouteIndex.load(args.index, graph) if args.index else RouteIndex.build(graph)
+    print(f"index: arcs={index.num_arcs} ready={time.perf_counter() - start:.2f}s peak_rss={peak_rss_mb():.0f}MB")
+    cch, cch_results = measure(index, args.repeat, "CCH " if args.compare else "")
+    if not args.compare:
+        return
+
+    # 두 탐색기는 같은 가중치의 최단 경로를 찾아야 함 (동률 경로는 노드 순서가 다를 수 있어 거리로 비교)
+    mismatched = [name for (name, _, _), a, c in zip(ROUTE_PAIRS, astar_results, cch_results)
+                  if (a is None) != (c is None) or (a and abs(a[1] - c[1]) > 1e-6)]
+    speedup = statistics.median(astar) / statistics.median(cch)
+    print(f"speedup p50={speedup:.2f}x p99={percentile(astar, 99) / percentile(cch, 99):.2f}x")
+    if mismatched:
+        print(f"경로 거리 불일치: {', '.join(mismatched)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# bench_search_load.py
+"""지명 검색 동시 처리량 부하 테스트
+
+카카오 스텁 서버와 백엔드를 띄운 뒤 /search-location 에 동시 요청을 보낸다.
+변경 전/후 비교는 같은 옵션으로 두 버전의 백엔드에 각각 실행한다.
+
+사용법 (backend 디렉터리에서):
+    python benchmarks/kakao_stub.py --port 8081 --latency-ms 50 &
+    KAKAO_API_BASE_URL=http://127.0.0.1:8081 KAKAO_API_KEY=stub uvicorn main:app --port 8000 &
+    python benchmarks/bench_search_load.py --url http://127.0.0.1:8000 --concurrency 50 --requests 1000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+async def run(url: str, endpoint: str, concurrency: int, total: int, unique: int):
+    latencies = []
+    errors = 0
+    counter = iter(range(total))
+
+    async with httpx.AsyncClient(base_url=url, timeout=30) as client:
+        async def worker():
+            nonlocal errors
+            for i in counter:
+                # unique 개 검색어를 돌려 쓰며 반복 검색(캐시 적중)을 흉내냄
+                query = f"강남역 {i % unique}"
+                start = time.perf_counter()
+                response = await client.get(endpoint, params={"query": query})
+                latencies.append(time.perf_counter() - start)
+                if response.status_code != 200 or response.json().get("error"):
+                    errors += 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+
+    return latencies, errors, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--endpoint", default="/search-location")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--unique-queries", type=int, default=100,
+                        help="서로 다른 검색어 수 (요청 수와 같게 하면 캐시 적중 없음)")
+    args = parser.parse_args()
+
+    latencies, errors, elapsed = asyncio.run(
+        run(args.url, args.endpoint, args.concurrency, args.requests, args.unique_queries)
+    )
+    print(f"requests={len(latencies)} errors={errors} concurrency={args.concurrency}")
+    print(f"throughput={len(latencies) / elapsed:.1f} req/s")
+    print(f"p50={statistics.median(latencies) * 1000:.1f}ms "
+          f"p99={percentile(latencies, 99) * 1000:.1f}ms "
+          f"max={max(latencies) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+# bench_startup.py
+"""서버 시작 시간 측정 (오토스케일링 콜드 스타트)
+
+1. import 분석: python -X importtime -c "import main" 결과를 최상위 패키지별 자체 시간으로 합산
+   (importtime 자체가 느려지게 하므로 따로 측정한 import main 실제 시간도 함께 기록)
+2. uvicorn 서버 프로세스를 --runs 번 새로 띄워 프로세스 시작부터
+   - time_to_listen: /health 가 처음 응답할 때까지 (요청을 받기 시작)
+   - time_to_ready: /ready 가 200 일 때까지 (위험지역 인덱스/모델/지오펜스/지명 사전 준비 완료)
+   - time_to_first_response: 준비 후 첫 /predict-risk 응답까지
+   를 재고 중앙값을 쓴다.
+
+--zones 개의 임의 위험지역 CSV 를 ZONE_DATA_PATH 로 주어 데이터 적재 비용이 포함되게 한다 (0 이면 더미 데이터).
+
+사용법 (backend 디렉터리에서):
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --zones 50000 --runs 5
+    python benchmarks/bench_startup.py --compare
+    python benchmarks/bench_startup.py --save-baseline
+"""
+import argparse
+import csv
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+
+import httpx
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKEND_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, BENCH_DIR)
+
+from baseline import add_arguments, finish  # noqa: E402
+from bench_zone_index import make_zones  # noqa: E402
+
+# 상태 확인 간격 (초)
+POLL_INTERVAL = 0.02
+IMPORT_SCRIPT = "import time; start = time.perf_counter(); import main; print(time.perf_counter() - start)"
+
+
+def write_zone_file(path: str, count: int, seed: int):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=("lat", "lng", "risk", "name"))
+        writer.writeheader()
+        writer.writerows(make_zones(count, seed=seed))
+
+
+def app_environment(workdir: str, zone_file: str) -> dict:
+    env = {
+        "DATABASE_URL": f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        "RISK_TILE_CACHE_DIR": os.path.join(workdir, "tiles"),
+        "ZONE_STORE_DIR": os.path.join(workdir, "zone_store"),
+        "LOG_LEVEL": "WARNING",
+    }
+    if zone_file:
+        env["ZONE_DATA_PATH"] = zone_file
+    return {**os.environ, **env}
+
+
+def import_breakdown(env: dict) -> tuple:
+    """(import main 누적 ms, {최상위 패키지: 자체 시간 합 ms})"""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", "import main"],
+                            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True)
+    packages, total = defaultdict(float), 0.0
+    for line in result.stderr.splitlines():
+        # import time:  self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        packages[name.split(".")[0]] += int(self_us) / 1000
+        if name == "main":
+            total = int(cumulative_us) / 1000
+    return total, dict(packages)
+
+
+def import_wall_ms(env: dict) -> float:
+    result = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], cwd=BACKEND_DIR, env=env,
+                            capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1]) * 1000
+
+
+def wait_status(client: httpx.Client, path: str, expected: int, server: subprocess.Popen, timeout: float) -> float:
+    """path 가 expected 상태로 응답한 시각 (time.perf_counter)"""
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"서버가 종료되었습니다 (exit code {server.returncode})")
+        try:
+            if client.get(path).status_code == expected:
+                return time.perf_counter()
+        except httpx.HTTPError:
+            pass
+        time.sleep(POLL_INTERVAL)
+    raise RuntimeError(f"{path} 가 {timeout:.0f}초 안에 {expected} 로 응답하지 않았습니다.")
+
+
+def measure_start(env: dict, port: int, timeout: float) -> dict:
+    """서버를 새로 띄워 (listen, ready, 첫 응답) 까지 걸린 ms"""
+    client = httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=10)
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+    try:
+        listening = wait_status(client, "/health", 200, server, timeout)
+        ready = wait_status(client, "/ready", 200, server, timeout)
+        response = client.post("/predict-risk", json={"latitude": 37.5665, "longitude": 126.978})
+        responded = time.perf_counter()
+        if response.status_code != 200:
+            raise RuntimeError(f"/predict-risk 응답 {response.status_code}")
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        client.close()
+    return {
+        "time_to_listen_ms": (listening - started) * 1000,
+        "time_to_ready_ms": (ready - started) * 1000,
+        "time_to_first_response_ms": (responded - started) * 1000,
+        "first_request_ms": (responded - ready) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--zones", type=int, default=20000, help="임의 위험지역 수 (0 이면 더미 데이터)")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=12, help="출력할 import 상위 패키지 수")
+    parser.add_argument("--port", type=int, default=8111)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--seed", type=int, default=42)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="bench-startup-")
+    zone_file = ""
+    if args.zones:
+        zone_file = os.path.join(workdir, "zones.csv")
+        write_zone_file(zone_file, args.zones, args.seed)
+    env = app_environment(workdir, zone_file)
+
+    # 첫 실행은 .pyc 생성/DB 파일 생성 비용이 섞이므로 한 번 버림
+    import_wall_ms(env)
+    import_total, packages = import_breakdown(env)
+    wall = statistics.median(import_wall_ms(env) for _ in range(args.runs))
+    print(f"import main: {wall:.0f}ms (importtime 누적 {import_total:.0f}ms)")
+    print(f"{'package':<24} {'self(ms)':>9}")
+    for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:args.top]:
+        print(f"{name:<24} {ms:>9.1f}")
+
+    runs = []
+    for number in range(args.runs):
+        # 실행마다 새 zone_store 디렉터리 (컨테이너 콜드 스타트처럼 원본 파일부터 변환)
+        run_env = {**env, "ZONE_STORE_DIR": os.path.join(workdir, f"zone_store-{number}")}
+        runs.append(measure_start(run_env, args.port, args.timeout))
+    timings = {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+    print(f"listen={timings['time_to_listen_ms']:.0f}ms ready={timings['time_to_ready_ms']:.0f}ms "
+          f"first_response={timings['time_to_first_response_ms']:.0f}ms "
+          f"(first request {timings['first_request_ms']:.1f}ms, median of {args.runs})")
+
+    metrics = {"import_main_ms": round(wall, 1), **{key: round(value, 1) for key, value in timings.items()}}
+    # 패키지별 값은 기록만 하고 비교하지 않음 (이름이 _ms 로 끝나지 않음)
+    metrics.update({f"import_{name}_ms_raw": round(ms, 1)
+                    for name, ms in sorted(packages.items(), key=lambda item: -item[1])[:args.top]})
+    config = {"zones": args.zones, "runs": args.runs, "seed": args.seed}
+    finish("startup", metrics, config, args.save_baseline, args.compare, args.tolerance)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# bench_zone_index.py
+"""최근접 위험지역 탐색 벤치마크: 기존 순회 방식 vs 격자 공간 인덱스
+
+사용법 (backend 디렉터리에서):
+    python benchmarks/bench_zone_index.py --sizes 10 10000 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from geo import SEOUL_BBOX
+from spatial_index import GridZoneIndex, LinearZoneIndex
+
+
+def make_zones(count: int, seed: int = 42) -> list:
+    """서울 경계 내 임의 위험지역 생성"""
+    rng = random.Random(seed)
+    min_lat, min_lng, max_lat, max_lng = SEOUL_BBOX
+    return [
+        {
+            "lat": rng.uniform(min_lat, max_lat),
+            "lng": rng.uniform(min_lng, max_lng),
+            "risk": round(rng.uniform(0.5, 0.95), 2),
+            "name": f"zone-{i}",
+        }
+        for i in range(count)
+    ]
+
+
+def make_queries(count: int, seed: int = 7) -> list:
+    rng = random.Random(seed)
+    min_lat, min_lng, max_lat, max_lng = SEOUL_BBOX
+    return [(rng.uniform(min_lat, max_lat), rng.uniform(min_lng, max_lng)) for _ in range(count)]
+
+
+def time_queries(index, queries: list):
+    start = time.perf_counter()
+    results = [index.nearest(lat, lng) for lat, lng in queries]
+    elapsed = time.perf_counter() - start
+    return results, elapsed / len(queries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 10_000, 1_000_000])
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--linear-budget", type=float, default=5_000_000,
+                        help="순회 방식에서 허용할 최대 거리 계산 횟수 (질의 수 자동 축소)")
+    args = parser.parse_args()
+
+    print(f"{'zones':>10} {'build(s)':>10} {'linear(us)':>12} {'grid(us)':>10} {'speedup':>9}")
+    for size in args.sizes:
+        zones = make_zones(size)
+        queries = make_queries(args.queries)
+
+        start = time.perf_counter()
+        grid = GridZoneIndex(zones)
+        build_time = time.perf_counter() - start
+        linear = LinearZoneIndex(zones)
+
+        linear_queries = queries[:max(1, min(len(queries), int(args.linear_budget // size)))]
+        linear_results, linear_time = time_queries(linear, linear_queries)
+        grid_results, grid_time = time_queries(grid, queries)
+
+        # 두 방식의 결과가 동일한지 확인
+        for (zone_a, dist_a), (zone_b, dist_b) in zip(linear_results, grid_results):
+            assert zone_a == zone_b and dist_a == dist_b, "격자 인덱스 결과가 순회 방식과 다릅니다"
+
+        print(f"{size:>10} {build_time:>10.3f} {linear_time * 1e6:>12.1f} "
+              f"{grid_time * 1e6:>10.1f} {linear_time / grid_time:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# kakao_stub.py
+"""로컬 카카오 로컬 API 스텁 서버 (테스트/부하 테스트용)
+
+실제 dapi.kakao.com 대신 고정 지연 후 결정적인 검색 결과를 돌려준다.
+
+사용법 (backend 디렉터리에서):
+    python benchmarks/kakao_stub.py --port 8081 --latency-ms 50
+    KAKAO_API_BASE_URL=http://127.0.0.1:8081 KAKAO_API_KEY=stub python main.py
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+
+import uvicorn
+from fastapi import FastAPI, Header, HTTPException
+
+app = FastAPI(title="Kakao Local API Stub")
+LATENCY_SECONDS = float(os.getenv("KAKAO_STUB_LATENCY_MS", "50")) / 1000
+# 이 접두어로 시작하는 검색어는 결과 없음 (주소 검색 대체 경로 확인용)
+EMPTY_KEYWORD_PREFIX = "주소:"
+
+request_counts = {"keyword": 0, "address": 0}
+
+
+def _coords(query: str, i: int):
+    digest = hashlib.md5(f"{query}:{i}".encode()).digest()
+    lat = 37.45 + digest[0] / 255 * 0.2
+    lng = 126.85 + digest[1] / 255 * 0.3
+    return f"{lng:.6f}", f"{lat:.6f}"
+
+
+def _check_key(authorization):
+    if not authorization or not authorization.startswith("KakaoAK "):
+        raise HTTPException(status_code=401, detail={"message": "invalid key"})
+
+
+@app.get("/v2/local/search/keyword.json")
+async def keyword(query: str, size: int = 15, authorization: str = Header(None)):
+    _check_key(authorization)
+    request_counts["keyword"] += 1
+    await asyncio.sleep(LATENCY_SECONDS)
+    if query.startswith(EMPTY_KEYWORD_PREFIX):
+        return {"documents": [], "meta": {"total_count": 0}}
+
+    documents = []
+    for i in range(size):
+        x, y = _coords(query, i)
+        documents.append({
+            "place_name": f"{query} {i + 1}",
+            "address_name": f"서울 중구 테스트동 {i + 1}",
+            "road_address_name": f"서울 중구 테스트로 {i + 1}",
+            "x": x,
+            "y": y,
+            "category_name": "테스트",
+            "phone": "02-000-0000",
+            "place_url": "http://place.map.kakao.com/0",
+        })
+    return {"documents": documents, "meta": {"total_count": len(documents)}}
+
+
+@app.get("/v2/local/search/address.json")
+async def address(query: str, size: int = 10, authorization: str = Header(None)):
+    _check_key(authorization)
+    request_counts["address"] += 1
+    await asyncio.sleep(LATENCY_SECONDS)
+
+    x, y = _coords(query, 0)
+    return {
+        "documents": [{
+            "address_name": query.removeprefix(EMPTY_KEYWORD_PREFIX),
+            "road_address": {"address_name": f"{query} 도로명"},
+            "x": x,
+            "y": y,
+        }][:size],
+        "meta": {"total_count": 1},
+    }
+
+
+@app.get("/stats")
+async def stats():
+    return request_counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="카카오 로컬 API 스텁 서버")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=LATENCY_SECONDS * 1000)
+    args = parser.parse_args()
+
+    LATENCY_SECONDS = args.latency_ms / 1000
+    uvicorn.run(app, host="127.0.0.1", port=args.port, log_level="warning")
@@ -0,0 +1,56 @@
+# run_suite.py
+"""마이크로 벤치마크 + 혼합 부하 테스트(앱 내부/uvicorn) + 실시간 추적 부하 테스트 + 서버 시작 시간을 차례로 실행하고 기준값과 비교
+
+각 벤치마크는 별도 프로세스로 실행한다 (모듈 전역 상태와 메모리 측정이 섞이지 않도록).
+하나라도 기준값 대비 회귀하면 종료 코드 1. 허용 변화율은 벤치마크별 기본값을 쓰며
+(공유 CPU 에서 마이크로 벤치마크와 시작 시간은 반복 측정 간 편차가 커서 더 넓게 잡음) --tolerance 로 일괄 지정할 수 있다.
+
+사용법 (backend 디렉터리에서):
+    python benchmarks/run_suite.py                  # 기준값과 비교
+    python benchmarks/run_suite.py --save-baseline  # 현재 결과를 기준값으로 저장
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# (이름, 명령, 기본 허용 변화율)
+SUITE = (
+    ("micro", ["bench_micro.py"], 0.5),
+    ("mixed_inprocess", ["bench_mixed_load.py", "--mode", "inprocess"], 0.35),
+    ("mixed_uvicorn", ["bench_mixed_load.py", "--mode", "uvicorn"], 0.35),
+    ("live_track", ["bench_live_track.py"], 0.35),
+    ("startup", ["bench_startup.py"], 0.5),
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--tolerance", type=float, help="모든 벤치마크에 같은 허용 변화율 적용")
+    parser.add_argument("--only", nargs="+", choices=[name for name, _, _ in SUITE])
+    args = parser.parse_args()
+
+    failed = []
+    for name, command, tolerance in SUITE:
+        if args.only and name not in args.only:
+            continue
+        print(f"\n=== {name} ===", flush=True)
+        tolerance = args.tolerance if args.tolerance is not None else tolerance
+        mode = ["--save-baseline"] if args.save_baseline else ["--compare", "--tolerance", str(tolerance)]
+        script, *options = command
+        result = subprocess.run([sys.executable, os.path.join(BENCH_DIR, script), *options, *mode],
+                                cwd=os.path.dirname(BENCH_DIR))
+        if result.returncode != 0:
+            failed.append(name)
+
+    if failed:
+        print(f"\nregressed or failed: {', '.join(failed)}")
+        sys.exit(1)
+    print("\nall benchmarks within tolerance" if not args.save_baseline else "\nbaselines saved")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+# gazetteer.py
+"""로컬 지명 사전 (자동완성용 한글 자모 접두어 색인)
+
+카카오 검색으로 확인된 장소를 Location 테이블에 저장해 두고, 서버 시작 시 모두 읽어
+메모리 색인을 만든다. 검색창 자동완성은 이 색인에서 바로 답하고, 결과가 없을 때만 카카오를 호출한다.
+
+색인 키는 이름/주소를 한글 자모 단위로 풀어 쓴 문자열이다 (강남역 -> ㄱㅏㅇㄴㅏㅁㅇㅕㄱ).
+그래서 입력 중인 글자("강나", "강남ㅇ")도 완성된 이름의 접두어로 찾을 수 있다.
+- 이름 전체(공백 제거), 이름의 각 단어, 지번/도로명 주소 전체와 각 단어를 키로 넣어
+  "역삼" 으로 "강남구 역삼동 ..." 주소의 장소도 찾는다.
+- 키를 정렬된 배열로 두고 이진 탐색으로 접두어 범위를 찾는다 (노드 객체 없이 트라이와 같은 탐색).
+
+여러 워커가 각자 저장한 장소는 GAZETTEER_REFRESH_INTERVAL 마다 새 행(id 기준)만 읽어 반영한다.
+"""
+import asyncio
+import bisect
+import os
+import unicodedata
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from database import AsyncSessionLocal
+from models import Location
+from structured_log import get_logger
+
+log = get_logger("gazetteer")
+
+GAZETTEER_REFRESH_INTERVAL = float(os.getenv("GAZETTEER_REFRESH_INTERVAL", "30"))  # 초
+# 접두어가 짧아 후보가 많을 때 순위를 매기기 위해 살펴볼 최대 키 수
+GAZETTEER_SCAN_LIMIT = 500
+# 한 번에 추가하는 키가 이보다 많으면 하나씩 끼워 넣지 않고 합쳐서 다시 정렬 (시작 시 전체 적재)
+GAZETTEER_RESORT_KEYS = 256
+GAZETTEER_LOAD_BATCH = 5000
+
+# 한글 음절 -> 초성/중성/종성 호환 자모 (겹모음/겹받침은 입력 순서대로 나눔)
+_CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNGSEONG = ("ㅏ", "ㅐ", "ㅑ", "ㅒ", "ㅓ", "ㅔ", "ㅕ", "ㅖ", "ㅗ", "ㅗㅏ", "ㅗㅐ", "ㅗㅣ", "ㅛ", "ㅜ", "ㅜㅓ",
+              "ㅜㅔ", "ㅜㅣ", "ㅠ", "ㅡ", "ㅡㅣ", "ㅣ")
+_JONGSEONG = ("", "ㄱ", "ㄲ", "ㄱㅅ", "ㄴ", "ㄴㅈ", "ㄴㅎ", "ㄷ", "ㄹ", "ㄹㄱ", "ㄹㅁ", "ㄹㅂ", "ㄹㅅ", "ㄹㅌ",
+              "ㄹㅍ", "ㄹㅎ", "ㅁ", "ㅂ", "ㅂㅅ", "ㅅ", "ㅆ", "ㅇ", "ㅈ", "ㅊ", "ㅋ", "ㅌ", "ㅍ", "ㅎ")
+_COMPOUND_JAMO = {
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ", "ㄾ": "ㄹㅌ",
+    "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ", "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ",
+    "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+}
+
+
+def _build_jamo_table() -> dict:
+    table = {ord(jamo): parts for jamo, parts in _COMPOUND_JAMO.items()}
+    for index in range(len(_CHOSEONG) * len(_JUNGSEONG) * len(_JONGSEONG)):
+        cho, rest = divmod(index, len(_JUNGSEONG) * len(_JONGSEONG))
+        jung, jong = divmod(rest, len(_JONGSEONG))
+        table[0xAC00 + index] = _CHOSEONG[cho] + _JUNGSEONG[jung] + _JONGSEONG[jong]
+    return table
+
+
+_JAMO_TABLE = _build_jamo_table()
+
+
+def jamo_words(text: str) -> list:
+    """단어별 검색 키 (NFC 정규화, 소문자, 한글을 자모로 분해)"""
+    return unicodedata.normalize("NFC", text).casefold().translate(_JAMO_TABLE).split()
+
+
+def to_jamo(text: str) -> str:
+    """검색 키 (공백을 없앤 jamo_words)"""
+    return "".join(jamo_words(text))
+
+
+def place_key(place: dict) -> tuple:
+    """같은 장소 판별용 (이름, 좌표 소수 6자리)"""
+    return (place["place_name"], round(float(place["y"]), 6), round(float(place["x"]), 6))
+
+
+def _location_to_place(location: Location) -> dict:
+    # 카카오 검색 응답과 같은 모양 (x: 경도, y: 위도 문자열)
+    return {
+        "place_name": location.name,
+        "address_name": location.address or "",
+        "road_address_name": location.road_address or "",
+        "x": str(location.longitude),
+        "y": str(location.latitude),
+        "category_name": location.category or "",
+        "phone": location.phone or "",
+        "place_url": location.place_url or "",
+    }
+
+
+class Gazetteer:
+    """장소 목록 + 자모 접두어 색인 (이벤트 루프 안에서만 사용)"""
+
+    # 일치한 키 종류별 순위 (작을수록 앞)
+    NAME, NAME_WORD, ADDRESS = 0, 1, 2
+
+    def __init__(self):
+        self.places = []
+        self._seen = set()
+        self._keys = []     # 정렬된 자모 키
+        self._entries = []  # _keys 와 같은 순서의 (장소 번호, 키 종류)
+        self.last_id = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.places)
+
+    def _index_keys(self, place: dict) -> list:
+        words = jamo_words(place["place_name"])
+        keys = [("".join(words), self.NAME)]
+        if len(words) > 1:
+            keys.extend((word, self.NAME_WORD) for word in words)
+        for address in (place.get("address_name"), place.get("road_address_name")):
+            if address:
+                words = jamo_words(address)
+                keys.append(("".join(words), self.ADDRESS))
+                keys.extend((word, self.ADDRESS) for word in words)
+        return keys
+
+    def add(self, places: list) -> list:
+        """새 장소만 색인에 추가하고 추가한 장소 목록 반환 (좌표가 없거나 이미 있는 장소는 건너뜀)"""
+        added, new_keys = [], []
+        for place in places:
+            try:
+                key = place_key(place)
+            except (KeyError, TypeError, ValueError):
+                continue
+            if not place["place_name"] or key in self._seen:
+                continue
+            self._seen.add(key)
+            number = len(self.places)
+            self.places.append(place)
+            new_keys.extend((index_key, (number, kind)) for index_key, kind in set(self._index_keys(place)) if index_key)
+            added.append(place)
+
+        if len(new_keys) > GAZETTEER_RESORT_KEYS:
+            keys = self._keys + [key for key, _ in new_keys]
+            entries = self._entries + [entry for _, entry in new_keys]
+            order = sorted(range(len(keys)), key=keys.__getitem__)
+            self._keys = [keys[i] for i in order]
+            self._entries = [entries[i] for i in order]
+        else:
+            for index_key, entry in new_keys:
+                position = bisect.bisect_right(self._keys, index_key)
+                self._keys.insert(position, index_key)
+                self._entries.insert(position, entry)
+        return added
+
+    def search(self, query: str, limit: int = 5) -> list:
+        """입력 중인 검색어로 시작하는 장소 (이름 일치 > 이름 단어 > 주소 순, 같은 순위는 짧은 이름 먼저)"""
+        prefix = to_jamo(query)
+        if not prefix:
+            return []
+        start = bisect.bisect_left(self._keys, prefix)
+        best = {}
+        for position in range(start, min(start + GAZETTEER_SCAN_LIMIT, len(self._keys))):
+            if not self._keys[position].startswith(prefix):
+                break
+            number, kind = self._entries[position]
+            partial = self._keys[position] != prefix
+            rank = (kind, partial, len(self.places[number]["place_name"]), number)
+            if number not in best or rank < best[number]:
+                best[number] = rank
+        if not best:
+            self.misses += 1
+            return []
+        self.hits += 1
+        return [self.places[number] for number in sorted(best, key=best.get)[:limit]]
+
+    def load_rows(self, locations: list):
+        for location in locations:
+            self.last_id = max(self.last_id, location.id)
+        self.add([_location_to_place(location) for location in locations])
+
+    async def refresh(self, session_factory=AsyncSessionLocal) -> int:
+        """Location 테이블에서 마지막으로 읽은 id 이후 행을 읽어 색인에 추가, 읽은 행 수 반환"""
+        total = 0
+        async with session_factory() as db:
+            while True:
+                result = await db.execute(
+                    select(Location).where(Location.id > self.last_id).order_by(Location.id).limit(GAZETTEER_LOAD_BATCH)
+                )
+                locations = result.scalars().all()
+                if not locations:
+                    return total
+                self.load_rows(locations)
+                total += len(locations)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "places": len(self.places),
+            "keys": len(self._keys),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+# 저장 시 같은 (이름, 위도, 경도) 행이 이미 있으면 건너뛰는 INSERT 를 만드는 방언별 함수
+_DIALECT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+async def save_places(places: list, source: str, session_factory=AsyncSessionLocal):
+    """카카오 검색 결과를 Location 테이블에 일괄 저장 (다른 워커가 이미 저장한 장소는 건너뜀)"""
+    rows = [{
+        "name": place["place_name"],
+        "latitude": float(place["y"]),
+        "longitude": float(place["x"]),
+        "address": place.get("address_name") or None,
+        "road_address": place.get("road_address_name") or None,
+        "category": place.get("category_name") or None,
+        "phone": place.get("phone") or None,
+        "place_url": place.get("place_url") or None,
+        "source": source,
+    } for place in places]
+    async with session_factory() as db:
+        dialect_insert = _DIALECT_INSERTS[db.bind.dialect.name]
+        statement = dialect_insert(Location).on_conflict_do_nothing(index_elements=["name", "latitude", "longitude"])
+        await db.execute(statement, rows)
+        await db.commit()
+
+
+class PlaceRecorder:
+    """검색 응답을 기다리게 하지 않고 새 장소를 색인에 넣고 백그라운드로 저장"""
+
+    def __init__(self, gazetteer: Gazetteer, session_factory=AsyncSessionLocal):
+        self.gazetteer = gazetteer
+        self.session_factory = session_factory
+        self._pending = set()  # 저장 중인 작업 (GC 로 사라지지 않도록 참조 유지)
+        self.saved = 0
+        self.failures = 0
+
+    def record(self, places: list, source: str):
+        added = self.gazetteer.add(places)
+        if added:
+            task = asyncio.get_running_loop().create_task(self._save(added, source))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _save(self, places: list, source: str):
+        try:
+            await save_places(places, source, self.session_factory)
+        except Exception as e:
+            self.failures += 1
+            log.warning("place_save_failed", places=len(places), error=str(e))
+            return
+        self.saved += len(places)
+
+    async def drain(self):
+        """저장 중인 작업이 모두 끝날 때까지 대기 (shutdown 용)"""
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def stats(self) -> dict:
+        return {"saved": self.saved, "failures": self.failures, "pending": len(self._pending)}
+
+
+async def watch_locations(gazetteer: Gazetteer, interval: float = GAZETTEER_REFRESH_INTERVAL):
+    """다른 워커가 저장한 장소를 주기적으로 반영"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await gazetteer.refresh()
+        except Exception as e:
+            log.warning("gazetteer_refresh_failed", error=str(e))
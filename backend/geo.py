@@ -0,0 +1,123 @@
+# geo.py
+import math
+
+EARTH_RADIUS_KM = 6371  # 지구 반지름 (km)
+
+# 서울시 경계 (최소 위도, 최소 경도, 최대 위도, 최대 경도)
+SEOUL_BBOX = (37.413294, 126.734086, 37.715133, 127.269311)
+
+
+def calculate_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """두 좌표 간 거리 계산 (km)"""
+    R = EARTH_RADIUS_KM
+
+    dlat = math.radians(lat2 - lat1)
+    dlng = math.radians(lng2 - lng1)
+
+    a = (math.sin(dlat/2) * math.sin(dlat/2) +
+         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) *
+         math.sin(dlng/2) * math.sin(dlng/2))
+
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+    return R * c
+
+
+def distance_to_segment(lat1: float, lng1: float, lat2: float, lng2: float, plat: float, plng: float) -> float:
+    """점과 선분 사이의 최단 거리 (km, 구간 중심 위도 기준 평면 근사)"""
+    km_per_deg = EARTH_RADIUS_KM * math.pi / 180
+    cos_lat = math.cos(math.radians((lat1 + lat2) / 2))
+
+    # 선분 시작점을 원점으로 하는 평면 좌표 (km)
+    bx, by = (lng2 - lng1) * cos_lat * km_per_deg, (lat2 - lat1) * km_per_deg
+    px, py = (plng - lng1) * cos_lat * km_per_deg, (plat - lat1) * km_per_deg
+
+    length_sq = bx * bx + by * by
+    t = 0.0 if length_sq == 0 else max(0.0, min(1.0, (px * bx + py * by) / length_sq))
+    return math.hypot(px - t * bx, py - t * by)
+
+
+def snap_to_grid(lat: float, lng: float, cell_m: float) -> tuple:
+    """좌표를 한 변 cell_m 미터 격자 칸 번호 (행, 열)로 변환 (서울 중심 위도 기준)"""
+    km_per_deg = EARTH_RADIUS_KM * math.pi / 180
+    cos_lat = math.cos(math.radians((SEOUL_BBOX[0] + SEOUL_BBOX[2]) / 2))
+    cell_km = cell_m / 1000
+    return (math.floor(lat * km_per_deg / cell_km), math.floor(lng * km_per_deg * cos_lat / cell_km))
+
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def geohash_encode(lat: float, lng: float, precision: int = 9) -> str:
+    """지오해시 문자열 (precision 9 = 약 4.8m x 4.8m)"""
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars = []
+    bits, value, even = 0, 0, True
+    while len(chars) < precision:
+        target, coordinate = (lng_range, lng) if even else (lat_range, lat)
+        mid = (target[0] + target[1]) / 2
+        if coordinate >= mid:
+            value = value * 2 + 1
+            target[0] = mid
+        else:
+            value = value * 2
+            target[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(GEOHASH_ALPHABET[value])
+            bits, value = 0, 0
+    return "".join(chars)
+
+
+def geohash_cell(lat: float, lng: float, precision: int) -> tuple:
+    """지오해시 칸 -> (위도 칸 번호, 경도 칸 번호, 칸 중심 위도, 칸 중심 경도)"""
+    lat_lo, lat_hi, lng_lo, lng_hi = -90.0, 90.0, -180.0, 180.0
+    lat_cell = lng_cell = 0
+    for bit in range(5 * precision):
+        if bit % 2 == 0:
+            mid = (lng_lo + lng_hi) / 2
+            upper = lng >= mid
+            lng_lo, lng_hi = (mid, lng_hi) if upper else (lng_lo, mid)
+            lng_cell = lng_cell * 2 + upper
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            upper = lat >= mid
+            lat_lo, lat_hi = (mid, lat_hi) if upper else (lat_lo, mid)
+            lat_cell = lat_cell * 2 + upper
+    return lat_cell, lng_cell, (lat_lo + lat_hi) / 2, (lng_lo + lng_hi) / 2
+
+
+def geohash_cell_size(precision: int) -> tuple:
+    """지오해시 한 칸의 (위도 폭, 경도 폭) (도)"""
+    lng_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def geohash_cover(lat: float, lng: float, radius_km: float, max_precision: int = 9, max_cells: int = 16) -> list:
+    """반경 radius_km 원의 외접 사각형을 덮는 지오해시 칸 목록 (칸 수가 max_cells 이하인 가장 정밀한 자릿수)"""
+    km_per_deg = EARTH_RADIUS_KM * math.pi / 180
+    dlat = radius_km / km_per_deg
+    dlng = radius_km / (km_per_deg * max(math.cos(math.radians(lat)), 1e-6))
+    south, north = max(-90.0, lat - dlat), min(90.0, lat + dlat)
+    west, east = lng - dlng, lng + dlng
+
+    for precision in range(max_precision, 0, -1):
+        lat_size, lng_size = geohash_cell_size(precision)
+        first_row = math.floor((south + 90.0) / lat_size)
+        first_col = math.floor((west + 180.0) / lng_size)
+        rows = math.floor((north + 90.0) / lat_size) - first_row + 1
+        cols = math.floor((east + 180.0) / lng_size) - first_col + 1
+        if rows * cols <= max_cells:
+            break
+
+    # 각 칸 중심 좌표를 인코딩 (경도는 날짜변경선에서 되감음)
+    prefixes = []
+    for row in range(rows):
+        center_lat = min(90.0, (first_row + row + 0.5) * lat_size - 90.0)
+        for col in range(cols):
+            center_lng = ((first_col + col + 0.5) * lng_size) % 360.0 - 180.0
+            prefix = geohash_encode(center_lat, center_lng, precision)
+            if prefix not in prefixes:
+                prefixes.append(prefix)
+    return prefixes
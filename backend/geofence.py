@@ -0,0 +1,199 @@
+# geofence.py
+"""실시간 위치 추적(/ws/track)용 지오펜스 색인
+
+보행 중인 단말이 /predict-risk 를 반복 호출하는 대신 WebSocket 으로 GPS 좌표를 계속 보내면,
+서버는 연결마다 현재 지오해시 칸과 등급만 기억하고 위험 등급이 바뀔 때만 알림을 보낸다.
+
+- 칸(GEOFENCE_PRECISION 자리 지오해시)의 등급은 칸 중심 좌표의 위험도 모델 점수로 정한다.
+  위험지역마다 영향 거리 안의 칸을 서버 시작/위험지역 교체 시 warm() 으로 한꺼번에 계산해 두고
+  (비용은 위험지역 수 x 덮는 칸 수), 그 밖의 칸은 처음 들어왔을 때 스레드 풀에서 계산해 저장한다.
+- 좌표가 직전 칸 안에 있으면 경계 비교 4번으로 끝나며, 칸을 벗어났을 때만 색인을 조회한다.
+- 위험지역에서 먼(모델 점수가 NaN 인) 칸은 최저 등급으로 본다. 기본 모델은 이런 칸에
+  칸마다 다른 0.1~0.3 값을 주는데, 그대로 쓰면 안전한 길을 걷는 중에도 등급 알림이 반복된다.
+"""
+import math
+import os
+from typing import Optional
+
+import numpy as np
+
+from geo import geohash_cell, geohash_cell_size
+from risk import DISTANCE_CHUNK_ELEMENTS, KM_PER_DEGREE, RISK_INFLUENCE_KM, ZoneArrays, risk_grades_batch, zone_features
+
+# 7 = 남북 약 153m x 동서 약 122m (서울 기준)
+GEOFENCE_PRECISION = int(os.getenv("GEOFENCE_PRECISION", "7"))
+# 지연 계산해 저장하는 칸 수 상한 (넘으면 저장하지 않고 매번 계산)
+GEOFENCE_MAX_CELLS = 1_000_000
+# 칸 키 = 위도 칸 번호 x _KEY_STRIDE + 경도 칸 번호 (경도 칸 번호 범위보다 큼)
+_KEY_STRIDE = 1 << 32
+
+
+class GeofenceIndex:
+    """지오해시 칸 -> (위험 등급, 칸 중심 위험도) (위험지역 데이터 버전마다 새로 만듦)"""
+
+    def __init__(self, model, zones: ZoneArrays, version: int, precision: int = GEOFENCE_PRECISION):
+        self.model = model
+        self.zones = zones
+        self.version = version
+        self.precision = precision
+        self.lat_size, self.lng_size = geohash_cell_size(precision)
+        self._cells = {}  # (위도 칸 번호, 경도 칸 번호) -> (등급, 위험도)
+        self.warmed = 0
+        self.computed = 0
+
+    def __len__(self):
+        return len(self._cells)
+
+    def _evaluate(self, lats: np.ndarray, lngs: np.ndarray) -> tuple:
+        scores = self.model.predict(zone_features(lats, lngs, self.zones))
+        scores = np.clip(np.nan_to_num(scores, nan=0.0), 0.0, 1.0)
+        levels, _ = risk_grades_batch(scores)
+        return levels.tolist(), scores.tolist()
+
+    def _covered_cells(self, lats: np.ndarray, lngs: np.ndarray) -> tuple:
+        """위험지역 좌표마다 영향 거리를 덮는 칸 범위를 펼친 (위도 칸 번호, 경도 칸 번호) 배열 (중복 포함)"""
+        margin_lat = RISK_INFLUENCE_KM / KM_PER_DEGREE
+        # 위험지역 위도 ± 영향 거리 중 극에 가까운 쪽에서 경도 폭이 가장 좁음
+        widest = np.minimum(89.0, np.abs(lats) + margin_lat)
+        margin_lng = margin_lat / np.cos(np.radians(widest))
+        last_lat = round(180.0 / self.lat_size) - 1
+        lat_lo = np.clip(np.floor((lats - margin_lat + 90.0) / self.lat_size), 0, last_lat).astype(np.int64)
+        lat_hi = np.clip(np.floor((lats + margin_lat + 90.0) / self.lat_size), 0, last_lat).astype(np.int64)
+        lng_lo = np.floor((lngs - margin_lng + 180.0) / self.lng_size).astype(np.int64)
+        lng_hi = np.floor((lngs + margin_lng + 180.0) / self.lng_size).astype(np.int64)
+        rows, columns = lat_hi - lat_lo + 1, lng_hi - lng_lo + 1
+        counts = rows * columns
+        zone = np.repeat(np.arange(len(lats)), counts)
+        # 위험지역별 구간 안에서의 순번 -> (행, 열)
+        position = np.arange(int(counts.sum())) - np.repeat(np.cumsum(counts) - counts, counts)
+        # 경도 ±180 을 넘어가는 칸은 반대쪽 칸으로
+        lng_cells = (lng_lo[zone] + position % columns[zone]) % round(360.0 / self.lng_size)
+        return lat_lo[zone] + position // columns[zone], lng_cells
+
+    def warm(self) -> int:
+        """위험지역 영향 거리가 덮는 칸을 한꺼번에 계산 (스레드 풀에서 호출), 계산한 칸 수 반환
+
+        위험지역을 칸 DISTANCE_CHUNK_ELEMENTS 개 안팎씩 나눠 덮는 칸을 모으므로 위험지역이 넓게
+        퍼져 있어도 위험지역 경계 상자 전체를 만들지 않는다.
+        """
+        if len(self.zones) == 0:
+            return 0
+        # 위험지역 하나가 덮는 칸 수의 상한으로 한 번에 펼칠 위험지역 수를 정함
+        margin_lat = RISK_INFLUENCE_KM / KM_PER_DEGREE
+        margin_lng = margin_lat / math.cos(math.radians(min(89.0, float(np.abs(self.zones.lat).max()) + margin_lat)))
+        per_zone = (2 * margin_lat / self.lat_size + 2) * (2 * margin_lng / self.lng_size + 2)
+        step = max(1, int(DISTANCE_CHUNK_ELEMENTS // per_zone))
+        keys = np.empty(0, dtype=np.int64)
+        for start in range(0, len(self.zones), step):
+            lat_cells, lng_cells = self._covered_cells(self.zones.lat[start:start + step], self.zones.lng[start:start + step])
+            keys = np.unique(np.concatenate([keys, lat_cells * _KEY_STRIDE + lng_cells]))
+        lat_cells, lng_cells = keys // _KEY_STRIDE, keys % _KEY_STRIDE
+
+        levels, scores = [], []
+        for start in range(0, len(keys), DISTANCE_CHUNK_ELEMENTS):
+            chunk = slice(start, start + DISTANCE_CHUNK_ELEMENTS)
+            chunk_levels, chunk_scores = self._evaluate(-90.0 + (lat_cells[chunk] + 0.5) * self.lat_size,
+                                                        -180.0 + (lng_cells[chunk] + 0.5) * self.lng_size)
+            levels += chunk_levels
+            scores += chunk_scores
+        # 이벤트 루프가 조회하는 중이므로 새 딕셔너리를 다 만든 뒤 한 번에 반영
+        self._cells.update(dict(zip(zip(lat_cells.tolist(), lng_cells.tolist()), zip(levels, scores))))
+        self.warmed = len(levels)
+        return self.warmed
+
+    def _locate(self, lat: float, lng: float) -> tuple:
+        """좌표가 든 칸 -> (칸 키, 중심 위도, 중심 경도, (위도 하한, 위도 상한, 경도 하한, 경도 상한))"""
+        lat_cell, lng_cell, center_lat, center_lng = geohash_cell(lat, lng, self.precision)
+        bounds = (center_lat - self.lat_size / 2, center_lat + self.lat_size / 2,
+                  center_lng - self.lng_size / 2, center_lng + self.lng_size / 2)
+        return (lat_cell, lng_cell), center_lat, center_lng, bounds
+
+    def cached(self, lat: float, lng: float) -> Optional[tuple]:
+        """계산해 둔 칸이면 (등급, 위험도, 경계), 아니면 None (이벤트 루프에서 바로 호출 가능)"""
+        key, _, _, bounds = self._locate(lat, lng)
+        cell = self._cells.get(key)
+        if cell is None:
+            return None
+        return cell[0], cell[1], bounds
+
+    def lookup(self, lat: float, lng: float) -> tuple:
+        """좌표가 든 칸 -> (등급, 위험도, (위도 하한, 위도 상한, 경도 하한, 경도 상한))
+
+        처음 들어온 칸은 위험도 모델로 계산하므로 이벤트 루프에서는 cached() 가 None 일 때
+        스레드 풀에서 호출한다.
+        """
+        key, center_lat, center_lng, bounds = self._locate(lat, lng)
+        cell = self._cells.get(key)
+        if cell is None:
+            levels, scores = self._evaluate(np.array([center_lat]), np.array([center_lng]))
+            cell = (levels[0], scores[0])
+            self.computed += 1
+            if len(self._cells) < GEOFENCE_MAX_CELLS:
+                self._cells[key] = cell
+        return cell[0], cell[1], bounds
+
+    def stats(self) -> dict:
+        return {
+            "version": self.version,
+            "precision": self.precision,
+            "cells": len(self._cells),
+            "warmed": self.warmed,
+            "computed": self.computed,
+        }
+
+
+class TrackSession:
+    """WebSocket 연결 하나의 추적 상태 (마지막 칸 경계와 등급)"""
+
+    __slots__ = ("lat_lo", "lat_hi", "lng_lo", "lng_hi", "level", "risk", "version")
+
+    def __init__(self):
+        self.lat_lo = self.lng_lo = math.inf
+        self.lat_hi = self.lng_hi = -math.inf
+        self.level = None
+        self.risk = 0.0
+        self.version = None
+
+    def contains(self, index: GeofenceIndex, lat: float, lng: float) -> bool:
+        """같은 칸 안이고 위험지역 데이터가 그대로인지 (그렇다면 색인을 다시 조회할 필요 없음)"""
+        return (self.lat_lo <= lat < self.lat_hi and self.lng_lo <= lng < self.lng_hi
+                and self.version == index.version)
+
+    def enter(self, index: GeofenceIndex, cell: tuple):
+        """index.cached() / index.lookup() 로 얻은 칸으로 상태 갱신"""
+        self.level, self.risk, (self.lat_lo, self.lat_hi, self.lng_lo, self.lng_hi) = cell
+        self.version = index.version
+
+
+class LiveTrackStats:
+    """워커별 실시간 추적 집계 (/cache-stats, /metrics)"""
+
+    def __init__(self):
+        self.connections = 0
+        self.opened = 0
+        self.fixes = 0
+        self.cell_changes = 0
+        self.alerts = 0
+        self.rejected = 0
+
+    def stats(self) -> dict:
+        return {
+            "connections": self.connections,
+            "opened": self.opened,
+            "fixes": self.fixes,
+            "cell_changes": self.cell_changes,
+            "alerts": self.alerts,
+            "rejected": self.rejected,
+        }
+
+
+def parse_fix(fix) -> Optional[tuple]:
+    """{"lat": 위도, "lng": 경도} -> (위도, 경도), 형식이 틀리거나 범위를 벗어나면 None"""
+    if not isinstance(fix, dict):
+        return None
+    lat, lng = fix.get("lat"), fix.get("lng")
+    if isinstance(lat, bool) or isinstance(lng, bool) or not isinstance(lat, (int, float)) or not isinstance(lng, (int, float)):
+        return None
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0):
+        return None
+    return float(lat), float(lng)
@@ -0,0 +1,81 @@
+# kakao_client.py
+import asyncio
+import os
+import re
+import unicodedata
+from typing import Optional
+
+import httpx
+
+from cache import TTLCache
+from metrics import stage_duration
+
+KAKAO_API_BASE_URL = os.getenv("KAKAO_API_BASE_URL", "https://dapi.kakao.com")
+KAKAO_CACHE_TTL = float(os.getenv("KAKAO_CACHE_TTL", "600"))  # 초
+KAKAO_CACHE_SIZE = int(os.getenv("KAKAO_CACHE_SIZE", "4096"))
+
+
+def normalize_query(query: str) -> str:
+    """검색어 정규화 (유니코드 NFC, 앞뒤 공백 제거, 연속 공백 축약)"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFC", query)).strip()
+
+
+class KakaoClient:
+    """카카오 로컬 API 비동기 클라이언트
+
+    dapi.kakao.com 과의 연결을 유지(keep-alive)하는 httpx.AsyncClient 를 공유하고,
+    성공한 응답은 정규화한 검색어 기준으로 TTL+LRU 캐시에 보관한다.
+    공유 클라이언트는 앱 수명(start/aclose)에 묶여 같은 이벤트 루프에서 열고 닫는다.
+    """
+
+    def __init__(self, api_key: str, base_url: str = KAKAO_API_BASE_URL, timeout: float = 10.0,
+                 cache: Optional[TTLCache] = None):
+        self.api_key = api_key
+        self.base_url = base_url
+        self.timeout = timeout
+        self.cache = cache if cache is not None else TTLCache(maxsize=KAKAO_CACHE_SIZE, ttl=KAKAO_CACHE_TTL)
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop = None
+
+    def _new_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Authorization": f"KakaoAK {self.api_key}"},
+            timeout=self.timeout,
+            limits=httpx.Limits(max_connections=50, max_keepalive_connections=20, keepalive_expiry=30),
+        )
+
+    async def start(self):
+        """앱 시작 시 현재 이벤트 루프에 묶인 공유 클라이언트 생성"""
+        await self.aclose()
+        self._loop = asyncio.get_running_loop()
+        self._client = self._new_client()
+
+    async def _get(self, path: str, params: dict) -> httpx.Response:
+        if self._client is not None and self._loop is asyncio.get_running_loop():
+            return await self._client.get(path, params=params)
+        # 앱 수명 밖(스크립트, lifespan 없는 테스트)이나 다른 루프에서는 호출마다 열고 닫음
+        # (다른 루프에 묶인 연결은 이 루프에서 닫을 수 없으므로 공유하지 않음)
+        async with self._new_client() as client:
+            return await client.get(path, params=params)
+
+    async def search(self, path: str, query: str, **params) -> dict:
+        """카카오 API 호출 (httpx.HTTPStatusError / httpx.TimeoutException 발생 가능)"""
+        query = normalize_query(query)
+        key = (path, query.casefold(), tuple(sorted(params.items())))
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        with stage_duration.time("kakao_api"):
+            response = await self._get(path, {"query": query, **params})
+        response.raise_for_status()
+        data = response.json()
+        self.cache.set(key, data)
+        return data
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
@@ -1,29 +1,82 @@
 # main.py
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Request, Response, WebSocket, WebSocketDisconnect, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-import uvicorn
 from datetime import datetime, timedelta
-import random
-import math
-import requests
+import time
+import asyncio
+import httpx
 import os
+import json
+import base64
+import bisect
+import hashlib
+import numpy as np
 from dotenv import load_dotenv
 
 
-from database import SessionLocal, engine, Base
+from database import engine, async_engine, Base, AsyncSessionLocal, get_async_db, upgrade_schema
 from models import User, Location, RiskPrediction
-from schemas import UserCreate, UserResponse, LocationRequest, RiskResponse, RouteRequest, RouteResponse
-from auth import get_password_hash, verify_password, create_access_token, get_current_user
+from schemas import UserCreate, UserResponse, LocationRequest, RiskResponse, BatchRiskResponse, RouteRequest, RouteResponse, Waypoint, PredictionHistoryResponse, RouteAlternativesRequest, RouteAlternativesResponse, RouteOption
+from auth import password_hasher, create_access_token, get_current_user, get_optional_user, get_pwd_context, user_cache
+from geo import SEOUL_BBOX, calculate_distance, distance_to_segment, geohash_cell, snap_to_grid
+from cache import TTLCache, MemoryLRUCache
+from shared_cache import SharedCache, CACHE_BACKEND, SLOT_HEADER_BYTES
+from kakao_client import KakaoClient, KAKAO_CACHE_SIZE, KAKAO_CACHE_TTL
+from gazetteer import Gazetteer, PlaceRecorder, watch_locations
+from spatial_index import build_zone_index
+from risk import KM_PER_DEGREE, ZoneArrays, geohash_cells, risk_grades_batch, get_risk_level, get_risk_message
+from risk_model import load_risk_model
+from micro_batch import MicroBatcher
+from metrics import registry, http_request_duration, stage_duration, cache_collector, Counter, Gauge
+from structured_log import get_logger, start_logging, stop_logging
+from risk_tiles import RiskTileCache, TILE_FORMATS
+from zone_store import ZoneStore, ZONE_RELOAD_INTERVAL, ZONE_DATA_PATH, DUMMY_RISK_ZONES
+from prediction_writer import PredictionWriter, GEOHASH_PRECISION
+from prediction_history import fetch_history, backfill_geohash, MAX_HISTORY_PAGE_SIZE
+from road_graph import load_road_graph
+from route_index import RouteIndex
+from route_risk import score_routes, rank_routes, offset_waypoints, ROUTE_SPEED_KMH, MAX_ROUTE_ALTERNATIVES, DETOUR_OFFSETS_KM
+from geofence import GeofenceIndex, TrackSession, LiveTrackStats, parse_fix
 
 
 load_dotenv()
 KAKAO_API_KEY = os.getenv("KAKAO_API_KEY", "YOUR_KAKAO_REST_API_KEY")
+KAKAO_KEYWORD_PATH = "/v2/local/search/keyword.json"
+KAKAO_ADDRESS_PATH = "/v2/local/search/address.json"
 
-# 데이터베이스 테이블 생성
-Base.metadata.create_all(bind=engine)
+log = get_logger("api")
+
+# CACHE_BACKEND=shared 일 때 워커 간 공유 캐시 칸 크기 (pickle 한 값이 이보다 크면 캐시하지 않음)
+KAKAO_CACHE_SLOT_BYTES = int(os.getenv("KAKAO_CACHE_SLOT_BYTES", "16384"))
+ROUTE_CACHE_SLOT_BYTES = int(os.getenv("ROUTE_CACHE_SLOT_BYTES", "8192"))
+PREDICTION_CACHE_SLOT_BYTES = 64
+
+# 카카오 API 공유 클라이언트 (연결 재사용 + 검색 결과 캐시)
+kakao_client = KakaoClient(
+    KAKAO_API_KEY,
+    cache=SharedCache(maxsize=KAKAO_CACHE_SIZE, ttl=KAKAO_CACHE_TTL, slot_bytes=KAKAO_CACHE_SLOT_BYTES)
+    if CACHE_BACKEND == "shared" else None,
+)
+
+# 로컬 지명 사전 (카카오 검색 결과를 Location 테이블에 저장하고 자동완성에 사용)
+gazetteer = Gazetteer()
+place_recorder = PlaceRecorder(gazetteer)
+
+# 로그인 사용자 예측 기록 일괄 저장기
+prediction_writer = PredictionWriter()
+
+def init_schema():
+    """데이터베이스 테이블 생성 (기존 테이블은 새 컬럼/인덱스만 추가)"""
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine, Base.metadata)
 
 app = FastAPI(title="Seoul Sinkhole Prediction API", version="1.0.0")
 
@@ -38,57 +91,343 @@ app.add_middleware(
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-# 데이터베이스 의존성
-def get_db():
-    db = SessionLocal()
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """엔드포인트(경로 템플릿)별 응답 지연 기록"""
+    start = time.perf_counter()
+    status_code = 500
     try:
-        yield db
+        if not ready and request.url.path not in READINESS_EXEMPT_PATHS:
+            # 로드 밸런서가 /ready 를 확인하기 전에 들어온 요청
+            response = JSONResponse({"detail": "서버 준비 중입니다."}, status_code=503, headers={"Retry-After": "1"})
+        else:
+            response = await call_next(request)
+        status_code = response.status_code
+        return response
     finally:
-        db.close()
-
-# 서울시 더미 위험지역 데이터 (실제 좌표 기반)
-DUMMY_RISK_ZONES = [
-    {"lat": 37.5665, "lng": 126.9780, "risk": 0.85, "name": "중구 명동"},
-    {"lat": 37.5663, "lng": 126.9779, "risk": 0.90, "name": "중구 명동 인근"},
-    {"lat": 37.5519, "lng": 126.9918, "risk": 0.78, "name": "강남구 논현동"},
-    {"lat": 37.5172, "lng": 127.0473, "risk": 0.82, "name": "강남구 삼성동"},
-    {"lat": 37.5794, "lng": 126.9770, "risk": 0.75, "name": "종로구 종로1가"},
-    {"lat": 37.5512, "lng": 126.9882, "risk": 0.88, "name": "서초구 서초동"},
-    {"lat": 37.5326, "lng": 126.9026, "risk": 0.73, "name": "영등포구 여의도동"},
-    {"lat": 37.5838, "lng": 127.0580, "risk": 0.80, "name": "성동구 성수동"},
-    {"lat": 37.5145, "lng": 126.9061, "risk": 0.77, "name": "관악구 신림동"},
-    {"lat": 37.6065, "lng": 127.0921, "risk": 0.84, "name": "동대문구 청량리동"},
-]
+        route = request.scope.get("route")
+        path = route.path if route is not None else "unmatched"
+        http_request_duration.observe(request.method, path, str(status_code), value=time.perf_counter() - start)
+
+@app.on_event("startup")
+async def start_logs():
+    # 이전 shutdown 에서 멈춘 로그 쓰기 스레드 재시작 (테스트 등에서 앱을 여러 번 띄울 때)
+    start_logging()
+
+@app.on_event("startup")
+async def create_schema():
+    await run_in_threadpool(init_schema)
+
+@app.on_event("startup")
+async def start_kakao_client():
+    await kakao_client.start()
+
+@app.on_event("shutdown")
+async def close_kakao_client():
+    await kakao_client.aclose()
+
+@app.on_event("shutdown")
+async def close_password_hasher():
+    password_hasher.shutdown()
+
+@app.on_event("startup")
+async def start_prediction_writer():
+    # geohash 컬럼 추가 전 기록이 있으면 근처 조회에 잡히도록 먼저 채움
+    async with AsyncSessionLocal() as db:
+        filled = await backfill_geohash(db, GEOHASH_PRECISION)
+    if filled:
+        log.info("prediction_geohash_backfilled", rows=filled)
+    prediction_writer.start()
+
+@app.on_event("shutdown")
+async def stop_prediction_writer():
+    # DB 엔진을 닫기 전에 남은 예측 기록을 모두 저장
+    await prediction_writer.stop()
+
+@app.on_event("startup")
+async def start_warm_up():
+    # 무거운 자원은 요청을 받기 시작한 뒤 백그라운드에서 준비 (끝나면 /ready 가 200)
+    app.state.warm_up = asyncio.create_task(warm_up())
+
+@app.on_event("shutdown")
+async def stop_warm_up():
+    global ready
+    ready = False
+    task = getattr(app.state, "warm_up", None)
+    if task is not None and not task.done():
+        task.cancel()
+
+@app.on_event("shutdown")
+async def stop_gazetteer():
+    watcher = getattr(app.state, "gazetteer_watcher", None)
+    if watcher is not None:
+        watcher.cancel()
+    # DB 엔진을 닫기 전에 저장 중인 장소를 마저 저장
+    await place_recorder.drain()
+
+@app.on_event("shutdown")
+async def close_database():
+    await async_engine.dispose()
+
+@app.on_event("shutdown")
+async def flush_logs():
+    # 큐에 남은 로그를 모두 쓴 뒤 종료
+    stop_logging()
+
+# 보행자 도로 그래프 (ROAD_GRAPH_PATH 미설정 시 단순 우회 경로로 대체)
+ROAD_GRAPH_PATH = os.getenv("ROAD_GRAPH_PATH")
+# 전처리된 CCH 경로 인덱스 (route_index.py 로 생성, 미설정 시 A* 사용)
+ROUTE_INDEX_PATH = os.getenv("ROUTE_INDEX_PATH")
+
+# 아래 자원은 데이터 크기에 따라 만드는 데 오래 걸리므로 import 시점이 아니라 load_resources() 에서 만든다
+# (uvicorn 은 서버 시작 후 백그라운드에서, serve.py 는 워커끼리 공유하도록 fork 전에 호출)
+zone_store = None
+# 현재 버전의 위험지역 데이터와 색인 (ZoneState, 교체 시 통째로 바꿔 끼움)
+zone_state = None
+risk_tiles = None
+road_graph = None
+route_index = None
+# 위험도 예측 모델 (RISK_MODEL_PATH 미설정 시 거리 구간 규칙)
+risk_model = None
+resources_loaded = False
+live_tracks = LiveTrackStats()
+
+# 준비 상태 (load_resources, 모델 예열, 지명 사전 적재가 끝나면 True)
+ready = False
+# 준비 전에도 응답하는 경로 (상태 확인, 지표)
+READINESS_EXEMPT_PATHS = ("/health", "/ready", "/metrics")
+
+class ZoneState:
+    """한 버전의 위험지역 데이터와 그로부터 만든 색인
+
+    핸들러는 zone_state 를 한 번 읽어 그 안의 값만 쓰고, 교체는 새 ZoneState 를 다 만든 뒤
+    zone_state 에 한 번 대입한다 (서로 다른 버전의 인덱스/배열이 섞여 보이지 않음).
+    위험지역 데이터는 컬럼 배열(arrays)로만 들고, 응답용 딕셔너리는 돌려주는 행만 만든다.
+    """
+
+    __slots__ = ("index", "arrays", "version", "geofence")
+
+    def __init__(self, index, arrays: ZoneArrays, version: int, geofence: GeofenceIndex):
+        self.index = index
+        self.arrays = arrays
+        self.version = version
+        # 실시간 위치 추적(/ws/track)용 칸별 위험 등급
+        self.geofence = geofence
+
+def build_zone_state(arrays: ZoneArrays, version: int) -> ZoneState:
+    """위험지역 컬럼 배열로 공간 인덱스/지오펜스 생성 (오래 걸리므로 이벤트 루프 밖에서 호출)"""
+    index = build_zone_index(arrays)
+    geofence = GeofenceIndex(risk_model, arrays, version)
+    geofence.warm()
+    return ZoneState(index, arrays, version, geofence)
+
+def load_resources():
+    """위험지역 데이터/인덱스, 도로 그래프, 경로 인덱스, 위험도 모델, 지오펜스 생성 (한 번만 실행)"""
+    global zone_store, zone_state, risk_tiles, road_graph, route_index, risk_model, resources_loaded
+    if resources_loaded:
+        return
+    started = time.perf_counter()
+    arrays, version = ZoneArrays(DUMMY_RISK_ZONES), 1
+    if ZONE_DATA_PATH:
+        zone_store = ZoneStore(ZONE_DATA_PATH)
+        zone_store.refresh()
+        arrays, version = zone_store.snapshot.arrays, zone_store.snapshot.version
+    
+    risk_model = load_risk_model()
+    state = build_zone_state(arrays, version)
+    risk_tiles = RiskTileCache(state.arrays, risk_model)
+    road_graph = load_road_graph(ROAD_GRAPH_PATH, state.arrays, risk_model) if ROAD_GRAPH_PATH else None
+    route_index = RouteIndex.load(ROUTE_INDEX_PATH, road_graph) if ROUTE_INDEX_PATH and road_graph is not None else None
+    zone_state = state
+    resources_loaded = True
+    log.info("resources_loaded", zones=len(state.arrays), road_graph=road_graph is not None,
+             route_index=route_index is not None, risk_model=risk_model.name, geofence_cells=len(state.geofence),
+             seconds=round(time.perf_counter() - started, 3))
+
+def score_points(points: list) -> list:
+    """(위도, 경도) 목록의 위험도를 한 번에 계산 -> [(점수, 위험지역 데이터 버전), ...]"""
+    state = zone_state
+    arrays, version = state.arrays, state.version
+    coords = np.array(points, dtype=np.float64).reshape(-1, 2)
+    with stage_duration.time("zone_scan"):
+        scores = risk_model.score(coords[:, 0], coords[:, 1], arrays)
+    return [(score, version) for score in scores.tolist()]
+
+# 동시에 들어온 /predict-risk 요청을 묶어 한 번에 추론
+risk_batcher = MicroBatcher(score_points)
+
+# 위험도 예측 캐시: 좌표를 PREDICTION_CACHE_PRECISION 자리 지오해시 칸 중심으로 맞춰 계산하고
+# (데이터 버전, 칸) 으로 저장 (8 = 약 38m x 19m, 0 이면 좌표를 그대로 쓰고 캐시하지 않음)
+PREDICTION_CACHE_PRECISION = int(os.getenv("PREDICTION_CACHE_PRECISION", "8"))
+PREDICTION_CACHE_BYTES = int(os.getenv("PREDICTION_CACHE_BYTES", str(16 * 1024 * 1024)))
+if CACHE_BACKEND == "shared":
+    # 칸 헤더 포함 같은 메모리 예산 안에 들어가는 칸 수
+    prediction_cache = SharedCache(maxsize=PREDICTION_CACHE_BYTES // (PREDICTION_CACHE_SLOT_BYTES + SLOT_HEADER_BYTES),
+                                   slot_bytes=PREDICTION_CACHE_SLOT_BYTES)
+else:
+    prediction_cache = MemoryLRUCache(maxbytes=PREDICTION_CACHE_BYTES)
+
+async def predict_point(lat: float, lng: float) -> tuple:
+    """한 지점의 (위험도, 위험지역 데이터 버전) - 같은 칸이면 캐시 결과 사용"""
+    if PREDICTION_CACHE_PRECISION <= 0:
+        return await risk_batcher.submit((lat, lng))
+    lat_cell, lng_cell, center_lat, center_lng = geohash_cell(lat, lng, PREDICTION_CACHE_PRECISION)
+    version = zone_state.version
+    risk_score = prediction_cache.get((version, lat_cell, lng_cell))
+    if risk_score is not None:
+        return risk_score, version
+    risk_score, version = await risk_batcher.submit((center_lat, center_lng))
+    prediction_cache.set((version, lat_cell, lng_cell), risk_score)
+    return risk_score, version
+
+def score_points_batch(lats: np.ndarray, lngs: np.ndarray, arrays: ZoneArrays) -> np.ndarray:
+    """여러 지점의 위험도 (단건 예측과 같은 칸 중심 좌표 사용, 같은 칸은 한 번만 계산)"""
+    with stage_duration.time("zone_scan_batch"):
+        if PREDICTION_CACHE_PRECISION <= 0:
+            return risk_model.score(lats, lngs, arrays)
+        lat_cell, lng_cell, center_lat, center_lng = geohash_cells(lats, lngs, PREDICTION_CACHE_PRECISION)
+        _, first, inverse = np.unique(np.stack([lat_cell, lng_cell], axis=1), axis=0, return_index=True, return_inverse=True)
+        return risk_model.score(center_lat[first], center_lng[first], arrays)[inverse.reshape(-1)]
+
+async def warm_up():
+    """자원 생성, 모델/bcrypt 예열, 지명 사전 적재 후 준비 상태로 전환 (start_warm_up 이 백그라운드로 실행)"""
+    global ready
+    started = time.perf_counter()
+    try:
+        await run_in_threadpool(load_resources)
+        # 첫 요청이 모델/NumPy 초기화 비용을 떠안지 않도록 한 번 미리 계산
+        await run_in_threadpool(score_points, [(SEOUL_BBOX[0], SEOUL_BBOX[1])])
+        # 첫 로그인이 passlib import 와 bcrypt 백엔드 확인을 기다리지 않도록 미리 로드
+        await run_in_threadpool(lambda: get_pwd_context().handler("bcrypt").get_backend())
+        loaded = await gazetteer.refresh()
+    except Exception as e:
+        app.state.warm_up_error = str(e)
+        log.error("warm_up_failed", error=str(e))
+        return
+    log.info("gazetteer_loaded", places=len(gazetteer), rows=loaded)
+    app.state.gazetteer_watcher = asyncio.create_task(watch_locations(gazetteer))
+    if zone_store is not None:
+        app.state.zone_watcher = asyncio.create_task(watch_zone_store())
+    app.state.warm_up_seconds = time.perf_counter() - started
+    ready = True
+    log.info("ready", seconds=round(app.state.warm_up_seconds, 3))
+
+# 일괄 예측 요청 1회당 최대 지점 수
+MAX_BATCH_SIZE = 100_000
+
+# /risk-zones 한 페이지 최대 지역 수
+MAX_ZONE_PAGE_SIZE = 5000
+
+# 안전 경로 캐시 (출발/도착 좌표를 ROUTE_CACHE_CELL_M 미터 격자로 맞춰 같은 칸이면 재사용)
+ROUTE_CACHE_CELL_M = float(os.getenv("ROUTE_CACHE_CELL_M", "50"))
+ROUTE_CACHE_TTL = float(os.getenv("ROUTE_CACHE_TTL", "600"))  # 초
+ROUTE_CACHE_SIZE = int(os.getenv("ROUTE_CACHE_SIZE", "10000"))
+if CACHE_BACKEND == "shared":
+    route_cache = SharedCache(maxsize=ROUTE_CACHE_SIZE, ttl=ROUTE_CACHE_TTL, slot_bytes=ROUTE_CACHE_SLOT_BYTES)
+else:
+    route_cache = TTLCache(maxsize=ROUTE_CACHE_SIZE, ttl=ROUTE_CACHE_TTL)
+
+def apply_zone_weights(previous: ZoneState, state: ZoneState):
+    """새 위험지역 데이터로 타일 캐시/도로 가중치/경로 인덱스 갱신 (스레드 풀에서 실행)"""
+    # 추가/삭제/변경된 위험지역 주변 타일만 무효화
+    risk_tiles.update_zones(state.arrays, changed_zones(previous.arrays, state.arrays))
+    if road_graph is not None:
+        road_graph.set_risk_weights(state.arrays, risk_model)
+    if route_index is not None:
+        # 비용이 바뀐 바로가기만 다시 계산
+        route_index.customize(road_graph.edge_cost)
+
+def changed_zones(old: ZoneArrays, new: ZoneArrays) -> list:
+    """두 버전 사이에 추가/삭제/변경된 위험지역 (좌표와 위험도가 같은 행은 제외)"""
+    def row_keys(arrays: ZoneArrays) -> np.ndarray:
+        # (위도, 경도, 위험도) 한 행을 24바이트 값 하나로 보고 배열끼리 비교
+        rows = np.ascontiguousarray(np.column_stack([arrays.lat, arrays.lng, arrays.risk]), dtype=np.float64)
+        return rows.view(np.dtype((np.void, rows.itemsize * 3))).ravel()
+
+    old_keys, new_keys = row_keys(old), row_keys(new)
+    removed = np.flatnonzero(~np.isin(old_keys, new_keys))
+    added = np.flatnonzero(~np.isin(new_keys, old_keys))
+    return old.rows(removed) + new.rows(added)
+
+async def update_risk_zones(arrays: ZoneArrays, version: Optional[int] = None):
+    """위험지역 데이터 교체 (version 미지정 시 현재 버전 + 1)
+
+    인덱스/지오펜스 생성과 타일/도로 가중치 갱신은 스레드 풀에서 하고, 이벤트 루프에서는
+    완성된 ZoneState 를 한 번에 바꿔 끼운 뒤 캐시만 비운다.
+    """
+    global zone_state
+    previous = zone_state
+    version = version if version is not None else previous.version + 1
+    state = await run_in_threadpool(build_zone_state, arrays, version)
+    await run_in_threadpool(apply_zone_weights, previous, state)
+    
+    zone_state = state
+    # 이전 버전으로 계산된 경로는 더 이상 조회되지 않도록 버전 변경 후 비움
+    # (추적 중인 연결은 다음 좌표에서 새 지오펜스로 등급을 다시 확인)
+    route_cache.clear()
+    prediction_cache.clear()
+
+async def watch_zone_store():
+    """위험지역 데이터 파일/공유 스냅샷 변경을 주기적으로 확인해 교체"""
+    while True:
+        await asyncio.sleep(ZONE_RELOAD_INTERVAL)
+        try:
+            changed = await run_in_threadpool(zone_store.refresh)
+        except (OSError, ValueError, KeyError) as e:
+            log.warning("zone_refresh_failed", error=str(e))
+            continue
+        if changed:
+            snapshot = zone_store.snapshot
+            await update_risk_zones(snapshot.arrays, version=snapshot.version)
+            log.info("zone_data_applied", version=snapshot.version, zones=len(snapshot))
+
+@app.on_event("shutdown")
+async def stop_zone_watcher():
+    watcher = getattr(app.state, "zone_watcher", None)
+    if watcher is not None:
+        watcher.cancel()
 
 @app.post("/register", response_model=UserResponse)
-async def register(user: UserCreate, db: Session = Depends(get_db)):
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
     """회원가입"""
     # 중복 사용자 확인
-    db_user = db.query(User).filter(User.email == user.email).first()
+    db_user = (await db.execute(select(User).where(User.email == user.email))).scalar_one_or_none()
     if db_user:
         raise HTTPException(
             status_code=400,
             detail="Email already registered"
         )
     
+    # 해시 계산 동안 DB 연결을 붙잡지 않도록 풀에 반환 (세션은 이후 다시 사용 가능)
+    await db.close()
+    
     # 새 사용자 생성
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await password_hasher.hash(user.password)
     db_user = User(
         email=user.email,
         name=user.name,
         hashed_password=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # 해시 계산 중 같은 이메일이 먼저 가입된 경우 (email 유니크 제약)
+        await db.rollback()
+        raise HTTPException(
+            status_code=400,
+            detail="Email already registered"
+        )
     
     return UserResponse(id=db_user.id, email=db_user.email, name=db_user.name)
 
 @app.post("/token")
-async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
     """로그인"""
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = (await db.execute(select(User).where(User.email == form_data.username))).scalar_one_or_none()
+    # 이미 읽은 값만 쓰므로 검증 전에 DB 연결을 풀에 반환
+    await db.close()
+    if not user or not await password_hasher.verify(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -106,48 +445,198 @@ async def read_users_me(current_user: User = Depends(get_current_user)):
 @app.post("/predict-risk", response_model=RiskResponse)
 async def predict_sinkhole_risk(
     location: LocationRequest, 
-    db: Session = Depends(get_db)
+    current_user: Optional[User] = Depends(get_optional_user)
 ):
-    """지정 위치의 싱크홀 위험도 예측 (로그인 불필요)"""
-    
-    # 주변 위험지역과의 거리 기반으로 위험도 계산
-    min_distance = float('inf')
-    nearest_risk = 0.0
-    
-    for zone in DUMMY_RISK_ZONES:
-        distance = calculate_distance(location.latitude, location.longitude, zone["lat"], zone["lng"])
-        if distance < min_distance:
-            min_distance = distance
-            nearest_risk = zone["risk"]
-    
-    # 거리에 따른 위험도 조정 (가까울수록 높은 위험도)
-    if min_distance < 0.5:  # 500m 이내
-        risk_score = max(0.7, nearest_risk)
-    elif min_distance < 1.0:  # 1km 이내
-        risk_score = max(0.4, nearest_risk * 0.7)
-    elif min_distance < 2.0:  # 2km 이내
-        risk_score = max(0.2, nearest_risk * 0.5)
-    else:
-        risk_score = min(0.3, random.uniform(0.1, 0.3))
+    """지정 위치의 싱크홀 위험도 예측 (로그인 불필요, 로그인한 경우 예측 기록 저장)"""
+    
+    # 주변 위험지역 특징으로 위험도 예측 (같은 칸은 캐시 사용, 나머지는 동시 요청과 묶어 한 번에 추론)
+    risk_score, version = await predict_point(location.latitude, location.longitude)
     
-    # 예측 결과는 DB에 저장하지 않음 (로그인 불필요하므로)
+    # 로그인 사용자는 예측 기록을 버퍼에 넣고 백그라운드에서 일괄 저장 (응답은 커밋을 기다리지 않음)
+    if current_user is not None:
+        prediction_writer.submit(current_user.id, location.latitude, location.longitude, risk_score)
     
     return RiskResponse(
         latitude=location.latitude,
         longitude=location.longitude,
         risk_score=round(risk_score, 3),
         risk_level=get_risk_level(risk_score),
-        message=get_risk_message(risk_score)
+        message=get_risk_message(risk_score),
+        zone_version=version
     )
 
+@app.get("/predictions/history", response_model=PredictionHistoryResponse)
+async def get_prediction_history(
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    radius_km: float = 1.0,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """내 예측 기록 조회 (최신순, 로그인 필요)
+
+    since/until 로 기간을, latitude/longitude/radius_km 로 근처 기록만 거르고,
+    next_cursor 를 cursor 로 넘겨 다음 페이지를 이어 받는다.
+    """
+    if not 1 <= limit <= MAX_HISTORY_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit 은 1~{MAX_HISTORY_PAGE_SIZE} 사이여야 합니다.")
+    if (latitude is None) != (longitude is None):
+        raise HTTPException(status_code=400, detail="latitude 와 longitude 는 함께 지정해야 합니다.")
+    if not 0 < radius_km <= 50:
+        raise HTTPException(status_code=400, detail="radius_km 는 0 초과 50 이하여야 합니다.")
+    
+    try:
+        items, next_cursor = await fetch_history(
+            db, current_user.id, latitude, longitude, radius_km, since, until, limit, cursor
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+    return PredictionHistoryResponse(items=items, next_cursor=next_cursor)
+
+@app.post("/predict-risk/batch", response_model=BatchRiskResponse, response_model_exclude_none=True)
+async def predict_sinkhole_risk_batch(request: Request):
+    """여러 위치의 싱크홀 위험도 일괄 예측 (로그인 불필요)
+
+    본문 형식: JSON 배열(application/json), 줄 단위 JSON(application/x-ndjson),
+    위도/경도 float64 쌍을 이어 붙인 바이너리(application/octet-stream).
+    각 지점의 결과는 같은 좌표로 단건 예측한 결과와 같다.
+    """
+    body = await request.body()
+    try:
+        lats, lngs = parse_batch_locations(body, request.headers.get("content-type", ""))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # NaN/inf 좌표는 형식과 관계없이 단건 요청의 검증 실패와 같이 422로 거절
+    if not (np.isfinite(lats).all() and np.isfinite(lngs).all()):
+        raise HTTPException(status_code=422, detail="위도/경도는 유한한 숫자여야 합니다.")
+    
+    if len(lats) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=413, detail=f"한 번에 최대 {MAX_BATCH_SIZE}개 지점까지 예측할 수 있습니다.")
+    
+    # 거리 행렬 계산은 이벤트 루프를 막지 않도록 스레드에서 수행
+    state = zone_state
+    arrays, version = state.arrays, state.version
+    scores = await run_in_threadpool(score_points_batch, lats, lngs, arrays)
+    levels, messages = risk_grades_batch(scores)
+    
+    results = [
+        {
+            "latitude": lat,
+            "longitude": lng,
+            "risk_score": round(score, 3),
+            "risk_level": level,
+            "message": message
+        }
+        for lat, lng, score, level, message in zip(lats.tolist(), lngs.tolist(), scores.tolist(), levels.tolist(), messages.tolist())
+    ]
+    
+    if "application/x-ndjson" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            (json.dumps(result, ensure_ascii=False) + "\n" for result in results),
+            media_type="application/x-ndjson"
+        )
+    
+    return {"results": results, "total_count": len(results), "zone_version": version}
+
 @app.get("/risk-zones")
-async def get_risk_zones():
-    """서울시 위험지역 목록 반환 (로그인 불필요)"""
+async def get_risk_zones(
+    request: Request,
+    response: Response,
+    bbox: Optional[str] = None,
+    min_risk: Optional[float] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    format: str = "json"
+):
+    """서울시 위험지역 목록 반환 (로그인 불필요)
+
+    bbox=최소위도,최소경도,최대위도,최대경도 / min_risk 로 거르고, limit 을 주면
+    next_cursor 로 다음 페이지를 이어 받는다. format=ndjson (또는 Accept: application/x-ndjson)
+    이면 한 줄에 한 지역씩 스트리밍하고 다음 커서는 X-Next-Cursor 헤더로 알려 준다.
+    """
+    if format not in ("json", "ndjson"):
+        raise HTTPException(status_code=400, detail="format 은 json 또는 ndjson 만 지원합니다.")
+    if limit is not None and not 1 <= limit <= MAX_ZONE_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit 은 1~{MAX_ZONE_PAGE_SIZE} 사이여야 합니다.")
+    
+    state = zone_state
+    index, arrays, version = state.index, state.arrays, state.version
+    
+    # 같은 데이터 버전 + 같은 질의면 같은 응답
+    query = sorted(request.query_params.multi_items())
+    etag = f'"zones-{version}-{hashlib.sha1(repr(query).encode()).hexdigest()[:16]}"'
+    if_none_match = request.headers.get("if-none-match", "")
+    if etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")] or if_none_match.strip() == "*":
+        return Response(status_code=304, headers={"ETag": etag})
+    
+    if bbox:
+        try:
+            min_lat, min_lng, max_lat, max_lng = (float(value) for value in bbox.split(","))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="bbox 는 최소위도,최소경도,최대위도,최대경도 형식이어야 합니다.")
+        indices = index.in_bbox(min_lat, min_lng, max_lat, max_lng)
+    else:
+        indices = range(len(arrays))
+    if min_risk is not None:
+        selected = np.asarray(indices, dtype=np.int64)
+        indices = selected[arrays.risk[selected] >= min_risk].tolist()
+    
+    # 커서: (데이터 버전, 마지막으로 보낸 지역 번호)
+    start = 0
+    if cursor:
+        try:
+            cursor_version, last = (int(value) for value in base64.urlsafe_b64decode(cursor.encode()).decode().split(":"))
+        except ValueError:
+            raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+        if cursor_version != version:
+            raise HTTPException(status_code=410, detail="위험지역 데이터가 갱신되었습니다. 처음부터 다시 요청하세요.")
+        start = bisect.bisect_right(indices, last)
+    
+    end = len(indices) if limit is None else min(len(indices), start + limit)
+    page = arrays.rows(indices[start:end])
+    next_cursor = None
+    if end < len(indices):
+        next_cursor = base64.urlsafe_b64encode(f"{version}:{indices[end - 1]}".encode()).decode()
+    
+    headers = {"ETag": etag, "X-Zone-Version": str(version)}
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    
+    if format == "ndjson" or "application/x-ndjson" in request.headers.get("accept", ""):
+        return StreamingResponse(
+            (json.dumps(zone, ensure_ascii=False) + "\n" for zone in page),
+            media_type="application/x-ndjson",
+            headers=headers
+        )
+    
+    response.headers.update(headers)
     return {
-        "zones": DUMMY_RISK_ZONES,
-        "total_count": len(DUMMY_RISK_ZONES)
+        "zones": page,
+        "total_count": len(indices),
+        "zone_version": version,
+        "next_cursor": next_cursor
     }
 
+@app.get("/risk-tiles/{z}/{x}/{y}")
+async def get_risk_tile(z: int, x: int, y: int, format: str = "png"):
+    """서울시 위험도 래스터 타일 (png: 범례 색상 PNG, raw: 256x256 uint8) (로그인 불필요)"""
+    if format not in TILE_FORMATS:
+        raise HTTPException(status_code=400, detail="format 은 png 또는 raw 만 지원합니다.")
+    if not risk_tiles.covers(z, x, y):
+        raise HTTPException(status_code=404, detail="서울시 범위를 벗어난 타일입니다.")
+    
+    path = await run_in_threadpool(risk_tiles.tile_path, z, x, y, format)
+    return FileResponse(
+        path,
+        media_type=TILE_FORMATS[format],
+        headers={"Cache-Control": "public, max-age=3600"}
+    )
+
 @app.post("/safe-route", response_model=RouteResponse)
 async def get_safe_route(route_request: RouteRequest):
     """위험지역을 우회하는 안전 경로 생성 (로그인 불필요)"""
@@ -155,12 +644,109 @@ async def get_safe_route(route_request: RouteRequest):
     start_lat, start_lng = route_request.start_latitude, route_request.start_longitude
     end_lat, end_lng = route_request.end_latitude, route_request.end_longitude
     
+    state = zone_state
+    cache_key = (
+        state.version,
+        snap_to_grid(start_lat, start_lng, ROUTE_CACHE_CELL_M),
+        snap_to_grid(end_lat, end_lng, ROUTE_CACHE_CELL_M),
+    )
+    cached = route_cache.get(cache_key)
+    if cached is not None:
+        # 같은 격자 칸의 경로 재사용, 시작/끝 좌표만 요청 좌표로 교체
+        waypoints = [Waypoint(lat=start_lat, lng=start_lng), *cached.waypoints[1:-1], Waypoint(lat=end_lat, lng=end_lng)]
+        return cached.model_copy(update={"waypoints": waypoints})
+    
+    route = await build_safe_route(state, start_lat, start_lng, end_lat, end_lng)
+    route_cache.set(cache_key, route)
+    return route
+
+cache_collector({
+    "route": route_cache.stats,
+    "kakao": kakao_client.cache.stats,
+    "user": user_cache.stats,
+    "prediction": prediction_cache.stats,
+})
+registry.register(Gauge("sinkhole_live_track_connections", "Open live-track WebSocket connections",
+                        collect=lambda: [((), live_tracks.connections)]))
+registry.register(Counter("sinkhole_live_track_events_total", "Live-track fixes, cell changes, alerts and rejected fixes",
+                          ("event",), collect=lambda: [((event,), live_tracks.stats()[event])
+                                                       for event in ("fixes", "cell_changes", "alerts", "rejected")]))
+
+@app.get("/health")
+async def get_health():
+    """프로세스 생존 확인 (준비 전에도 200)"""
+    return {"status": "ok"}
+
+@app.get("/ready")
+async def get_readiness():
+    """요청 처리 준비 여부 (위험지역 인덱스/모델/지오펜스/지명 사전이 준비되기 전에는 503)"""
+    if not ready:
+        error = getattr(app.state, "warm_up_error", None)
+        return JSONResponse({"status": "failed" if error else "starting", "error": error}, status_code=503)
+    return {"status": "ready", "zone_version": zone_state.version, "warm_up_seconds": round(app.state.warm_up_seconds, 3)}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus 텍스트 형식 지표 (엔드포인트/단계별 지연 히스토그램, 캐시 적중률)"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/cache-stats")
+async def get_cache_stats():
+    """경로/검색/사용자 캐시 적중, 실패, 제거 횟수"""
+    return {
+        "worker_pid": os.getpid(),
+        "cache_backend": CACHE_BACKEND,
+        "zone_version": zone_state.version,
+        "route": route_cache.stats(),
+        "kakao": kakao_client.cache.stats(),
+        "user": user_cache.stats(),
+        "prediction_writer": prediction_writer.stats(),
+        "prediction": prediction_cache.stats(),
+        "risk_model": risk_model.name,
+        "risk_batcher": risk_batcher.stats(),
+        "gazetteer": gazetteer.stats(),
+        "place_recorder": place_recorder.stats(),
+        "geofence": zone_state.geofence.stats(),
+        "live_tracks": live_tracks.stats(),
+    }
+
+async def build_safe_route(state: ZoneState, start_lat: float, start_lng: float, end_lat: float, end_lng: float) -> RouteResponse:
+    """안전 경로 계산 (도로 그래프가 있으면 실제 도로, 없으면 단순 우회)"""
+    version, arrays = state.version, state.arrays
+    
     # 직선 경로상의 위험지역 확인
-    dangerous_zones = []
-    for zone in DUMMY_RISK_ZONES:
-        if is_point_near_line(start_lat, start_lng, end_lat, end_lng, zone["lat"], zone["lng"], 0.5):
-            if zone["risk"] > 0.7:
-                dangerous_zones.append(zone)
+    dangerous_zones = dangerous_zones_near_line(state.arrays, start_lat, start_lng, end_lat, end_lng)
+    
+    # 도로 그래프가 있으면 위험도 가중 경로 탐색 (CCH 인덱스 우선, 없으면 A*)
+    road_route = None
+    if route_index is not None:
+        road_route = await run_in_threadpool(route_index.route, start_lat, start_lng, end_lat, end_lng)
+    elif road_graph is not None:
+        road_route = await run_in_threadpool(road_graph.route, start_lat, start_lng, end_lat, end_lng)
+    
+    if road_route is not None:
+        waypoints, distance = road_route
+        # 직선 경로상의 위험지역 중 실제 경로가 500m 이상 떨어져 지나가는 곳
+        dangerous_zones = [zone for zone in dangerous_zones if distance_to_route(zone["lat"], zone["lng"], waypoints) >= 0.5]
+        if dangerous_zones:
+            route_type = "safe_detour"
+            message = f"도로망 기준 {len(dangerous_zones)}개의 위험지역을 우회하는 경로입니다."
+        else:
+            route_type = "direct"
+            message = "도로망 기준 위험도를 반영한 최적 경로입니다."
+        
+        [score] = await run_in_threadpool(score_route_batch, [waypoints], arrays)
+        return RouteResponse(
+            waypoints=waypoints,
+            distance=distance,
+            estimated_time=estimate_travel_time(waypoints),
+            route_type=route_type,
+            avoided_zones=dangerous_zones,
+            message=message,
+            zone_version=version,
+            risk_exposure=score["risk_exposure"],
+            peak_risk=score["peak_risk"]
+        )
     
     # 안전 경로 생성 (위험지역 우회)
     if dangerous_zones:
@@ -177,14 +763,148 @@ async def get_safe_route(route_request: RouteRequest):
         route_type = "direct"
         message = "위험지역이 없어 직선 경로를 제공합니다."
     
+    [score] = await run_in_threadpool(score_route_batch, [waypoints], arrays)
     return RouteResponse(
         waypoints=waypoints,
         distance=calculate_distance(start_lat, start_lng, end_lat, end_lng),
         estimated_time=estimate_travel_time(waypoints),
         route_type=route_type,
         avoided_zones=dangerous_zones,
-        message=message
+        message=message,
+        zone_version=version,
+        risk_exposure=score["risk_exposure"],
+        peak_risk=score["peak_risk"]
+    )
+
+def score_route_batch(routes: list, arrays: ZoneArrays) -> list:
+    """여러 경로의 위험 노출도를 표본점 한 번의 모델 채점으로 계산 (스레드 풀에서 실행)"""
+    with stage_duration.time("route_exposure"):
+        return score_routes(routes, arrays, risk_model)
+
+def route_candidates(zones: ZoneArrays, start_lat: float, start_lng: float, end_lat: float, end_lng: float, count: int) -> list:
+    """대안 경로 후보 [(경유 좌표 목록, 경로 종류), ...]
+
+    도로 그래프가 있으면 간선 비용을 올려 가며 찾은 서로 다른 도로 경로 (요청 수의 2배까지),
+    없으면 직선, 위험지역 우회, 중점을 좌우로 옮긴 우회 경로
+    """
+    if road_graph is not None:
+        return [(waypoints, "road") for waypoints, _ in road_graph.alternatives(start_lat, start_lng, end_lat, end_lng, count * 2)]
+    
+    candidates = [([{"lat": start_lat, "lng": start_lng}, {"lat": end_lat, "lng": end_lng}], "direct")]
+    dangerous_zones = dangerous_zones_near_line(zones, start_lat, start_lng, end_lat, end_lng)
+    if dangerous_zones:
+        candidates.append((generate_safe_waypoints(start_lat, start_lng, end_lat, end_lng, dangerous_zones), "safe_detour"))
+    for offset in DETOUR_OFFSETS_KM:
+        for side in (1, -1):
+            candidates.append((offset_waypoints(start_lat, start_lng, end_lat, end_lng, side * offset), "offset_detour"))
+    return candidates
+
+@app.post("/safe-route/alternatives", response_model=RouteAlternativesResponse)
+async def get_safe_route_alternatives(route_request: RouteAlternativesRequest):
+    """소요 시간과 위험 노출도를 함께 고려한 경로 최대 k개 (로그인 불필요)
+
+    risk_tradeoff 0 = 가장 빠른 경로 우선, 1 = 위험 노출이 가장 적은 경로 우선
+    """
+    if not 1 <= route_request.alternatives <= MAX_ROUTE_ALTERNATIVES:
+        raise HTTPException(status_code=400, detail=f"alternatives 는 1~{MAX_ROUTE_ALTERNATIVES} 사이여야 합니다.")
+    if not 0 <= route_request.risk_tradeoff <= 1:
+        raise HTTPException(status_code=400, detail="risk_tradeoff 는 0~1 사이여야 합니다.")
+    
+    state = zone_state
+    version, arrays = state.version, state.arrays
+    candidates = await run_in_threadpool(
+        route_candidates,
+        state.arrays,
+        route_request.start_latitude, route_request.start_longitude,
+        route_request.end_latitude, route_request.end_longitude,
+        route_request.alternatives,
     )
+    scores = await run_in_threadpool(score_route_batch, [waypoints for waypoints, _ in candidates], arrays)
+    order, costs = rank_routes(scores, route_request.risk_tradeoff)
+    
+    routes = []
+    for i in order[:route_request.alternatives]:
+        waypoints, route_type = candidates[i]
+        routes.append(RouteOption(
+            waypoints=waypoints,
+            distance=scores[i]["distance"],
+            estimated_time=int(scores[i]["minutes"]),
+            route_type=route_type,
+            risk_exposure=scores[i]["risk_exposure"],
+            peak_risk=scores[i]["peak_risk"],
+            tradeoff_cost=round(costs[i], 6),
+        ))
+    return RouteAlternativesResponse(routes=routes, risk_tradeoff=route_request.risk_tradeoff, zone_version=version)
+
+# /ws/track 메시지 하나에 담을 수 있는 최대 좌표 수
+MAX_TRACK_FIXES_PER_MESSAGE = 100
+
+@app.websocket("/ws/track")
+async def track_location(websocket: WebSocket):
+    """실시간 위치 추적: GPS 좌표를 계속 받아 위험 등급이 바뀔 때만 알림 (로그인 불필요)
+
+    받는 메시지 (JSON): {"lat": 위도, "lng": 경도} 또는 그 배열 (최대 MAX_TRACK_FIXES_PER_MESSAGE 개)
+    보내는 메시지:
+    - {"type": "status", ...}: 첫 좌표의 등급
+    - {"type": "alert", "previous": 이전 등급, ...}: 등급이 바뀐 좌표
+      (둘 다 "level", "risk_score", "lat", "lng", "zone_version" 포함)
+    - {"type": "error", "detail": ...}: 형식이 틀린 메시지 (연결은 유지)
+    """
+    await websocket.accept()
+    if not ready:
+        # 1013: 잠시 후 다시 시도
+        await websocket.close(code=1013)
+        return
+    session = TrackSession()
+    live_tracks.connections += 1
+    live_tracks.opened += 1
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+            data = message.get("text")
+            try:
+                fixes = json.loads(data if data is not None else message.get("bytes") or b"")
+            except ValueError:
+                live_tracks.rejected += 1
+                await websocket.send_json({"type": "error", "detail": "JSON 형식이 아닙니다."})
+                continue
+            if not isinstance(fixes, list):
+                fixes = [fixes]
+            if len(fixes) > MAX_TRACK_FIXES_PER_MESSAGE:
+                live_tracks.rejected += len(fixes)
+                await websocket.send_json({"type": "error", "detail": f"메시지 하나에 좌표는 최대 {MAX_TRACK_FIXES_PER_MESSAGE}개입니다."})
+                continue
+            
+            for fix in fixes:
+                point = parse_fix(fix)
+                if point is None:
+                    live_tracks.rejected += 1
+                    await websocket.send_json({"type": "error", "detail": "좌표는 lat(-90~90), lng(-180~180) 숫자여야 합니다."})
+                    continue
+                live_tracks.fixes += 1
+                previous = session.level
+                # 같은 칸 안에서 움직이면 다시 계산하지 않음
+                geofence = zone_state.geofence
+                if session.contains(geofence, *point):
+                    continue
+                # 처음 들어온 칸은 위험도 모델 계산이 필요하므로 스레드 풀에서
+                cell = geofence.cached(*point) or await run_in_threadpool(geofence.lookup, *point)
+                session.enter(geofence, cell)
+                live_tracks.cell_changes += 1
+                if session.level == previous:
+                    continue
+                alert = {"type": "status"} if previous is None else {"type": "alert", "previous": previous}
+                alert.update(level=session.level, risk_score=round(session.risk, 4), lat=point[0], lng=point[1],
+                             zone_version=session.version)
+                if previous is not None:
+                    live_tracks.alerts += 1
+                await websocket.send_json(alert)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        live_tracks.connections -= 1
 
 # 유틸리티 함수들
 
@@ -200,15 +920,8 @@ async def search_location(query: str):
         return {"places": [], "error": "카카오 API 키가 설정되지 않았습니다."}
     
     try:
-        url = "https://dapi.kakao.com/v2/local/search/keyword.json"
-        headers = {
-            "Authorization": f"KakaoAK {KAKAO_API_KEY}"
-            # Content-Type 제거 (GET 요청에는 불필요)
-        }
-        
         # 파라미터 수정 - 문제가 되는 빈 값들 제거
         params = {
-            "query": query.strip(),  # 앞뒤 공백 제거
             "size": 5,               # 10 → 5로 변경
             "page": 1,               # 페이지 명시
             "sort": "accuracy"       # 정렬 기준 명시
@@ -218,30 +931,11 @@ async def search_location(query: str):
         # 서울 지역으로 검색 범위 제한 (선택사항)
         # params["rect"] = "126.734086,37.413294,127.269311,37.715133"  # 서울시 경계
         
-        print(f"카카오 API 호출: {url}")
-        print(f"파라미터: {params}")
-        
-        response = requests.get(url, headers=headers, params=params, timeout=10)
-        
-        # 상세 오류 정보 출력
-        if response.status_code != 200:
-            print(f"카카오 API 응답 코드: {response.status_code}")
-            print(f"응답 내용: {response.text}")
-            
-            # 400 오류 시 상세 정보 출력
-            if response.status_code == 400:
-                try:
-                    error_data = response.json()
-                    print(f"오류 상세: {error_data}")
-                except:
-                    pass
-                    
-        response.raise_for_status()
-        
-        data = response.json()
+        # 공유 비동기 클라이언트로 호출 (같은 검색어는 캐시에서 응답)
+        data = await kakao_client.search(KAKAO_KEYWORD_PATH, query, **params)
         places = data.get("documents", [])
         
-        print(f"검색 결과: {len(places)}개 찾음")
+        log.info("keyword_search", query=query, results=len(places))
         
         # 응답 데이터 포맷팅
         formatted_places = []
@@ -258,19 +952,20 @@ async def search_location(query: str):
             }
             formatted_places.append(formatted_place)
         
+        # 확인된 장소는 로컬 지명 사전에 추가 (다음 자동완성부터 카카오 호출 없이 응답)
+        place_recorder.record(formatted_places, "kakao_keyword")
+        
         return {
             "places": formatted_places,
             "total_count": len(formatted_places)
         }
         
-    except requests.exceptions.HTTPError as e:
-        error_msg = f"카카오맵 API HTTP 오류: {e}"
-        print(error_msg)
+    except httpx.HTTPStatusError as e:
+        log.warning("kakao_http_error", query=query, status=e.response.status_code, body=e.response.text[:500])
         
         if e.response.status_code == 400:
             try:
                 error_detail = e.response.json()
-                print(f"400 오류 상세: {error_detail}")
                 return {"places": [], "error": f"잘못된 요청: {error_detail.get('message', '알 수 없는 오류')}"}
             except:
                 return {"places": [], "error": "잘못된 요청 형식입니다."}
@@ -283,12 +978,11 @@ async def search_location(query: str):
         else:
             return {"places": [], "error": f"API 호출 실패: {e.response.status_code}"}
             
-    except requests.exceptions.Timeout:
+    except httpx.TimeoutException:
         return {"places": [], "error": "검색 시간이 초과되었습니다."}
         
-    except Exception as e:
-        error_msg = f"지명 검색 오류: {e}"
-        print(error_msg)
+    except Exception:
+        log.exception("keyword_search_failed", query=query)
         return {"places": [], "error": "검색 중 오류가 발생했습니다."}
 
 
@@ -301,19 +995,7 @@ async def search_address(query: str):
         return {"addresses": []}
     
     try:
-        url = "https://dapi.kakao.com/v2/local/search/address.json"
-        headers = {
-            "Authorization": f"KakaoAK {KAKAO_API_KEY}"
-        }
-        params = {
-            "query": query.strip(),
-            "size": 5
-        }
-        
-        response = requests.get(url, headers=headers, params=params, timeout=10)
-        response.raise_for_status()
-        
-        data = response.json()
+        data = await kakao_client.search(KAKAO_ADDRESS_PATH, query, size=5)
         addresses = data.get("documents", [])
         
         formatted_addresses = []
@@ -321,91 +1003,169 @@ async def search_address(query: str):
             formatted_addr = {
                 "place_name": addr.get("address_name", ""),
                 "address_name": addr.get("address_name", ""),
-                "road_address_name": addr.get("road_address", {}).get("address_name", ""),
+                "road_address_name": (addr.get("road_address") or {}).get("address_name", ""),
                 "x": addr.get("x", ""),  # 경도
                 "y": addr.get("y", ""),  # 위도
                 "category_name": "주소"
             }
             formatted_addresses.append(formatted_addr)
         
+        place_recorder.record(formatted_addresses, "kakao_address")
+        
         return {
             "places": formatted_addresses,  # 프론트엔드 호환성을 위해 "places"로 반환
             "total_count": len(formatted_addresses)
         }
         
-    except Exception as e:
-        print(f"주소 검색 오류: {e}")
+    except Exception:
+        log.exception("address_search_failed", query=query)
         return {"places": [], "error": "주소 검색 중 오류가 발생했습니다."}
 
 
 # 통합 검색 함수 (키워드 + 주소 검색)
 @app.get("/search-location-combined")
-async def search_location_combined(query: str):
-    """키워드 검색과 주소 검색을 함께 시도"""
+async def search_location_combined(query: str, response: Response, mode: str = "sequential", local: bool = True):
+    """키워드 검색과 주소 검색을 함께 시도
+
+    local=true 이면 먼저 로컬 지명 사전에서 입력 중인 검색어로 시작하는 장소를 찾고,
+    없을 때만 카카오를 호출 (local=false 는 항상 카카오 호출)
+    mode=sequential: 키워드 검색 결과가 없을 때만 주소 검색 (기본값)
+    mode=concurrent: 두 검색을 동시에 시작하고, 키워드 결과가 있으면 주소 검색은 취소,
+                     없으면 두 결과를 좌표 기준으로 중복 제거해 합침
+    각 업스트림 소요 시간은 Server-Timing 응답 헤더로 반환
+    """
+    if mode not in ("sequential", "concurrent"):
+        raise HTTPException(status_code=400, detail="mode 는 sequential 또는 concurrent 만 지원합니다.")
     
-    # 먼저 키워드 검색 시도
-    keyword_result = await search_location(query)
+    timings = {}
+    try:
+        if local and query and len(query) >= 2:
+            start = time.perf_counter()
+            places = gazetteer.search(query)
+            timings["gazetteer"] = (time.perf_counter() - start) * 1000
+            if places:
+                return {"places": places, "total_count": len(places), "source": "local"}
+        
+        if mode == "concurrent":
+            return await _search_combined_concurrent(query, timings)
+        
+        # 먼저 키워드 검색 시도
+        keyword_result = await _timed(search_location(query), "kakao-keyword", timings)
+        
+        if keyword_result.get("places"):
+            return keyword_result
+        
+        # 키워드 검색 실패 시 주소 검색 시도
+        log.info("keyword_search_empty_fallback_address", query=query)
+        address_result = await _timed(search_address(query), "kakao-address", timings)
+        
+        return address_result
+    finally:
+        response.headers["Server-Timing"] = ", ".join(
+            f"{name};dur={duration:.1f}" if duration is not None else f'{name};desc="cancelled"'
+            for name, duration in timings.items()
+        )
+
+async def _timed(coro, name: str, timings: dict):
+    """코루틴 실행 시간(ms)을 timings 에 기록 (취소 시 None)"""
+    start = time.perf_counter()
+    try:
+        result = await coro
+    except asyncio.CancelledError:
+        timings[name] = None
+        raise
+    timings[name] = (time.perf_counter() - start) * 1000
+    return result
+
+async def _search_combined_concurrent(query: str, timings: dict):
+    """키워드/주소 검색 동시 실행"""
+    keyword_task = asyncio.create_task(_timed(search_location(query), "kakao-keyword", timings))
+    address_task = asyncio.create_task(_timed(search_address(query), "kakao-address", timings))
+    
+    try:
+        keyword_result = await keyword_task
+    except BaseException:
+        address_task.cancel()
+        raise
     
     if keyword_result.get("places"):
+        address_task.cancel()
+        try:
+            await address_task
+        except asyncio.CancelledError:
+            pass
         return keyword_result
     
-    # 키워드 검색 실패 시 주소 검색 시도
-    print("키워드 검색 실패, 주소 검색 시도")
-    address_result = await search_address(query)
+    address_result = await address_task
+    if not address_result.get("places"):
+        return address_result
     
-    return address_result
+    # 좌표가 같은 결과는 하나만 남김
+    merged = []
+    seen = set()
+    for place in keyword_result.get("places", []) + address_result["places"]:
+        key = (place.get("x"), place.get("y"))
+        if key in seen:
+            continue
+        seen.add(key)
+        merged.append(place)
+    
+    return {
+        "places": merged,
+        "total_count": len(merged)
+    }
 
 
 
-def calculate_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-    """두 좌표 간 거리 계산 (km)"""
-    R = 6371  # 지구 반지름 (km)
-    
-    dlat = math.radians(lat2 - lat1)
-    dlng = math.radians(lng2 - lng1)
-    
-    a = (math.sin(dlat/2) * math.sin(dlat/2) + 
-         math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * 
-         math.sin(dlng/2) * math.sin(dlng/2))
-    
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    return R * c
+_location_list_adapter = TypeAdapter(List[LocationRequest])
 
-def get_risk_level(risk_score: float) -> str:
-    """위험도 점수에 따른 등급 반환"""
-    if risk_score >= 0.8:
-        return "매우높음"
-    elif risk_score >= 0.6:
-        return "높음"
-    elif risk_score >= 0.4:
-        return "보통"
-    elif risk_score >= 0.2:
-        return "낮음"
-    else:
-        return "매우낮음"
-
-def get_risk_message(risk_score: float) -> str:
-    """위험도에 따른 메시지 반환"""
-    if risk_score >= 0.8:
-        return "매우 위험한 지역입니다. 우회 경로를 이용하세요."
-    elif risk_score >= 0.6:
-        return "위험도가 높은 지역입니다. 주의가 필요합니다."
-    elif risk_score >= 0.4:
-        return "보통 수준의 위험도입니다."
-    elif risk_score >= 0.2:
-        return "비교적 안전한 지역입니다."
-    else:
-        return "매우 안전한 지역입니다."
+def parse_batch_locations(body: bytes, content_type: str):
+    """일괄 예측 요청 본문을 위도/경도 배열로 변환"""
+    try:
+        if "application/octet-stream" in content_type:
+            # 위도, 경도 순서의 little-endian float64 쌍
+            if len(body) % 16:
+                raise ValueError("바이너리 본문 길이는 16바이트(위도/경도 float64)의 배수여야 합니다.")
+            coords = np.frombuffer(body, dtype="<f8").reshape(-1, 2)
+            return coords[:, 0].astype(np.float64), coords[:, 1].astype(np.float64)
+        
+        if "application/x-ndjson" in content_type:
+            locations = [LocationRequest.model_validate_json(line) for line in body.splitlines() if line.strip()]
+        else:
+            locations = _location_list_adapter.validate_json(body)
+    except ValidationError as e:
+        raise ValueError(f"잘못된 위치 형식입니다: {e.errors()[0].get('msg', '')}")
+    
+    lats = np.array([location.latitude for location in locations], dtype=np.float64)
+    lngs = np.array([location.longitude for location in locations], dtype=np.float64)
+    return lats, lngs
 
 def is_point_near_line(x1: float, y1: float, x2: float, y2: float, px: float, py: float, threshold: float) -> bool:
-    """점이 직선 근처에 있는지 확인"""
-    # 점과 직선 사이의 거리 계산
-    A = y2 - y1
-    B = x1 - x2
-    C = x2 * y1 - x1 * y2
-    
-    distance = abs(A * px + B * py + C) / math.sqrt(A * A + B * B)
-    return distance < threshold
+    """점(위도 px, 경도 py)이 선분 근처(threshold km 이내)에 있는지 확인"""
+    # 위경도 차이를 그대로 쓰면 도 단위가 되므로 km 단위 선분 거리로 계산
+    return distance_to_segment(x1, y1, x2, y2, px, py) < threshold
+
+def dangerous_zones_near_line(zones: ZoneArrays, start_lat: float, start_lng: float, end_lat: float, end_lng: float) -> list:
+    """출발-도착 직선 500m 이내의 고위험(0.7 초과) 지역"""
+    # 직선을 감싸는 상자(500m 여유) 안의 고위험 지역만 선분 거리 계산
+    pad_lat = 0.5 / KM_PER_DEGREE
+    pad_lng = pad_lat / max(float(np.cos(np.radians(max(abs(start_lat), abs(end_lat)) + pad_lat))), 1e-6)
+    candidates = np.flatnonzero(
+        (zones.risk > 0.7) &
+        (zones.lat >= min(start_lat, end_lat) - pad_lat) & (zones.lat <= max(start_lat, end_lat) + pad_lat) &
+        (zones.lng >= min(start_lng, end_lng) - pad_lng) & (zones.lng <= max(start_lng, end_lng) + pad_lng)
+    )
+    return [
+        zone for zone in zones.rows(candidates)
+        if is_point_near_line(start_lat, start_lng, end_lat, end_lng, zone["lat"], zone["lng"], 0.5)
+    ]
+
+def distance_to_route(lat: float, lng: float, waypoints: list) -> float:
+    """경로(경유 좌표 목록)까지의 최단 거리 (km)"""
+    return min(
+        (distance_to_segment(a["lat"], a["lng"], b["lat"], b["lng"], lat, lng) for a, b in zip(waypoints, waypoints[1:])),
+        default=calculate_distance(lat, lng, waypoints[0]["lat"], waypoints[0]["lng"])
+    )
 
 def generate_safe_waypoints(start_lat: float, start_lng: float, end_lat: float, end_lng: float, dangerous_zones: list) -> list:
     """위험지역을 우회하는 경유지 생성"""
@@ -440,7 +1200,9 @@ def estimate_travel_time(waypoints: list) -> int:
         )
     
     # 평균 속도 30km/h로 가정
-    return int(total_distance / 30 * 60)
+    return int(total_distance / ROUTE_SPEED_KMH * 60)
 
 if __name__ == "__main__":
+    # 개발용 단일 프로세스 (운영 환경의 다중 워커 실행은 serve.py)
+    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
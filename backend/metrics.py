@@ -0,0 +1,164 @@
+# metrics.py
+"""Prometheus 텍스트 형식 지표 (/metrics)
+
+- Histogram: 엔드포인트별 요청 지연, 단계별(위험도 계산, 카카오 API, DB 쿼리, bcrypt) 소요 시간
+- Counter / Gauge: 캐시 적중 등 수치. 수집 시점에 콜백으로 값을 읽을 수도 있다.
+
+스레드 풀(bcrypt, 위험도 계산)에서도 기록하므로 모든 갱신은 잠금 안에서 한다.
+"""
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple
+
+# 초 단위 지연 버킷 (0.5ms ~ 10s)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._lock = threading.Lock()
+
+    def header(self) -> list:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class _ValueMetric(_Metric):
+    """라벨 값별 단일 수치. collect 콜백을 주면 수집 시점에 [(라벨 값 튜플, 값), ...] 을 받아 더함"""
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 collect: Optional[Callable[[], Iterable[Tuple[Tuple[str, ...], float]]]] = None):
+        super().__init__(name, documentation, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self.collect = collect
+
+    def render(self) -> list:
+        with self._lock:
+            items = dict(self._values)
+        if self.collect is not None:
+            items.update(self.collect())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labels, values)} {_format_value(value)}"
+            for values, value in sorted(items.items())
+        ]
+
+
+class Counter(_ValueMetric):
+    kind = "counter"
+
+    def inc(self, *label_values: str, amount: float = 1.0):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+
+class Gauge(_ValueMetric):
+    kind = "gauge"
+
+    def set(self, *label_values: str, value: float):
+        with self._lock:
+            self._values[label_values] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 값 -> [버킷별 개수(누적 아님) ..., +Inf 개수, 합계]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, *label_values: str, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    @contextmanager
+    def time(self, *label_values: str):
+        """with 블록 실행 시간 기록 (예외가 나도 기록)"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(*label_values, value=time.perf_counter() - start)
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted((values, list(series)) for values, series in self._series.items())
+        lines = self.header()
+        for values, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, values)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, values)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+# 엔드포인트별 요청 지연 (path 는 /risk-tiles/{z}/{x}/{y} 같은 경로 템플릿)
+http_request_duration = registry.register(Histogram(
+    "sinkhole_http_request_duration_seconds", "HTTP request latency by endpoint", ("method", "path", "status")
+))
+# 처리 단계별 소요 시간 (stage: risk_inference, kakao_api, db_query, bcrypt ...)
+stage_duration = registry.register(Histogram(
+    "sinkhole_stage_duration_seconds", "Time spent in a processing stage", ("stage",)
+))
+
+
+def cache_collector(caches: Dict[str, Callable[[], dict]]):
+    """캐시 이름 -> stats() 함수 목록으로 적중/실패/크기 게이지 등록"""
+
+    def collect(field: str):
+        return lambda: [((name,), stats()[field]) for name, stats in caches.items()]
+
+    for field, documentation in (("hits", "Cache hits"), ("misses", "Cache misses"), ("evictions", "Cache evictions")):
+        registry.register(Counter(f"sinkhole_cache_{field}_total", documentation, ("cache",), collect=collect(field)))
+    for field, documentation in (("size", "Cached entries"), ("hit_ratio", "Cache hit ratio since start")):
+        registry.register(Gauge(f"sinkhole_cache_{field}", documentation, ("cache",), collect=collect(field)))
@@ -0,0 +1,80 @@
+# micro_batch.py
+"""동시에 들어온 단건 요청을 짧은 시간 창 안에서 모아 한 번의 일괄 호출로 처리
+
+첫 요청이 들어오면 window_ms 뒤(또는 max_batch 개가 차면 즉시) 모인 항목 전체를
+batch_fn(items) -> results 한 번으로 계산하고 각 요청에 자기 결과를 돌려준다.
+batch_fn 은 스레드 풀에서 실행되므로 이벤트 루프를 막지 않는다.
+"""
+import asyncio
+import os
+from typing import Any, Callable, List, Optional
+
+from starlette.concurrency import run_in_threadpool
+
+RISK_BATCH_WINDOW_MS = float(os.getenv("RISK_BATCH_WINDOW_MS", "2"))
+RISK_BATCH_MAX = int(os.getenv("RISK_BATCH_MAX", "256"))
+
+
+class MicroBatcher:
+    """단건 호출 -> 일괄 호출 묶음 처리기 (이벤트 루프 안에서만 사용)"""
+
+    def __init__(self, batch_fn: Callable[[List[Any]], List[Any]], window_ms: float = RISK_BATCH_WINDOW_MS,
+                 max_batch: int = RISK_BATCH_MAX):
+        self.batch_fn = batch_fn
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._items = []
+        self._futures = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running = set()  # 실행 중인 묶음 작업 (GC 로 사라지지 않도록 참조 유지)
+        self.batches = 0
+        self.items = 0
+        self.largest = 0
+
+    async def submit(self, item: Any) -> Any:
+        """항목 1개를 묶음에 넣고 그 결과를 기다림 (batch_fn 예외는 묶음의 모든 호출에 전달)"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._items.append(item)
+        self._futures.append(future)
+        if len(self._items) >= self.max_batch:
+            self._dispatch()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._dispatch)
+        return await future
+
+    def _dispatch(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        items, futures = self._items, self._futures
+        self._items, self._futures = [], []
+        if items:
+            task = asyncio.get_running_loop().create_task(self._run(items, futures))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run(self, items: list, futures: list):
+        self.batches += 1
+        self.items += len(items)
+        self.largest = max(self.largest, len(items))
+        try:
+            results = await run_in_threadpool(self.batch_fn, items)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result in zip(futures, results):
+            # 클라이언트 연결이 끊겨 취소된 요청은 건너뜀
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> dict:
+        return {
+            "batches": self.batches,
+            "items": self.items,
+            "mean_batch": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "largest_batch": self.largest,
+            "pending": len(self._items),
+        }
@@ -1,5 +1,5 @@
 # models.py
-from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship  # ← 이렇게 수정
 from database import Base
 from datetime import datetime
@@ -25,7 +25,17 @@ class Location(Base):
     latitude = Column(Float, nullable=False)
     longitude = Column(Float, nullable=False)
     address = Column(String)
+    road_address = Column(String)
+    category = Column(String)
+    phone = Column(String)
+    place_url = Column(String)
+    source = Column(String)  # 저장 경로 (kakao_keyword, kakao_address)
     created_at = Column(DateTime, default=datetime.utcnow)
+    
+    __table_args__ = (
+        # 여러 워커가 같은 검색 결과를 저장해도 한 행만 남도록 (save_places 는 중복을 건너뜀)
+        Index("uq_locations_name_position", "name", "latitude", "longitude", unique=True),
+    )
 
 class RiskPrediction(Base):
     __tablename__ = "risk_predictions"
@@ -36,6 +46,14 @@ class RiskPrediction(Base):
     longitude = Column(Float, nullable=False)
     risk_score = Column(Float, nullable=False)
     prediction_date = Column(DateTime, default=datetime.utcnow)
+    geohash = Column(String(12))  # 근처 기록 조회용 공간 버킷 (geo.geohash_encode)
     
     # 관계
-    user = relationship("User", back_populates="predictions")
\ No newline at end of file
+    user = relationship("User", back_populates="predictions")
+    
+    __table_args__ = (
+        # 사용자별 기간 조회 + (날짜, id) 키셋 페이지네이션
+        Index("ix_risk_predictions_user_date", "user_id", "prediction_date", "id"),
+        # 사용자별 근처(지오해시 접두어) + 기간 조회
+        Index("ix_risk_predictions_user_geohash_date", "user_id", "geohash", "prediction_date"),
+    )
\ No newline at end of file
@@ -0,0 +1,103 @@
+# prediction_history.py
+"""로그인 사용자의 과거 예측 기록 조회 (기간 + 근처 필터, 키셋 페이지네이션)
+
+- 기간 조회: (user_id, prediction_date, id) 인덱스를 최신순으로 역방향 탐색
+- 근처 조회: 반경을 덮는 지오해시 접두어 범위(최대 16개)로 (user_id, geohash, prediction_date)
+  인덱스를 탐색한 뒤 실제 거리로 한 번 더 거름
+- 페이지네이션: OFFSET 대신 마지막 행의 (prediction_date, id) 이후부터 이어서 조회
+"""
+import base64
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import and_, or_, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from geo import calculate_distance, geohash_cover, geohash_encode
+from models import RiskPrediction
+
+MAX_HISTORY_PAGE_SIZE = 200
+# 근처 조회 시 거리 필터로 걸러질 행을 감안해 한 번에 더 읽어 오는 배수
+PROXIMITY_OVERFETCH = 2
+# 지오해시 접두어 범위 상한 (지오해시 문자 집합의 마지막 문자 'z' 보다 큰 문자)
+_PREFIX_END = "~"
+GEOHASH_BACKFILL_BATCH = 1000
+
+
+def encode_cursor(prediction_date: datetime, prediction_id: int) -> str:
+    raw = f"{prediction_date.isoformat()}|{prediction_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """커서 -> (prediction_date, id), 형식이 잘못되면 ValueError"""
+    padded = cursor + "=" * (-len(cursor) % 4)
+    date_text, id_text = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+    return datetime.fromisoformat(date_text), int(id_text)
+
+
+async def fetch_history(
+    db: AsyncSession,
+    user_id: int,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    radius_km: float = 1.0,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    limit: int = 50,
+    cursor: Optional[str] = None,
+) -> tuple:
+    """최신순 예측 기록 한 페이지 -> (기록 목록, 다음 페이지 커서 또는 None)"""
+    conditions = [RiskPrediction.user_id == user_id]
+    if since is not None:
+        conditions.append(RiskPrediction.prediction_date >= since)
+    if until is not None:
+        conditions.append(RiskPrediction.prediction_date < until)
+
+    near = latitude is not None and longitude is not None
+    if near:
+        conditions.append(or_(*(
+            and_(RiskPrediction.geohash >= prefix, RiskPrediction.geohash < prefix + _PREFIX_END)
+            for prefix in geohash_cover(latitude, longitude, radius_km)
+        )))
+
+    position = decode_cursor(cursor) if cursor else None
+    order = (RiskPrediction.prediction_date.desc(), RiskPrediction.id.desc())
+    fetch_size = limit * PROXIMITY_OVERFETCH if near else limit
+    items = []
+
+    while True:
+        query = select(RiskPrediction).where(*conditions)
+        if position is not None:
+            query = query.where(tuple_(RiskPrediction.prediction_date, RiskPrediction.id) < position)
+        rows = (await db.execute(query.order_by(*order).limit(fetch_size))).scalars().all()
+
+        for row in rows:
+            position = (row.prediction_date, row.id)
+            if near and calculate_distance(latitude, longitude, row.latitude, row.longitude) > radius_km:
+                continue
+            items.append(row)
+            if len(items) == limit:
+                return items, encode_cursor(*position)
+
+        if len(rows) < fetch_size:
+            return items, None
+
+
+async def backfill_geohash(db: AsyncSession, precision: int = 9) -> int:
+    """geohash 컬럼이 추가되기 전에 저장된 기록을 채움 (채운 행 수 반환)"""
+    total = 0
+    while True:
+        rows = (await db.execute(
+            select(RiskPrediction.id, RiskPrediction.latitude, RiskPrediction.longitude)
+            .where(RiskPrediction.geohash.is_(None))
+            .limit(GEOHASH_BACKFILL_BATCH)
+        )).all()
+        if not rows:
+            return total
+        await db.execute(
+            update(RiskPrediction),
+            [{"id": row.id, "geohash": geohash_encode(row.latitude, row.longitude, precision)} for row in rows],
+        )
+        await db.commit()
+        total += len(rows)
@@ -0,0 +1,142 @@
+# prediction_writer.py
+"""RiskPrediction 기록 write-behind 버퍼
+
+요청 처리 중에는 메모리 버퍼에 행만 추가하고, 백그라운드 작업이 PREDICTION_FLUSH_ROWS 행이
+쌓이거나 PREDICTION_FLUSH_MS 가 지날 때마다 한 번의 일괄 INSERT 로 저장한다.
+서버 종료(shutdown) 시 남은 행을 모두 저장한 뒤 멈춘다. 이때 저장이 실패하면
+PREDICTION_STOP_TIMEOUT 초까지 간격을 늘려 가며 다시 시도하고, 끝내 저장하지 못한 행 수는 error 로 남긴다.
+"""
+import asyncio
+import os
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import insert
+
+from database import AsyncSessionLocal
+from geo import geohash_encode
+from models import RiskPrediction
+from structured_log import get_logger
+
+log = get_logger("prediction_writer")
+
+PREDICTION_FLUSH_ROWS = int(os.getenv("PREDICTION_FLUSH_ROWS", "500"))
+PREDICTION_FLUSH_MS = float(os.getenv("PREDICTION_FLUSH_MS", "200"))
+# DB 장애 등으로 저장이 밀릴 때 메모리에 보관할 최대 행 수 (넘치면 오래된 행부터 버림)
+PREDICTION_MAX_PENDING = int(os.getenv("PREDICTION_MAX_PENDING", "100000"))
+# 종료 시 남은 행 저장을 다시 시도하는 최대 시간 (초)과 재시도 간격 (처음 값에서 두 배씩, 최대값까지)
+PREDICTION_STOP_TIMEOUT = float(os.getenv("PREDICTION_STOP_TIMEOUT", "30"))
+STOP_RETRY_DELAY = 0.1
+STOP_RETRY_MAX_DELAY = 2.0
+# 저장하는 지오해시 자릿수 (9 = 약 4.8m)
+GEOHASH_PRECISION = 9
+
+
+class PredictionWriter:
+    """예측 결과를 모아 일괄 저장하는 백그라운드 작성기 (이벤트 루프 안에서만 사용)"""
+
+    def __init__(self, session_factory=AsyncSessionLocal, flush_rows: int = PREDICTION_FLUSH_ROWS,
+                 flush_ms: float = PREDICTION_FLUSH_MS, max_pending: int = PREDICTION_MAX_PENDING):
+        self.session_factory = session_factory
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_ms / 1000
+        self.max_pending = max_pending
+        self._buffer = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._stopping = False
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.dropped = 0
+
+    def submit(self, user_id: int, latitude: float, longitude: float, risk_score: float,
+               prediction_date: Optional[datetime] = None):
+        """기록 1건 추가 (DB 를 기다리지 않음)"""
+        self._buffer.append({
+            "user_id": user_id,
+            "latitude": latitude,
+            "longitude": longitude,
+            "risk_score": risk_score,
+            "prediction_date": prediction_date or datetime.utcnow(),
+            "geohash": geohash_encode(latitude, longitude, GEOHASH_PRECISION),
+        })
+        if len(self._buffer) > self.max_pending:
+            overflow = len(self._buffer) - self.max_pending
+            del self._buffer[:overflow]
+            self.dropped += overflow
+        if len(self._buffer) >= self.flush_rows and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def flush(self) -> int:
+        """버퍼의 행을 한 번에 저장 (실패하면 버퍼 앞쪽에 되돌려 다음에 재시도)"""
+        async with self._flush_lock:
+            rows, self._buffer = self._buffer, []
+            if not rows:
+                return 0
+            try:
+                async with self.session_factory() as db:
+                    await db.execute(insert(RiskPrediction), rows)
+                    await db.commit()
+            except Exception as e:
+                self._buffer[:0] = rows
+                self.failures += 1
+                log.warning("prediction_flush_failed", rows=len(rows), error=str(e))
+                return 0
+            self.written += len(rows)
+            self.batches += 1
+            return len(rows)
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self):
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = PREDICTION_STOP_TIMEOUT):
+        """주기 작업을 멈추고 남은 행을 모두 저장 (저장 중인 일괄 INSERT 는 끝까지 기다림)
+
+        저장이 실패하면 timeout 초까지 재시도하고, 그래도 남은 행은 버리고 error 로 기록한다.
+        """
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        delay = STOP_RETRY_DELAY
+        while self._buffer:
+            if await self.flush():
+                delay = STOP_RETRY_DELAY
+                continue
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, STOP_RETRY_MAX_DELAY)
+        if self._buffer:
+            self.dropped += len(self._buffer)
+            log.error("prediction_rows_lost", rows=len(self._buffer), failures=self.failures)
+            self._buffer = []
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._buffer),
+            "written": self.written,
+            "batches": self.batches,
+            "failures": self.failures,
+            "dropped": self.dropped,
+        }
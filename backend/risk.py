@@ -0,0 +1,394 @@
+# risk.py
+import math
+
+import numpy as np
+
+from geo import calculate_distance, EARTH_RADIUS_KM
+
+# 위험도 등급 구간 (하한, 등급, 메시지) - 높은 구간부터
+RISK_GRADES = [
+    (0.8, "매우높음", "매우 위험한 지역입니다. 우회 경로를 이용하세요."),
+    (0.6, "높음", "위험도가 높은 지역입니다. 주의가 필요합니다."),
+    (0.4, "보통", "보통 수준의 위험도입니다."),
+    (0.2, "낮음", "비교적 안전한 지역입니다."),
+]
+LOWEST_GRADE = ("매우낮음", "매우 안전한 지역입니다.")
+
+# 일괄 계산 시 한 번에 만드는 거리 행렬(또는 지점-위험지역 쌍)의 최대 원소 수 (약 32MB)
+DISTANCE_CHUNK_ELEMENTS = 4_000_000
+# 위험지역이 위험도에 영향을 주는 최대 거리 (거리 구간 규칙의 마지막 구간, km)
+RISK_INFLUENCE_KM = 2.0
+KM_PER_DEGREE = EARTH_RADIUS_KM * math.pi / 180
+# 영향 거리 안에 위험지역이 없는 지점의 최근접 탐색: 위험지역이 이보다 적으면 전체 거리 행렬, 많으면 격자 링 탐색
+NEAREST_SCAN_ZONES = 256
+# 격자 칸 키에서 경도 칸 번호에 곱하는 값 (위도 칸 번호 범위보다 충분히 큼)
+_CELL_STRIDE = 1 << 32
+# 벡터 계산 오차로 인한 최근접 지역 동률 판정 허용치 (km)
+NEAREST_TIE_TOLERANCE_KM = 1e-9
+
+# 위험도 모델 입력 특징 (zone_features 의 열 순서)
+FEATURE_NAMES = (
+    "nearest_distance_km",  # 최근접 위험지역까지 거리
+    "nearest_risk",  # 최근접 위험지역의 위험도
+    "zones_within_1km",  # 1km 이내 위험지역 수
+    "zones_within_2km",  # 2km 이내 위험지역 수
+    "risk_density",  # 2km(RISK_INFLUENCE_KM) 이내 위험지역의 위험도 x exp(-거리 / DENSITY_SCALE_KM) 합
+)
+DENSITY_SCALE_KM = 0.5
+# 위험지역이 하나도 없을 때 최근접 거리 대신 쓰는 값 (km)
+NO_ZONE_DISTANCE_KM = 100.0
+# 위험지역에서 먼 지점의 기본 위험도를 고정하는 격자 (지오해시 자릿수, 8 = 약 38m x 19m)
+FALLBACK_CELL_PRECISION = 8
+
+
+def get_risk_level(risk_score: float) -> str:
+    """위험도 점수에 따른 등급 반환"""
+    for threshold, level, _ in RISK_GRADES:
+        if risk_score >= threshold:
+            return level
+    return LOWEST_GRADE[0]
+
+
+def get_risk_message(risk_score: float) -> str:
+    """위험도에 따른 메시지 반환"""
+    for threshold, _, message in RISK_GRADES:
+        if risk_score >= threshold:
+            return message
+    return LOWEST_GRADE[1]
+
+
+class ZoneArrays:
+    """위험지역 좌표/위험도/이름을 NumPy 배열로 보관 (일괄 계산용)
+
+    딕셔너리는 응답에 실을 행만 row/rows 로 만든다 (워커마다 전체 목록을 파이썬 객체로 복사하지 않음).
+    """
+
+    def __init__(self, zones: list):
+        zones = list(zones)
+        self.lat = np.array([zone["lat"] for zone in zones], dtype=np.float64)
+        self.lng = np.array([zone["lng"] for zone in zones], dtype=np.float64)
+        self.risk = np.array([zone["risk"] for zone in zones], dtype=np.float64)
+        self.name = np.array([zone.get("name") or "" for zone in zones], dtype=np.str_)
+
+    @classmethod
+    def from_columns(cls, lat: np.ndarray, lng: np.ndarray, risk: np.ndarray, name: np.ndarray) -> "ZoneArrays":
+        """이미 만들어진 컬럼 배열(메모리 매핑 등)을 복사 없이 사용"""
+        arrays = cls.__new__(cls)
+        arrays.lat, arrays.lng, arrays.risk, arrays.name = lat, lng, risk, name
+        return arrays
+
+    def __len__(self):
+        return len(self.lat)
+
+    def row(self, i: int) -> dict:
+        return {"lat": float(self.lat[i]), "lng": float(self.lng[i]), "risk": float(self.risk[i]), "name": str(self.name[i])}
+
+    def rows(self, indices) -> list:
+        """위험지역 번호 목록 -> {"lat", "lng", "risk", "name"} 딕셔너리 목록"""
+        indices = np.asarray(indices, dtype=np.int64)
+        return [
+            {"lat": lat, "lng": lng, "risk": risk, "name": name}
+            for lat, lng, risk, name in zip(self.lat[indices].tolist(), self.lng[indices].tolist(),
+                                            self.risk[indices].tolist(), self.name[indices].tolist())
+        ]
+
+    @property
+    def grid(self) -> "ZoneGrid":
+        """지점 주변 위험지역 후보 격자 (처음 사용할 때 생성, 배열이 바뀌지 않으므로 계속 재사용)"""
+        grid = self.__dict__.get("_grid")
+        if grid is None:
+            grid = self._grid = ZoneGrid(self)
+        return grid
+
+
+def haversine_np(lat1, lng1, lat2, lng2) -> np.ndarray:
+    """calculate_distance 의 NumPy 버전 (브로드캐스팅 지원, km)"""
+    dlat = np.radians(lat2 - lat1)
+    dlng = np.radians(lng2 - lng1)
+
+    a = (np.sin(dlat/2) * np.sin(dlat/2) +
+         np.cos(np.radians(lat1)) * np.cos(np.radians(lat2)) *
+         np.sin(dlng/2) * np.sin(dlng/2))
+
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
+    return EARTH_RADIUS_KM * c
+
+
+def haversine_matrix(lats: np.ndarray, lngs: np.ndarray, zones: ZoneArrays) -> np.ndarray:
+    """지점 x 위험지역 거리 행렬 (km)"""
+    return haversine_np(lats[:, None], lngs[:, None], zones.lat[None, :], zones.lng[None, :])
+
+
+def _refine_nearest(lats, lngs, zones, matrix, best, best_distance, start, nearest, distances):
+    """거리 행렬 한 덩어리의 최근접 결과를 스칼라 거리 계산으로 확정 (nearest/distances 에 기록)"""
+    ties = (matrix <= (best_distance + NEAREST_TIE_TOLERANCE_KM)[:, None]).sum(axis=1) > 1
+
+    for row in range(len(matrix)):
+        i = start + row
+        lat, lng = float(lats[i]), float(lngs[i])
+        if ties[row]:
+            candidates = np.nonzero(matrix[row] <= best_distance[row] + NEAREST_TIE_TOLERANCE_KM)[0]
+            zone_distance = float('inf')
+            for candidate in candidates:
+                distance = calculate_distance(lat, lng, zones.lat[candidate], zones.lng[candidate])
+                if distance < zone_distance:
+                    zone_distance = distance
+                    nearest[i] = candidate
+        else:
+            nearest[i] = best[row]
+        distances[i] = calculate_distance(lat, lng, zones.lat[nearest[i]], zones.lng[nearest[i]])
+
+
+class ZoneGrid:
+    """한 변이 RISK_INFLUENCE_KM 인 위경도 격자에 위험지역 번호를 칸 키 순으로 정렬해 둔 공간 인덱스
+
+    지점 칸과 주변 8칸에 든 위험지역만 (지점, 위험지역) 쌍으로 펼쳐 거리를 계산하므로
+    지점당 비용이 전체 위험지역 수가 아니라 주변 위험지역 수에 비례한다.
+    경도 칸 폭은 위험지역 최대 위도(+ 영향 거리)에서도 RISK_INFLUENCE_KM 이상이 되도록 잡는다.
+    """
+
+    def __init__(self, zones: ZoneArrays):
+        self.zones = zones
+        self.cell_lat = RISK_INFLUENCE_KM / KM_PER_DEGREE
+        self.max_abs_lat = min(89.0, float(np.abs(zones.lat).max()) + self.cell_lat) if len(zones) else 0.0
+        self.cell_lng = self.cell_lat / math.cos(math.radians(self.max_abs_lat))
+        x, y = self.cells(zones.lat, zones.lng)
+        keys = x * _CELL_STRIDE + y
+        self.order = np.argsort(keys, kind="stable")
+        self.keys = keys[self.order]
+        if len(zones):
+            self.bounds = (int(x.min()), int(y.min()), int(x.max()), int(y.max()))
+        else:
+            self.bounds = (0, 0, -1, -1)
+
+    def cells(self, lats: np.ndarray, lngs: np.ndarray):
+        """좌표 배열 -> (경도 칸 번호, 위도 칸 번호)"""
+        return np.floor(lngs / self.cell_lng).astype(np.int64), np.floor(lats / self.cell_lat).astype(np.int64)
+
+    def _count(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        keys = x * _CELL_STRIDE + y
+        return np.searchsorted(self.keys, keys, side="right") - np.searchsorted(self.keys, keys, side="left")
+
+    def _pairs(self, x: np.ndarray, y: np.ndarray):
+        """칸 (x, y) 배열의 위험지역 -> (x 배열 위치, 위험지역 번호)"""
+        keys = x * _CELL_STRIDE + y
+        lo = np.searchsorted(self.keys, keys, side="left")
+        counts = np.searchsorted(self.keys, keys, side="right") - lo
+        total = int(counts.sum())
+        owner = np.repeat(np.arange(len(x)), counts)
+        positions = np.repeat(lo - (np.cumsum(counts) - counts), counts) + np.arange(total)
+        return owner, self.order[positions]
+
+    def near_pairs(self, lats: np.ndarray, lngs: np.ndarray):
+        """RISK_INFLUENCE_KM 미만 거리의 (지점 번호, 위험지역 번호, 거리 km) 쌍을 돌려주는 생성기
+
+        지점을 후보 쌍 DISTANCE_CHUNK_ELEMENTS 개 안팎씩 나누고, 나눈 지점마다 주변 칸 하나씩의 쌍을 낸다.
+        한 번에 나오는 쌍은 지점 번호 순이고, 같은 지점 안에서는 위험지역 번호 순이다.
+        """
+        x, y = self.cells(lats, lngs)
+        cumulative = np.cumsum(sum(self._count(x + dx, y + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)))
+        start = 0
+        while start < len(lats):
+            offset = cumulative[start - 1] if start else 0
+            end = max(start + 1, int(np.searchsorted(cumulative, offset + DISTANCE_CHUNK_ELEMENTS, side="right")))
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    owner, zone = self._pairs(x[start:end] + dx, y[start:end] + dy)
+                    owner += start
+                    distance = haversine_np(lats[owner], lngs[owner], self.zones.lat[zone], self.zones.lng[zone])
+                    near = distance < RISK_INFLUENCE_KM
+                    yield owner[near], zone[near], distance[near]
+            start = end
+
+    def _ring_offsets(self, x: np.ndarray, y: np.ndarray, r: int) -> list:
+        """칸 (x, y) 들에서 r 칸 떨어진 링의 오프셋 중 격자 범위와 겹칠 수 있는 것"""
+        if r == 0:
+            return [(0, 0)]
+        min_x, min_y, max_x, max_y = self.bounds
+        dx_lo, dx_hi = max(-r, int((min_x - x).min())), min(r, int((max_x - x).max()))
+        dy_lo, dy_hi = max(-r, int((min_y - y).min())), min(r, int((max_y - y).max()))
+        offsets = []
+        # 위/아래 변 (모서리 포함), 좌/우 변 (모서리 제외)
+        for dy in (-r, r):
+            if dy_lo <= dy <= dy_hi:
+                offsets.extend((dx, dy) for dx in range(dx_lo, dx_hi + 1))
+        for dx in (-r, r):
+            if dx_lo <= dx <= dx_hi:
+                offsets.extend((dx, dy) for dy in range(max(dy_lo, -r + 1), min(dy_hi, r - 1) + 1))
+        return offsets
+
+    def nearest(self, lats: np.ndarray, lngs: np.ndarray):
+        """각 지점의 최근접 위험지역 번호와 거리(km) - 칸 링을 바깥으로 넓혀 가며 탐색
+
+        링 r 까지 본 뒤 아직 보지 않은 위험지역은 모두 r 칸 넘게 떨어져 있으므로
+        찾은 거리가 r x 칸 크기 이하이면 확정한다. 거리가 같으면 번호가 작은 위험지역.
+        """
+        count = len(lats)
+        best_zone = np.full(count, -1, dtype=np.int64)
+        best = np.full(count, np.inf)
+        if count == 0 or len(self.zones) == 0:
+            return best_zone, best
+        x, y = self.cells(lats, lngs)
+        min_x, min_y, max_x, max_y = self.bounds
+        # 격자 범위 밖 지점은 범위 경계의 링부터, 범위 끝 링까지 보면 끝
+        start = np.maximum.reduce([np.zeros(count, dtype=np.int64), x - max_x, min_x - x, y - max_y, min_y - y])
+        last = np.maximum.reduce([x - min_x, max_x - x, y - min_y, max_y - y])
+        # 경도 칸의 실제 폭이 가장 좁아지는 위도 기준 여유 (GridZoneIndex._scale 과 같은 방식)
+        lowest = np.cos(np.radians(np.maximum(np.abs(lats), self.max_abs_lat)))
+        reach = RISK_INFLUENCE_KM * np.minimum(1.0, lowest / math.cos(math.radians(self.max_abs_lat))) * 0.99
+
+        pending = np.arange(count)
+        r = 0
+        while len(pending):
+            r = max(r, int(start[pending].min()))
+            active = pending[start[pending] <= r]
+            for dx, dy in self._ring_offsets(x[active], y[active], r):
+                owner, zone = self._pairs(x[active] + dx, y[active] + dy)
+                if len(owner) == 0:
+                    continue
+                owner = active[owner]
+                distance = haversine_np(lats[owner], lngs[owner], self.zones.lat[zone], self.zones.lng[zone])
+                _keep_nearest(owner, zone, distance, best_zone, best)
+            done = (best[pending] <= r * reach[pending]) | (r >= last[pending])
+            pending = pending[~done]
+            r += 1
+        return best_zone, best
+
+
+def _keep_nearest(owner: np.ndarray, zone: np.ndarray, distance: np.ndarray, best_zone: np.ndarray, best: np.ndarray):
+    """지점 번호 순으로 모인 (지점, 위험지역, 거리) 쌍으로 지점별 최근접 결과 갱신 (거리가 같으면 번호가 작은 위험지역)"""
+    if len(owner) == 0:
+        return
+    # 지점별 구간의 최소 거리 -> 최소 거리인 쌍 중 가장 작은 위험지역 번호 (정렬 없이 구간 reduce)
+    starts = np.flatnonzero(np.r_[True, owner[1:] != owner[:-1]])
+    segment = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(owner)]))
+    minimum = np.minimum.reduceat(distance, starts)
+    hits = np.flatnonzero(distance == minimum[segment])
+    hit_starts = np.flatnonzero(np.r_[True, segment[hits][1:] != segment[hits][:-1]])
+    owner, zone, distance = owner[starts], np.minimum.reduceat(zone[hits], hit_starts), minimum
+    better = (distance < best[owner]) | ((distance == best[owner]) & (zone < best_zone[owner]))
+    best[owner[better]] = distance[better]
+    best_zone[owner[better]] = zone[better]
+
+
+def nearest_zones(lats: np.ndarray, lngs: np.ndarray, zones: ZoneArrays, exact: bool = True):
+    """각 지점의 최근접 위험지역 인덱스와 거리(km)
+
+    exact=True 이면 최근접 지역의 거리를 calculate_distance 로 다시 계산하고,
+    오차 범위 내 동률 후보는 스칼라 계산으로 판정해 단건 예측과 결과를 일치시킨다.
+    """
+    count = len(lats)
+    nearest = np.full(count, -1, dtype=np.int64)
+    distances = np.full(count, np.inf)
+    if count == 0 or len(zones) == 0:
+        return nearest, distances
+
+    chunk = max(1, DISTANCE_CHUNK_ELEMENTS // len(zones))
+    for start in range(0, count, chunk):
+        end = min(start + chunk, count)
+        matrix = haversine_matrix(lats[start:end], lngs[start:end], zones)
+        best = matrix.argmin(axis=1)
+        best_distance = matrix[np.arange(end - start), best]
+        if not exact:
+            nearest[start:end] = best
+            distances[start:end] = best_distance
+            continue
+        _refine_nearest(lats, lngs, zones, matrix, best, best_distance, start, nearest, distances)
+
+    return nearest, distances
+
+
+def tier_scores(distances: np.ndarray, nearest_risk: np.ndarray) -> np.ndarray:
+    """최근접 위험지역 거리 구간 규칙 (2km 밖 지점은 NaN)"""
+    return np.select(
+        [distances < 0.5, distances < 1.0, distances < 2.0],
+        [np.maximum(0.7, nearest_risk), np.maximum(0.4, nearest_risk * 0.7), np.maximum(0.2, nearest_risk * 0.5)],
+        default=np.nan,
+    )
+
+
+def zone_risks(nearest: np.ndarray, zones: ZoneArrays) -> np.ndarray:
+    """nearest_zones 결과 인덱스의 위험도 배열"""
+    # 위험지역이 없으면 모든 지점이 거리 무한대(난수 구간)가 됨
+    return zones.risk[nearest] if len(zones) else np.zeros(len(nearest))
+
+
+def zone_features(lats: np.ndarray, lngs: np.ndarray, zones: ZoneArrays) -> np.ndarray:
+    """지점별 위험도 모델 입력 특징 행렬 (지점 수 x FEATURE_NAMES)
+
+    영향 거리(RISK_INFLUENCE_KM) 안의 위험지역만 격자(zones.grid)에서 찾아 계산하고, 그 안에 위험지역이
+    없는 지점만 최근접 위험지역을 따로 찾는다. 결과는 전체 거리 행렬로 계산한 것과 같으며
+    (최근접 동률은 번호가 작은 위험지역), 지점마다 값이 다른 지점과 함께 계산되는지와 무관하다.
+    """
+    count = len(lats)
+    features = np.zeros((count, len(FEATURE_NAMES)))
+    features[:, 0] = NO_ZONE_DISTANCE_KM
+    if count == 0 or len(zones) == 0:
+        return features
+    lats = np.asarray(lats, dtype=np.float64)
+    lngs = np.asarray(lngs, dtype=np.float64)
+
+    nearest = np.full(count, -1, dtype=np.int64)
+    distances = np.full(count, np.inf)
+    for owner, zone, distance in zones.grid.near_pairs(lats, lngs):
+        features[:, 2] += np.bincount(owner, weights=distance < 1.0, minlength=count)
+        features[:, 3] += np.bincount(owner, minlength=count)
+        features[:, 4] += np.bincount(owner, weights=zones.risk[zone] * np.exp(-distance / DENSITY_SCALE_KM),
+                                      minlength=count)
+        _keep_nearest(owner, zone, distance, nearest, distances)
+
+    far = np.nonzero(nearest < 0)[0]
+    if len(far):
+        if len(zones) <= NEAREST_SCAN_ZONES:
+            far_nearest, far_distances = nearest_zones(lats[far], lngs[far], zones, exact=False)
+        else:
+            far_nearest, far_distances = zones.grid.nearest(lats[far], lngs[far])
+        nearest[far], distances[far] = far_nearest, far_distances
+
+    features[:, 0] = distances
+    features[:, 1] = zones.risk[nearest]
+    return features
+
+
+def geohash_cells(lats: np.ndarray, lngs: np.ndarray, precision: int):
+    """좌표 배열의 지오해시 칸 -> (위도 칸 번호, 경도 칸 번호, 칸 중심 위도, 칸 중심 경도)
+
+    geo.geohash_cell 과 같은 이분 탐색을 배열로 수행하므로 결과가 단건 계산과 같다.
+    """
+    lat_lo, lat_hi = np.full(len(lats), -90.0), np.full(len(lats), 90.0)
+    lng_lo, lng_hi = np.full(len(lngs), -180.0), np.full(len(lngs), 180.0)
+    lat_cell = np.zeros(len(lats), dtype=np.int64)
+    lng_cell = np.zeros(len(lngs), dtype=np.int64)
+    for bit in range(5 * precision):
+        if bit % 2 == 0:
+            mid = (lng_lo + lng_hi) / 2
+            upper = lngs >= mid
+            lng_lo, lng_hi = np.where(upper, mid, lng_lo), np.where(upper, lng_hi, mid)
+            lng_cell = lng_cell * 2 + upper
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            upper = lats >= mid
+            lat_lo, lat_hi = np.where(upper, mid, lat_lo), np.where(upper, lat_hi, mid)
+            lat_cell = lat_cell * 2 + upper
+    return lat_cell, lng_cell, (lat_lo + lat_hi) / 2, (lng_lo + lng_hi) / 2
+
+
+def cell_noise(lats: np.ndarray, lngs: np.ndarray, low: float = 0.1, high: float = 0.3,
+               precision: int = FALLBACK_CELL_PRECISION) -> np.ndarray:
+    """지오해시 칸마다 고정된 low~high 사이 값 (같은 칸이면 항상 같은 값, splitmix64 해시)"""
+    lat_cell, lng_cell, _, _ = geohash_cells(lats, lngs, precision)
+    with np.errstate(over="ignore"):
+        h = (lat_cell.astype(np.uint64) << np.uint64(32)) ^ lng_cell.astype(np.uint64)
+        h = h + np.uint64(0x9E3779B97F4A7C15)
+        h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        h = h ^ (h >> np.uint64(31))
+    return low + (high - low) * ((h >> np.uint64(11)).astype(np.float64) / float(1 << 53))
+
+
+def risk_grades_batch(scores: np.ndarray):
+    """위험도 점수 배열에 대한 등급/메시지 배열"""
+    conditions = [scores >= threshold for threshold, _, _ in RISK_GRADES]
+    levels = np.select(conditions, [level for _, level, _ in RISK_GRADES], default=LOWEST_GRADE[0])
+    messages = np.select(conditions, [message for _, _, message in RISK_GRADES], default=LOWEST_GRADE[1])
+    return levels, messages
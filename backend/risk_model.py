@@ -0,0 +1,208 @@
+# risk_model.py
+"""교체 가능한 위험도 예측 모델
+
+모델은 zone_features 로 만든 특징 행렬(지점 수 x FEATURE_NAMES)을 받아 0~1 위험도 배열을 돌려준다.
+같은 좌표와 같은 위험지역 데이터에는 항상 같은 점수를 내므로 결과를 캐시할 수 있다.
+
+- TierModel: 기본값. 기존 거리 구간 규칙, 2km 밖은 난수 대신 지오해시 칸마다 고정된 0.1~0.3 값
+- LinearModel: JSON 파일 {"features": [...], "weights": [...], "bias": b, "link": "logistic"}
+- TreeEnsembleModel: NPZ 파일 (features, feature, threshold, left, right, value, roots, base_score, link)
+  로 내보낸 부스팅 트리. 모든 트리를 깊이 단위로 한꺼번에 내려가며 계산
+
+RISK_MODEL_PATH 로 모델 파일을 지정하면 서버 시작 시 한 번 읽어 둔다.
+"""
+import json
+import os
+from typing import Optional, Sequence
+
+import numpy as np
+
+from risk import FEATURE_NAMES, RISK_INFLUENCE_KM, ZoneArrays, cell_noise, tier_scores, zone_features
+
+RISK_MODEL_PATH = os.getenv("RISK_MODEL_PATH")
+
+# RISK_INFLUENCE_KM 밖 위험지역의 영향을 받지 않는 특징 (최근접 거리/위험도는 제한 없이 바뀜)
+BOUNDED_FEATURES = ("zones_within_1km", "zones_within_2km", "risk_density")
+
+LINKS = {
+    "identity": lambda raw: raw,
+    "logistic": lambda raw: 1.0 / (1.0 + np.exp(-raw)),
+}
+
+
+def feature_columns(names: Sequence[str]) -> np.ndarray:
+    """모델 파일의 특징 이름 -> zone_features 열 번호 (모르는 이름이면 ValueError)"""
+    unknown = [name for name in names if name not in FEATURE_NAMES]
+    if unknown:
+        raise ValueError(f"알 수 없는 특징: {unknown} (지원: {list(FEATURE_NAMES)})")
+    return np.array([FEATURE_NAMES.index(name) for name in names], dtype=np.int64)
+
+
+def feature_reach(columns: np.ndarray) -> Optional[float]:
+    """특징 열만 쓰는 모델에서 위험지역 하나가 점수를 바꿀 수 있는 최대 거리 (km, 제한 없으면 None)"""
+    bounded = [FEATURE_NAMES.index(name) for name in BOUNDED_FEATURES]
+    return RISK_INFLUENCE_KM if np.isin(columns, bounded).all() else None
+
+
+def _link(name: str):
+    if name not in LINKS:
+        raise ValueError(f"알 수 없는 link: {name} (지원: {list(LINKS)})")
+    return LINKS[name]
+
+
+class RiskModel:
+    """위험도 모델 인터페이스"""
+
+    name = "base"
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """특징 행렬 -> 위험도 배열"""
+        raise NotImplementedError
+
+    def fingerprint(self) -> bytes:
+        """모델 종류와 파라미터를 나타내는 바이트 (위험도 타일 캐시 무효화 판단용)"""
+        return self.name.encode()
+
+    @property
+    def reach_km(self) -> Optional[float]:
+        """위험지역이 추가/삭제/변경될 때 점수가 바뀔 수 있는 최대 거리 (km, 제한 없으면 None)"""
+        return None
+
+    def score(self, lats: np.ndarray, lngs: np.ndarray, zones: ZoneArrays) -> np.ndarray:
+        """좌표 배열 -> 0~1 위험도 배열"""
+        return np.clip(self.predict(zone_features(lats, lngs, zones)), 0.0, 1.0)
+
+
+class TierModel(RiskModel):
+    """최근접 위험지역 거리 구간 규칙"""
+
+    name = "tier"
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        """구간 규칙 점수 (2km 밖 지점은 NaN, 좌표가 필요하므로 score 에서 채움)"""
+        return tier_scores(features[:, 0], features[:, 1])
+
+    @property
+    def reach_km(self) -> Optional[float]:
+        # 2km 밖은 위험지역과 무관한 칸별 고정값
+        return RISK_INFLUENCE_KM
+
+    def score(self, lats: np.ndarray, lngs: np.ndarray, zones: ZoneArrays) -> np.ndarray:
+        scores = self.predict(zone_features(lats, lngs, zones))
+        far = np.isnan(scores)
+        scores[far] = cell_noise(lats[far], lngs[far])
+        return np.clip(scores, 0.0, 1.0)
+
+
+class LinearModel(RiskModel):
+    """특징의 선형 결합 + link 함수"""
+
+    name = "linear"
+
+    def __init__(self, features: Sequence[str], weights: Sequence[float], bias: float = 0.0, link: str = "logistic"):
+        if len(features) != len(weights):
+            raise ValueError("features 와 weights 의 길이가 다릅니다.")
+        self.columns = feature_columns(features)
+        self.weights = np.asarray(weights, dtype=np.float64)
+        self.bias = float(bias)
+        self.link_name = link
+        self.link = _link(link)
+
+    @classmethod
+    def load(cls, path: str) -> "LinearModel":
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data["features"], data["weights"], data.get("bias", 0.0), data.get("link", "logistic"))
+
+    def fingerprint(self) -> bytes:
+        return b"|".join([self.name.encode(), self.columns.tobytes(), self.weights.tobytes(),
+                          repr(self.bias).encode(), self.link_name.encode()])
+
+    @property
+    def reach_km(self) -> Optional[float]:
+        return feature_reach(self.columns)
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        return self.link(features[:, self.columns] @ self.weights + self.bias)
+
+
+class TreeEnsembleModel(RiskModel):
+    """이진 결정 트리 앙상블 (그래디언트 부스팅 등)
+
+    노드 배열은 모든 트리를 이어 붙인 것이며 feature < 0 이면 잎 노드다.
+    내부 노드는 x[feature] <= threshold 이면 left, 아니면 right 로 내려간다.
+    결과는 link(base_score + 각 트리 잎 value 합).
+    """
+
+    name = "trees"
+
+    def __init__(self, features: Sequence[str], feature: np.ndarray, threshold: np.ndarray, left: np.ndarray,
+                 right: np.ndarray, value: np.ndarray, roots: np.ndarray, base_score: float = 0.0,
+                 link: str = "logistic"):
+        self.columns = feature_columns(features)
+        self.feature = np.asarray(feature, dtype=np.int64)
+        self.threshold = np.asarray(threshold, dtype=np.float64)
+        self.left = np.asarray(left, dtype=np.int64)
+        self.right = np.asarray(right, dtype=np.int64)
+        self.value = np.asarray(value, dtype=np.float64)
+        self.roots = np.asarray(roots, dtype=np.int64)
+        self.base_score = float(base_score)
+        self.link_name = link
+        self.link = _link(link)
+
+        internal = self.feature >= 0
+        if (self.feature[internal] >= len(self.columns)).any():
+            raise ValueError("노드의 feature 번호가 특징 수보다 큽니다.")
+        self.depth = self._max_depth()
+
+    @classmethod
+    def load(cls, path: str) -> "TreeEnsembleModel":
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                [str(name) for name in data["features"]],
+                data["feature"], data["threshold"], data["left"], data["right"], data["value"], data["roots"],
+                float(data["base_score"]) if "base_score" in data else 0.0,
+                str(data["link"]) if "link" in data else "logistic",
+            )
+
+    def fingerprint(self) -> bytes:
+        arrays = (self.columns, self.feature, self.threshold, self.left, self.right, self.value, self.roots)
+        return b"|".join([self.name.encode(), *(values.tobytes() for values in arrays),
+                          repr(self.base_score).encode(), self.link_name.encode()])
+
+    @property
+    def reach_km(self) -> Optional[float]:
+        return feature_reach(self.columns)
+
+    def _max_depth(self) -> int:
+        nodes, depth = self.roots, 0
+        while True:
+            nodes = nodes[self.feature[nodes] >= 0]
+            if len(nodes) == 0:
+                return depth
+            nodes = np.concatenate([self.left[nodes], self.right[nodes]])
+            depth += 1
+            if depth > len(self.feature):
+                raise ValueError("트리에 순환이 있습니다.")
+
+    def predict(self, features: np.ndarray) -> np.ndarray:
+        x = features[:, self.columns]
+        rows = np.arange(len(x))[:, None]
+        nodes = np.broadcast_to(self.roots, (len(x), len(self.roots))).copy()
+        for _ in range(self.depth):
+            feature = self.feature[nodes]
+            internal = feature >= 0
+            go_left = x[rows, np.where(internal, feature, 0)] <= self.threshold[nodes]
+            nodes = np.where(internal, np.where(go_left, self.left[nodes], self.right[nodes]), nodes)
+        return self.link(self.base_score + self.value[nodes].sum(axis=1))
+
+
+def load_risk_model(path: Optional[str] = RISK_MODEL_PATH) -> RiskModel:
+    """모델 파일 로드 (.json = LinearModel, .npz = TreeEnsembleModel, 미지정 시 TierModel)"""
+    if not path:
+        return TierModel()
+    if path.endswith(".json"):
+        return LinearModel.load(path)
+    if path.endswith(".npz"):
+        return TreeEnsembleModel.load(path)
+    raise ValueError(f"지원하지 않는 모델 파일 형식: {path} (.json, .npz)")
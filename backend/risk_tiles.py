@@ -0,0 +1,256 @@
+# risk_tiles.py
+"""서울시 위험도 래스터 타일 생성 및 디스크 캐시
+
+타일은 웹 메르카토르(z/x/y) 256x256 격자이며, 각 픽셀은 uint8 값으로 저장한다.
+0 은 서울 경계 밖(데이터 없음), 1~255 는 위험도 0.0~1.0 을 나타낸다.
+
+사전 생성 (backend 디렉터리에서):
+    python risk_tiles.py --min-zoom 10 --max-zoom 13
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import shutil
+import struct
+import tempfile
+import zlib
+
+import numpy as np
+
+from geo import SEOUL_BBOX
+from risk import ZoneArrays
+from risk_model import RiskModel, load_risk_model
+from zone_store import ZONE_DATA_PATH, load_zone_arrays
+
+TILE_SIZE = 256
+MIN_TILE_ZOOM = 8
+MAX_TILE_ZOOM = 16
+TILE_CACHE_DIR = os.getenv("RISK_TILE_CACHE_DIR", "./tile_cache")
+# 렌더링 규칙이 바뀌면 올려서 디스크에 남은 이전 타일을 버림
+TILE_RENDER_VERSION = 3
+
+TILE_FORMATS = {
+    "png": "image/png",
+    "raw": "application/octet-stream",
+}
+
+
+def lat_to_tile(z: int, lat: float) -> float:
+    lat_rad = math.radians(lat)
+    return (1 - math.asinh(math.tan(lat_rad)) / math.pi) / 2 * (1 << z)
+
+
+def lng_to_tile(z: int, lng: float) -> float:
+    return (lng + 180.0) / 360.0 * (1 << z)
+
+
+def tile_range(z: int, bbox: tuple):
+    """bbox(최소 위도, 최소 경도, 최대 위도, 최대 경도)와 겹치는 타일 x, y 범위"""
+    min_lat, min_lng, max_lat, max_lng = bbox
+    last = (1 << z) - 1
+    x0 = min(last, max(0, int(lng_to_tile(z, min_lng))))
+    x1 = min(last, max(0, int(lng_to_tile(z, max_lng))))
+    y0 = min(last, max(0, int(lat_to_tile(z, max_lat))))
+    y1 = min(last, max(0, int(lat_to_tile(z, min_lat))))
+    return x0, x1, y0, y1
+
+
+def render_tile(zones: ZoneArrays, model: RiskModel, z: int, x: int, y: int) -> np.ndarray:
+    """타일 한 장의 위험도 격자 계산 (/predict-risk 와 같은 위험도 모델 점수)"""
+    offsets = (np.arange(TILE_SIZE) + 0.5) / TILE_SIZE
+    lngs = (x + offsets) / (1 << z) * 360.0 - 180.0
+    lats = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (y + offsets) / (1 << z)))))
+    lat_grid, lng_grid = np.meshgrid(lats, lngs, indexing="ij")
+
+    min_lat, min_lng, max_lat, max_lng = SEOUL_BBOX
+    inside = ((lat_grid >= min_lat) & (lat_grid <= max_lat) &
+              (lng_grid >= min_lng) & (lng_grid <= max_lng))
+
+    scores = np.zeros(lat_grid.shape)
+    if inside.any():
+        # 영향 거리 안의 위험지역만 격자로 찾으므로 위험지역 수가 많아도 픽셀당 비용은 주변 위험지역 수에 비례
+        scores[inside] = model.score(lat_grid[inside], lng_grid[inside], zones)
+
+    tile = np.zeros(lat_grid.shape, dtype=np.uint8)
+    tile[inside] = 1 + np.round(scores[inside] * 254).astype(np.uint8)
+    return tile
+
+
+def _risk_palette():
+    """uint8 값 -> RiskMap 범례 색상 (RGB 팔레트, 투명도 표)"""
+    colors = [
+        (0.8, (0xff, 0x44, 0x44)),
+        (0.6, (0xff, 0x88, 0x00)),
+        (0.4, (0xff, 0xaa, 0x00)),
+        (0.2, (0x88, 0xcc, 0x00)),
+        (0.0, (0x44, 0xcc, 0x44)),
+    ]
+    palette = bytearray()
+    alpha = bytearray()
+    for value in range(256):
+        if value == 0:
+            palette += bytes(3)
+            alpha.append(0)
+            continue
+        score = (value - 1) / 254
+        palette += bytes(next(rgb for threshold, rgb in colors if score >= threshold))
+        alpha.append(160)
+    return bytes(palette), bytes(alpha)
+
+
+_PALETTE, _ALPHA = _risk_palette()
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xffffffff)
+
+
+def encode_png(tile: np.ndarray) -> bytes:
+    """uint8 타일을 팔레트 PNG 로 인코딩"""
+    height, width = tile.shape
+    # 각 행 앞에 필터 타입(0: None) 바이트 추가
+    rows = np.hstack([np.zeros((height, 1), dtype=np.uint8), tile])
+    return b"".join([
+        b"\x89PNG\r\n\x1a\n",
+        _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 3, 0, 0, 0)),
+        _png_chunk(b"PLTE", _PALETTE),
+        _png_chunk(b"tRNS", _ALPHA),
+        _png_chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)),
+        _png_chunk(b"IEND", b""),
+    ])
+
+
+def zones_fingerprint(zones: ZoneArrays, model: RiskModel) -> str:
+    digest = hashlib.sha1(f"render-{TILE_RENDER_VERSION}".encode())
+    digest.update(model.fingerprint())
+    for values in (zones.lat, zones.lng, zones.risk):
+        digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+class RiskTileCache:
+    """위험도 타일 디스크 캐시
+
+    위험지역 구성이 바뀌면 변경된 지역의 영향 반경(2km)과 겹치는 타일만 삭제한다.
+    서버 재시작 시 캐시를 만든 위험지역 구성이나 위험도 모델과 다르면 전체를 비운다.
+    """
+
+    def __init__(self, zones: ZoneArrays, model: RiskModel, cache_dir: str = TILE_CACHE_DIR):
+        self.zones = zones
+        self.model = model
+        self.cache_dir = cache_dir
+        self._manifest_path = os.path.join(cache_dir, "manifest.json")
+
+        fingerprint = zones_fingerprint(zones, model)
+        if self._read_fingerprint() != fingerprint:
+            self.clear()
+            self._write_fingerprint(fingerprint)
+
+    def _read_fingerprint(self):
+        try:
+            with open(self._manifest_path, encoding="utf-8") as f:
+                return json.load(f).get("fingerprint")
+        except (OSError, ValueError):
+            return None
+
+    def _write_fingerprint(self, fingerprint: str):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self._manifest_path, "w", encoding="utf-8") as f:
+            json.dump({"fingerprint": fingerprint}, f)
+
+    def covers(self, z: int, x: int, y: int) -> bool:
+        """서울 경계와 겹치는 유효 타일인지 확인"""
+        if not MIN_TILE_ZOOM <= z <= MAX_TILE_ZOOM:
+            return False
+        x0, x1, y0, y1 = tile_range(z, SEOUL_BBOX)
+        return x0 <= x <= x1 and y0 <= y <= y1
+
+    def _path(self, z: int, x: int, y: int, fmt: str) -> str:
+        return os.path.join(self.cache_dir, str(z), str(x), f"{y}.{fmt}")
+
+    def tile_path(self, z: int, x: int, y: int, fmt: str = "png") -> str:
+        """캐시된 타일 파일 경로 반환 (없으면 생성 후 저장)"""
+        path = self._path(z, x, y, fmt)
+        if os.path.exists(path):
+            return path
+
+        zones = self.zones
+        tile = render_tile(zones, self.model, z, x, y)
+        if zones is not self.zones:
+            # 생성 도중 위험지역이 바뀌었으면 새 데이터로 다시 생성
+            return self.tile_path(z, x, y, fmt)
+        self._write(self._path(z, x, y, "raw"), tile.tobytes())
+        self._write(self._path(z, x, y, "png"), encode_png(tile))
+        return path
+
+    def _write(self, path: str, data: bytes):
+        # 동시 요청이 반쯤 쓰인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def update_zones(self, zones: ZoneArrays, changed_zones: list) -> int:
+        """위험지역 변경 반영: 영향받는 타일만 삭제하고 삭제한 파일 수 반환
+
+        모델 점수가 바뀌는 거리(RiskModel.reach_km)가 제한되지 않으면(최근접 거리 특징 등)
+        위험지역 하나가 바뀌어도 멀리 있는 타일까지 달라지므로 캐시 전체를 비운다.
+        """
+        self.zones = zones
+        reach = self.model.reach_km
+        if reach is None:
+            removed = self.clear() if changed_zones else 0
+            self._write_fingerprint(zones_fingerprint(zones, self.model))
+            return removed
+        removed = 0
+        for zone in changed_zones:
+            # 영향 반경을 위경도 범위로 여유 있게 근사 (위도 1도 ≈ 111km)
+            dlat = reach / 110.0
+            dlng = dlat / max(math.cos(math.radians(zone["lat"])), 1e-6)
+            bbox = (zone["lat"] - dlat, zone["lng"] - dlng, zone["lat"] + dlat, zone["lng"] + dlng)
+            for z in range(MIN_TILE_ZOOM, MAX_TILE_ZOOM + 1):
+                x0, x1, y0, y1 = tile_range(z, bbox)
+                for x in range(x0, x1 + 1):
+                    for y in range(y0, y1 + 1):
+                        for fmt in TILE_FORMATS:
+                            try:
+                                os.remove(self._path(z, x, y, fmt))
+                                removed += 1
+                            except FileNotFoundError:
+                                pass
+        self._write_fingerprint(zones_fingerprint(zones, self.model))
+        return removed
+
+    def clear(self) -> int:
+        """캐시된 타일 전체 삭제 (삭제한 파일 수 반환)"""
+        removed = 0
+        for z in range(MIN_TILE_ZOOM, MAX_TILE_ZOOM + 1):
+            directory = os.path.join(self.cache_dir, str(z))
+            removed += sum(len(files) for _, _, files in os.walk(directory))
+            shutil.rmtree(directory, ignore_errors=True)
+        return removed
+
+    def precompute(self, min_zoom: int, max_zoom: int) -> int:
+        """서울 경계 전체 타일 사전 생성"""
+        count = 0
+        for z in range(max(min_zoom, MIN_TILE_ZOOM), min(max_zoom, MAX_TILE_ZOOM) + 1):
+            x0, x1, y0, y1 = tile_range(z, SEOUL_BBOX)
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    self.tile_path(z, x, y)
+                    count += 1
+        return count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="서울시 위험도 타일 사전 생성")
+    parser.add_argument("--min-zoom", type=int, default=10)
+    parser.add_argument("--max-zoom", type=int, default=13)
+    parser.add_argument("--zones", default=ZONE_DATA_PATH, help="위험지역 데이터 파일 (기본: ZONE_DATA_PATH, 없으면 더미 데이터)")
+    args = parser.parse_args()
+
+    risk_tiles = RiskTileCache(load_zone_arrays(args.zones), load_risk_model())
+    print(f"{risk_tiles.precompute(args.min_zoom, args.max_zoom)}개 타일 생성 완료")
@@ -0,0 +1,416 @@
+# road_graph.py
+"""보행자 도로 그래프와 위험도 가중 A* 경로 탐색
+
+OSM 추출본(.osm XML)에서 보행 가능한 도로만 골라 교차점 사이 구간을 간선 하나로 압축하고,
+CSR(압축 희소 행) 인접 배열로 보관한다. 간선 비용은 길이(km) x (1 + 가중치 x 구간 최대 위험도) 이다.
+
+그래프 생성 (backend 디렉터리에서):
+    python road_graph.py seoul.osm road_graph.npz
+"""
+import argparse
+import heapq
+import math
+import os
+import xml.etree.ElementTree as ET
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from geo import calculate_distance
+from risk import KM_PER_DEGREE, ZoneArrays, haversine_np
+from risk_model import RiskModel
+
+# 보행자가 다닐 수 없는 도로 종류
+EXCLUDED_HIGHWAYS = {
+    "motorway", "motorway_link", "construction", "proposed", "abandoned",
+    "raceway", "bus_guideway", "escape",
+}
+# 위험 구간 비용 가중치 (위험도 1.0 구간은 길이의 1 + ROUTE_RISK_PENALTY 배)
+ROUTE_RISK_PENALTY = float(os.getenv("ROUTE_RISK_PENALTY", "4.0"))
+# 대안 경로 탐색 시 앞서 찾은 경로 간선의 비용 배수 (같은 길을 다시 고르지 않도록)
+ALTERNATIVE_PENALTY = 1.5
+
+
+class PointGrid:
+    """정렬된 격자 키 배열 기반 좌표 버킷 (반경/최근접 질의용)"""
+
+    def __init__(self, lats: np.ndarray, lngs: np.ndarray, cell_km: float = 0.25):
+        self.lats = np.asarray(lats, dtype=np.float64)
+        self.lngs = np.asarray(lngs, dtype=np.float64)
+        mean_lat = float(self.lats.mean()) if len(self.lats) else 0.0
+        self._cos = max(math.cos(math.radians(mean_lat)), 1e-6)
+        self._cell_lat = cell_km / KM_PER_DEGREE
+        self._cell_lng = self._cell_lat / self._cos
+        # 위도에 따른 경도 간격 차이를 감안한 여유 비율
+        self._slack = 1.1
+
+        ix = np.floor(self.lngs / self._cell_lng).astype(np.int64)
+        iy = np.floor(self.lats / self._cell_lat).astype(np.int64)
+        if len(ix):
+            self._min_x, self._min_y = int(ix.min()), int(iy.min())
+            self._nx, self._ny = int(ix.max()) - self._min_x + 1, int(iy.max()) - self._min_y + 1
+        else:
+            self._min_x = self._min_y = 0
+            self._nx = self._ny = 0
+        keys = (ix - self._min_x) * self._ny + (iy - self._min_y)
+        self._order = np.argsort(keys, kind="stable")
+        self._keys = keys[self._order]
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return (math.floor(lng / self._cell_lng) - self._min_x,
+                math.floor(lat / self._cell_lat) - self._min_y)
+
+    def _square(self, cx: int, cy: int, rx: int, ry: int) -> np.ndarray:
+        """(cx, cy) 중심 사각형 격자 범위에 속한 점 인덱스"""
+        y0, y1 = max(cy - ry, 0), min(cy + ry, self._ny - 1)
+        if y0 > y1:
+            return np.empty(0, dtype=np.int64)
+        parts = []
+        for x in range(max(cx - rx, 0), min(cx + rx, self._nx - 1) + 1):
+            lo = np.searchsorted(self._keys, x * self._ny + y0, side="left")
+            hi = np.searchsorted(self._keys, x * self._ny + y1, side="right")
+            if hi > lo:
+                parts.append(self._order[lo:hi])
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    def candidates(self, lat: float, lng: float, radius_km: float) -> np.ndarray:
+        """반경을 덮는 격자에 속한 점 인덱스 (거리 필터 전)"""
+        if self._nx == 0:
+            return np.empty(0, dtype=np.int64)
+        cx, cy = self._cell(lat, lng)
+        cos = max(math.cos(math.radians(lat)), 1e-6)
+        rx = math.ceil(radius_km * self._slack / (self._cell_lng * cos * KM_PER_DEGREE)) + 1
+        ry = math.ceil(radius_km / (self._cell_lat * KM_PER_DEGREE)) + 1
+        return self._square(cx, cy, rx, ry)
+
+    def within(self, lat: float, lng: float, radius_km: float) -> Tuple[np.ndarray, np.ndarray]:
+        """반경 내 점 인덱스와 거리(km)"""
+        idx = self.candidates(lat, lng, radius_km)
+        distances = haversine_np(lat, lng, self.lats[idx], self.lngs[idx])
+        mask = distances <= radius_km
+        return idx[mask], distances[mask]
+
+    def nearest(self, lat: float, lng: float) -> Tuple[int, float]:
+        """최근접 점 인덱스와 거리(km)"""
+        if self._nx == 0:
+            return -1, float("inf")
+        cx, cy = self._cell(lat, lng)
+        # 격자 범위 밖이면 가장 가까운 경계까지 바로 확장
+        r = max(0, -cx, cx - self._nx + 1, -cy, cy - self._ny + 1)
+        while True:
+            idx = self._square(cx, cy, r, r)
+            if len(idx):
+                break
+            r += 1
+        distances = haversine_np(lat, lng, self.lats[idx], self.lngs[idx])
+        best = float(distances.min())
+        # 사각형 밖에 더 가까운 점이 있을 수 있으므로 최소 거리 반경으로 다시 확인
+        idx, distances = self.within(lat, lng, best)
+        i = int(np.argmin(distances))
+        return int(idx[i]), float(distances[i])
+
+
+class RoadGraph:
+    """CSR 인접 배열 기반 무방향 보행자 도로 그래프"""
+
+    def __init__(self, node_lat, node_lng, edge_u, edge_v, edge_length, geom_offsets, geom_lat, geom_lng):
+        self.node_lat = np.asarray(node_lat, dtype=np.float64)
+        self.node_lng = np.asarray(node_lng, dtype=np.float64)
+        self.edge_u = np.asarray(edge_u, dtype=np.int32)
+        self.edge_v = np.asarray(edge_v, dtype=np.int32)
+        self.edge_length = np.asarray(edge_length, dtype=np.float64)
+        # 간선 e 의 형상 좌표는 geom_lat/lng[geom_offsets[e]:geom_offsets[e + 1]] (u -> v 방향)
+        self.geom_offsets = np.asarray(geom_offsets, dtype=np.int64)
+        self.geom_lat = np.asarray(geom_lat, dtype=np.float64)
+        self.geom_lng = np.asarray(geom_lng, dtype=np.float64)
+
+        self._build_csr()
+        self._node_grid = PointGrid(self.node_lat, self.node_lng)
+
+        self.edge_risk = np.zeros(self.num_edges)
+        self.edge_cost = self.edge_length.copy()
+        self._adj_cost = self.edge_cost[self.adj_edge].tolist()
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_lat)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.edge_u)
+
+    def _build_csr(self):
+        n, m = self.num_nodes, self.num_edges
+        src = np.concatenate([self.edge_u, self.edge_v])
+        dst = np.concatenate([self.edge_v, self.edge_u])
+        eid = np.concatenate([np.arange(m), np.arange(m)])
+        order = np.argsort(src, kind="stable")
+
+        self.indptr = np.zeros(n + 1, dtype=np.int64)
+        self.indptr[1:] = np.cumsum(np.bincount(src, minlength=n))
+        self.adj_node = dst[order].astype(np.int32)
+        self.adj_edge = eid[order].astype(np.int32)
+
+        # 탐색 루프에서는 NumPy 스칼라 접근이 느리므로 파이썬 리스트 사용
+        self._indptr = self.indptr.tolist()
+        self._adj = self.adj_node.tolist()
+        self._lat = self.node_lat.tolist()
+        self._lng = self.node_lng.tolist()
+
+    # ---- 생성/저장 ----
+
+    @classmethod
+    def from_ways(cls, ways: List[List[int]], coords: Dict[int, Tuple[float, float]]) -> "RoadGraph":
+        """노드 ID 목록(way)과 노드 좌표로 그래프 생성 (교차점 사이 구간을 간선 하나로 압축)"""
+        # 좌표가 없는 노드(추출 범위 밖)에서 way 를 끊음
+        runs = []
+        for way in ways:
+            run = []
+            for node in way:
+                if node in coords:
+                    run.append(node)
+                    continue
+                if len(run) >= 2:
+                    runs.append(run)
+                run = []
+            if len(run) >= 2:
+                runs.append(run)
+        ways = runs
+
+        # way 양 끝점과 두 번 이상 등장하는 노드가 교차점
+        usage: Dict[int, int] = {}
+        for way in ways:
+            for node in way:
+                usage[node] = usage.get(node, 0) + 1
+        junctions = {node for node, count in usage.items() if count >= 2}
+        for way in ways:
+            junctions.add(way[0])
+            junctions.add(way[-1])
+
+        node_ids: Dict[int, int] = {}
+        edge_u, edge_v, edge_length = [], [], []
+        geom_offsets, geom_lat, geom_lng = [0], [], []
+
+        for way in ways:
+            segment = [way[0]]
+            for node in way[1:]:
+                segment.append(node)
+                if node not in junctions:
+                    continue
+                if segment[0] != segment[-1]:
+                    points = [coords[n] for n in segment]
+                    length = sum(calculate_distance(a[0], a[1], b[0], b[1]) for a, b in zip(points, points[1:]))
+                    edge_u.append(node_ids.setdefault(segment[0], len(node_ids)))
+                    edge_v.append(node_ids.setdefault(segment[-1], len(node_ids)))
+                    edge_length.append(length)
+                    geom_lat.extend(p[0] for p in points)
+                    geom_lng.extend(p[1] for p in points)
+                    geom_offsets.append(len(geom_lat))
+                segment = [node]
+
+        node_lat = np.empty(len(node_ids))
+        node_lng = np.empty(len(node_ids))
+        for node, i in node_ids.items():
+            node_lat[i], node_lng[i] = coords[node]
+
+        return cls(node_lat, node_lng, edge_u, edge_v, edge_length, geom_offsets, geom_lat, geom_lng)
+
+    @classmethod
+    def from_osm(cls, path: str) -> "RoadGraph":
+        """OSM XML 추출본에서 보행 가능한 도로로 그래프 생성"""
+        # 1차: 보행 가능한 way 와 필요한 노드 ID 수집 (OSM 파일은 노드가 먼저 나오므로 2회 읽음)
+        ways = []
+        for _, element in ET.iterparse(path, events=("end",)):
+            if element.tag == "way":
+                tags = {tag.get("k"): tag.get("v") for tag in element.iter("tag")}
+                if _is_walkable(tags):
+                    ways.append([int(nd.get("ref")) for nd in element.iter("nd")])
+            if element.tag in ("node", "way", "relation"):
+                element.clear()
+
+        needed = {node for way in ways for node in way}
+        coords = {}
+        for _, element in ET.iterparse(path, events=("end",)):
+            if element.tag == "node":
+                node = int(element.get("id"))
+                if node in needed:
+                    coords[node] = (float(element.get("lat")), float(element.get("lon")))
+            if element.tag in ("node", "way", "relation"):
+                element.clear()
+
+        return cls.from_ways(ways, coords)
+
+    def save(self, path: str):
+        np.savez(
+            path,
+            node_lat=self.node_lat, node_lng=self.node_lng,
+            edge_u=self.edge_u, edge_v=self.edge_v, edge_length=self.edge_length,
+            geom_offsets=self.geom_offsets, geom_lat=self.geom_lat, geom_lng=self.geom_lng,
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "RoadGraph":
+        if not path.endswith(".npz"):
+            return cls.from_osm(path)
+        with np.load(path) as data:
+            return cls(**{key: data[key] for key in data.files})
+
+    # ---- 위험도 가중치 ----
+
+    def _point_risk(self, zones: ZoneArrays, model: RiskModel) -> np.ndarray:
+        """형상 좌표별 위험도 (/predict-risk, 위험도 타일과 같은 모델 점수)"""
+        return model.score(self.geom_lat, self.geom_lng, zones)
+
+    def set_risk_weights(self, zones: ZoneArrays, model: RiskModel, penalty: float = ROUTE_RISK_PENALTY):
+        """위험지역 데이터와 위험도 모델로 간선 위험도와 비용 재계산"""
+        if self.num_edges:
+            self.edge_risk = np.maximum.reduceat(self._point_risk(zones, model), self.geom_offsets[:-1])
+        self.edge_cost = self.edge_length * (1 + penalty * self.edge_risk)
+        self._adj_cost = self.edge_cost[self.adj_edge].tolist()
+
+    # ---- 경로 탐색 ----
+
+    def nearest_node(self, lat: float, lng: float) -> int:
+        return self._node_grid.nearest(lat, lng)[0]
+
+    def _astar(self, source: int, target: int, adj_cost: Optional[list] = None) -> Optional[List[Tuple[int, int]]]:
+        """위험도 가중 비용 A* (직선거리 휴리스틱) - (출발 노드, 간선) 목록 반환
+
+        adj_cost 를 주면 인접 배열 순서의 간선 비용으로 사용 (기본 비용 이상이어야 휴리스틱이 유효)
+        """
+        indptr, adj = self._indptr, self._adj
+        adj_cost = self._adj_cost if adj_cost is None else adj_cost
+        adj_edge = self.adj_edge
+        lat, lng = self._lat, self._lng
+        target_lat, target_lng = lat[target], lng[target]
+
+        # 간선 비용 >= 길이 >= 직선거리 이므로 직선거리는 허용 가능한 휴리스틱
+        heuristic: Dict[int, float] = {}
+        dist = {source: 0.0}
+        prev: Dict[int, Tuple[int, int]] = {}
+        heap = [(calculate_distance(lat[source], lng[source], target_lat, target_lng), 0.0, source)]
+        closed = set()
+
+        while heap:
+            _, g, u = heapq.heappop(heap)
+            if u == target:
+                break
+            if u in closed:
+                continue
+            closed.add(u)
+            for k in range(indptr[u], indptr[u + 1]):
+                v = adj[k]
+                ng = g + adj_cost[k]
+                if ng < dist.get(v, math.inf):
+                    dist[v] = ng
+                    prev[v] = (u, k)
+                    h = heuristic.get(v)
+                    if h is None:
+                        h = heuristic[v] = calculate_distance(lat[v], lng[v], target_lat, target_lng)
+                    heapq.heappush(heap, (ng + h, ng, v))
+        else:
+            return None
+
+        path = []
+        node = target
+        while node != source:
+            u, k = prev[node]
+            path.append((u, int(adj_edge[k])))
+            node = u
+        path.reverse()
+        return path
+
+    def edge_points(self, edge: int, from_node: int) -> List[Tuple[float, float]]:
+        """간선 형상 좌표 (from_node 에서 출발하는 방향)"""
+        lo, hi = self.geom_offsets[edge], self.geom_offsets[edge + 1]
+        points = list(zip(self.geom_lat[lo:hi].tolist(), self.geom_lng[lo:hi].tolist()))
+        return points if self.edge_u[edge] == from_node else points[::-1]
+
+    def path_waypoints(self, start_lat: float, start_lng: float, end_lat: float, end_lng: float,
+                       path: List[Tuple[int, int]]) -> Tuple[list, float]:
+        """(출발 노드, 간선) 목록을 경유 좌표와 총 길이(km)로 변환"""
+        waypoints = [{"lat": start_lat, "lng": start_lng}]
+        for u, edge in path:
+            for lat, lng in self.edge_points(edge, u):
+                if waypoints[-1]["lat"] != lat or waypoints[-1]["lng"] != lng:
+                    waypoints.append({"lat": lat, "lng": lng})
+        if waypoints[-1]["lat"] != end_lat or waypoints[-1]["lng"] != end_lng:
+            waypoints.append({"lat": end_lat, "lng": end_lng})
+
+        distance = sum(
+            calculate_distance(a["lat"], a["lng"], b["lat"], b["lng"])
+            for a, b in zip(waypoints, waypoints[1:])
+        )
+        return waypoints, distance
+
+    def route(self, start_lat: float, start_lng: float, end_lat: float, end_lng: float) -> Optional[Tuple[list, float]]:
+        """위험도 가중 최적 경로 (경유 좌표 목록, 총 길이 km) - 연결되지 않으면 None"""
+        if self.num_nodes == 0:
+            return None
+        source = self.nearest_node(start_lat, start_lng)
+        target = self.nearest_node(end_lat, end_lng)
+        path = self._astar(source, target)
+        if path is None:
+            return None
+        return self.path_waypoints(start_lat, start_lng, end_lat, end_lng, path)
+
+    def alternatives(self, start_lat: float, start_lng: float, end_lat: float, end_lng: float, count: int,
+                     penalty: float = ALTERNATIVE_PENALTY) -> List[Tuple[list, float]]:
+        """서로 다른 경로 최대 count 개 [(경유 좌표 목록, 총 길이 km), ...] - 첫 번째는 route() 와 같음
+
+        경로를 찾을 때마다 그 경로 간선의 비용을 penalty 배로 올려 다시 탐색한다.
+        """
+        if self.num_nodes == 0 or count <= 0:
+            return []
+        source = self.nearest_node(start_lat, start_lng)
+        target = self.nearest_node(end_lat, end_lng)
+        # 간선 e 의 인접 배열 위치 두 곳 (양방향)
+        edge_slots = np.argsort(self.adj_edge, kind="stable").reshape(-1, 2).tolist()
+        adj_cost = list(self._adj_cost)
+        routes, seen = [], set()
+        for _ in range(count * 2):
+            path = self._astar(source, target, adj_cost)
+            if path is None:
+                break
+            edges = tuple(edge for _, edge in path)
+            if edges not in seen:
+                seen.add(edges)
+                routes.append(self.path_waypoints(start_lat, start_lng, end_lat, end_lng, path))
+                if len(routes) == count:
+                    break
+            if not edges:
+                break
+            for edge in edges:
+                for slot in edge_slots[edge]:
+                    adj_cost[slot] *= penalty
+        return routes
+
+
+def _is_walkable(tags: dict) -> bool:
+    """보행 가능한 OSM 도로인지 확인"""
+    highway = tags.get("highway")
+    if highway is None or highway in EXCLUDED_HIGHWAYS:
+        return False
+    if tags.get("foot") in ("yes", "designated", "permissive"):
+        return True
+    if tags.get("foot") in ("no", "private") or tags.get("access") in ("no", "private"):
+        return False
+    return tags.get("area") != "yes"
+
+
+def load_road_graph(path: str, zones: ZoneArrays, model: RiskModel) -> RoadGraph:
+    """도로 그래프를 읽고 위험도 가중치 적용"""
+    graph = RoadGraph.load(path)
+    graph.set_risk_weights(zones, model)
+    return graph
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OSM 추출본으로 보행자 도로 그래프(.npz) 생성")
+    parser.add_argument("osm_path")
+    parser.add_argument("output_path")
+    args = parser.parse_args()
+
+    graph = RoadGraph.from_osm(args.osm_path)
+    graph.save(args.output_path)
+    print(f"노드 {graph.num_nodes}개, 간선 {graph.num_edges}개 저장: {args.output_path}")
@@ -0,0 +1,521 @@
+# route_index.py
+"""도로 그래프용 CCH(Customizable Contraction Hierarchy) 경로 탐색 인덱스
+
+오프라인 전처리에서 노드 제거 순서(좌표 기준 재귀 이분할)와 바로가기(shortcut) 구조를 만들고
+디렉터리에 .npy 파일로 저장한다. 서버는 이 파일들을 메모리 매핑으로 바로 읽고,
+위험도 가중 간선 비용으로 바로가기 비용만 계산(customization)한다.
+위험지역이 바뀌면 비용이 달라진 간선에서 위쪽으로 영향을 받는 바로가기만 다시 계산한다.
+
+전처리 (backend 디렉터리에서):
+    python route_index.py road_graph.npz route_index
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from risk_model import load_risk_model
+from road_graph import RoadGraph
+from zone_store import ZONE_DATA_PATH, load_zone_arrays
+
+# 바로가기 구조 파일 (메모리 매핑, 읽기 전용)
+TOPOLOGY_ARRAYS = (
+    "rank", "etree_parent", "up_indptr", "up_head", "arc_tail", "arc_level", "edge_arc",
+    "level_arc_indptr", "level_arcs",
+    "tri_xa", "tri_xb", "tri_ab", "level_offsets",
+    "target_indptr", "target_tri", "source_indptr", "source_tri",
+)
+# 간선 비용에 따라 달라지는 배열 (RouteIndex.metric 순서)
+METRIC_ARRAYS = ("base", "arc_edge", "weight")
+# 비용이 바뀐 바로가기가 이 비율을 넘으면 전체 재계산
+INCREMENTAL_LIMIT = 0.05
+# 재귀 이분할을 멈추는 구역 크기 (노드 수)
+DISSECTION_LEAF_SIZE = 32
+# 삼각형 열거/묶기/비용 계산을 나눠 처리하는 크기 (임시 배열 메모리 상한)
+TRIANGLE_CHUNK = 1 << 22
+
+
+def graph_fingerprint(graph: RoadGraph) -> str:
+    digest = hashlib.sha1()
+    for values in (graph.edge_u, graph.edge_v, graph.node_lat, graph.node_lng):
+        digest.update(np.ascontiguousarray(values).tobytes())
+    return digest.hexdigest()
+
+
+def _group(parts: List[np.ndarray], size: int, dtype=np.int64) -> Tuple[np.ndarray, np.ndarray]:
+    """키 배열들의 값별로 원소 인덱스(각 배열 안 위치)를 묶은 CSR (indptr, ids)
+
+    전체를 한 번에 정렬하지 않고 TRIANGLE_CHUNK 씩 나눠 제자리에 채운다 (키 순서 안에서는 입력 순서 유지).
+    """
+    counts = np.zeros(size, dtype=np.int64)
+    for keys in parts:
+        for start in range(0, len(keys), TRIANGLE_CHUNK):
+            counts += np.bincount(keys[start:start + TRIANGLE_CHUNK], minlength=size)
+    indptr = np.zeros(size + 1, dtype=np.int64)
+    np.cumsum(counts, out=indptr[1:])
+
+    ids = np.empty(int(indptr[-1]), dtype=dtype)
+    cursor = indptr[:-1].copy()
+    for keys in parts:
+        for start in range(0, len(keys), TRIANGLE_CHUNK):
+            chunk = keys[start:start + TRIANGLE_CHUNK]
+            order = np.argsort(chunk, kind="stable")
+            ordered = chunk[order]
+            # 같은 키 안에서의 순번 (각 원소 위치 - 그 키가 시작한 위치)
+            run_start = np.zeros(len(ordered), dtype=np.int64)
+            run_start[1:] = np.where(ordered[1:] != ordered[:-1], np.arange(1, len(ordered)), 0)
+            within = np.arange(len(ordered)) - np.maximum.accumulate(run_start)
+            ids[cursor[ordered] + within] = start + order
+            cursor += np.bincount(chunk, minlength=size)
+    return indptr, ids
+
+
+def _expand(indptr: np.ndarray, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """CSR 에서 ids 행들의 원소 위치와 각 위치가 속한 행 번호(ids 기준)"""
+    lo = np.asarray(indptr[ids])
+    lengths = np.asarray(indptr[ids + 1]) - lo
+    owner = np.repeat(np.arange(len(ids)), lengths)
+    starts = np.repeat(lo - (np.cumsum(lengths) - lengths), lengths)
+    return starts + np.arange(len(owner)), owner
+
+
+def dissection_order(graph: RoadGraph, leaf_size: int = DISSECTION_LEAF_SIZE) -> np.ndarray:
+    """좌표 기준 재귀 이분할(nested dissection) 노드 제거 순서
+
+    노드를 넓은 축의 중앙값으로 나누고 두 쪽을 잇는 간선의 한쪽 끝 노드(분리자)를
+    가장 나중에 제거한다. 평면에 가까운 도로망에서 바로가기 수와 탐색 범위가 작아진다.
+    """
+    n = graph.num_nodes
+    x = np.asarray(graph.node_lng) * math.cos(math.radians(float(np.mean(graph.node_lat)) if n else 0.0))
+    y = np.asarray(graph.node_lat)
+    keep = graph.edge_u != graph.edge_v
+    side = np.zeros(n, dtype=np.int8)
+    removed = np.zeros(n, dtype=bool)
+
+    # 분리자를 먼저 쌓고 마지막에 뒤집어 하위 구역이 먼저 제거되게 함
+    reverse_order = []
+    stack = [(np.arange(n, dtype=np.int64), graph.edge_u[keep], graph.edge_v[keep])]
+    while stack:
+        nodes, edge_u, edge_v = stack.pop()
+        if len(nodes) <= leaf_size or len(edge_u) == 0:
+            reverse_order.append(nodes)
+            continue
+
+        coords = x[nodes] if np.ptp(x[nodes]) >= np.ptp(y[nodes]) else y[nodes]
+        ordered = nodes[np.argsort(coords, kind="stable")]
+        half = len(ordered) // 2
+        side[ordered[:half]] = 0
+        side[ordered[half:]] = 1
+
+        # 경계 간선의 양 끝 중 더 적은 쪽을 분리자로 사용
+        cross = side[edge_u] != side[edge_v]
+        ends = np.concatenate([edge_u[cross], edge_v[cross]])
+        low, high = np.unique(ends[side[ends] == 0]), np.unique(ends[side[ends] == 1])
+        separator = low if len(low) <= len(high) else high
+        removed[separator] = True
+        reverse_order.append(separator)
+
+        inner = ~(removed[edge_u] | removed[edge_v])
+        for part in (0, 1):
+            members = ordered[:half] if part == 0 else ordered[half:]
+            members = members[~removed[members]]
+            if len(members):
+                mask = inner & (side[edge_u] == part) & (side[edge_v] == part)
+                stack.append((members, edge_u[mask], edge_v[mask]))
+
+    return np.concatenate(reverse_order[::-1]) if reverse_order else np.zeros(0, dtype=np.int64)
+
+
+def build_topology(graph: RoadGraph) -> dict:
+    """노드 제거 순서와 바로가기/삼각형 구조 계산 (간선 비용과 무관)
+
+    fill-in 은 소거 트리를 따라 계산한다: 노드의 위쪽 이웃 = 원래 위쪽 이웃 ∪ 소거 트리 자식들의
+    위쪽 이웃 (자신 제외). 이웃 목록은 순위 배열로만 들고, 삼각형은 레벨 순서로 TRIANGLE_CHUNK 씩
+    만들어 미리 잡은 결과 배열에 채우므로 메모리는 결과 크기 + 조각 크기로 제한된다.
+    """
+    n = graph.num_nodes
+    order = dissection_order(graph)
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n)
+
+    # 원래 간선의 위쪽 이웃 (순위 공간, 꼬리 순위별 CSR, 머리 순위 오름차순)
+    valid = graph.edge_u != graph.edge_v
+    ru, rv = rank[graph.edge_u[valid]], rank[graph.edge_v[valid]]
+    pair_keys = np.unique(np.minimum(ru, rv) * n + np.maximum(ru, rv))
+    own_tail, own_head = pair_keys // n, pair_keys % n
+    own_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(own_tail, minlength=n), out=own_indptr[1:])
+    own_indptr = own_indptr.tolist()
+
+    # 순서대로 노드를 제거하며 남은 이웃끼리 연결(fill-in)
+    # 노드 레벨: 아래쪽 이웃 레벨 + 1 (같은 레벨의 삼각형은 서로 독립적으로 계산 가능)
+    up_rank: List[np.ndarray] = [None] * n
+    pending = {}
+    level_by_rank = np.zeros(n, dtype=np.int64)
+    for k in range(n):
+        own = own_head[own_indptr[k]:own_indptr[k + 1]]
+        children = pending.pop(k, None)
+        upper = np.unique(np.concatenate([own, *children])) if children else own
+        up_rank[k] = upper
+        if len(upper):
+            # 가장 낮은 위쪽 이웃이 소거 트리 부모, 나머지 이웃은 부모의 위쪽 이웃이 됨
+            pending.setdefault(int(upper[0]), []).append(upper[1:])
+            level_by_rank[upper] = np.maximum(level_by_rank[upper], level_by_rank[k] + 1)
+    del pending
+
+    # 위쪽 바로가기: 노드별 상위 이웃을 순위순으로 CSR 저장
+    lengths = np.array([len(up_rank[k]) for k in rank.tolist()], dtype=np.int64)
+    up_indptr = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(lengths, out=up_indptr[1:])
+    num_arcs = int(up_indptr[-1])
+    up_head = order[np.concatenate([up_rank[k] for k in rank.tolist()])] if num_arcs else np.zeros(0, dtype=np.int64)
+    arc_tail = np.repeat(np.arange(n, dtype=np.int64), lengths)
+    del up_rank
+
+    etree_parent = np.full(n, -1, dtype=np.int64)
+    has_up = lengths > 0
+    etree_parent[has_up] = up_head[up_indptr[:-1][has_up]]
+    level = level_by_rank[rank]
+
+    # 바로가기 (a, b) 번호 찾기: (꼬리 노드, 머리 순위) 키는 CSR 순서 그대로 정렬되어 있으므로 이진 탐색
+    arc_keys = arc_tail * n + rank[up_head]
+
+    def arc_of(tails: np.ndarray, heads: np.ndarray) -> np.ndarray:
+        return np.searchsorted(arc_keys, tails * n + rank[heads])
+
+    # 하위 삼각형 (x, a, b): 바로가기 (a, b) 후보 비용 = w(x, a) + w(x, b)
+    # 노드를 레벨 순서로 훑으며 만들면 삼각형이 레벨별로 모여 있음
+    num_triangles = int((lengths * (lengths - 1) // 2).sum())
+    dtype = np.int32 if max(num_arcs, 2 * num_triangles) < 2 ** 31 else np.int64
+    tri_xa = np.empty(num_triangles, dtype=dtype)
+    tri_xb = np.empty(num_triangles, dtype=dtype)
+    tri_ab = np.empty(num_triangles, dtype=dtype)
+    pairs = {}
+    filled = 0
+    chunk_a, chunk_b, chunk_size = [], [], 0
+
+    def flush():
+        nonlocal filled, chunk_a, chunk_b, chunk_size
+        if chunk_size:
+            xa, xb = np.concatenate(chunk_a), np.concatenate(chunk_b)
+            tri_xa[filled:filled + chunk_size] = xa
+            tri_xb[filled:filled + chunk_size] = xb
+            tri_ab[filled:filled + chunk_size] = arc_of(up_head[xa], up_head[xb])
+            filled += chunk_size
+        chunk_a, chunk_b, chunk_size = [], [], 0
+
+    by_level = np.argsort(level, kind="stable")
+    for x, m, offset in zip(by_level.tolist(), lengths[by_level].tolist(), up_indptr[by_level].tolist()):
+        if m > 1:
+            if m not in pairs:
+                pairs[m] = np.triu_indices(m, 1)
+            i, j = pairs[m]
+            chunk_a.append(offset + i)
+            chunk_b.append(offset + j)
+            chunk_size += len(i)
+            if chunk_size >= TRIANGLE_CHUNK:
+                flush()
+    flush()
+
+    # 레벨별 삼각형 시작 위치
+    levels = int(level[lengths > 1].max()) + 1 if num_triangles else 0
+    per_level = np.zeros(levels, dtype=np.int64)
+    np.add.at(per_level, level[lengths > 1], (lengths * (lengths - 1) // 2)[lengths > 1])
+    level_offsets = np.zeros(levels + 1, dtype=np.int64)
+    np.cumsum(per_level, out=level_offsets[1:])
+
+    arc_level = level[arc_tail]
+    level_arc_indptr, level_arcs = _group([arc_level], int(arc_level.max()) + 1 if num_arcs else 0)
+    target_indptr, target_tri = _group([tri_ab], num_arcs, dtype)
+    source_indptr, source_tri = _group([tri_xa, tri_xb], num_arcs, dtype)
+
+    # 원래 간선 -> 순위가 낮은 끝점에서 출발하는 바로가기
+    edge_arc = np.full(graph.num_edges, -1, dtype=np.int64)
+    valid = np.nonzero(valid)[0]
+    u, v = graph.edge_u[valid].astype(np.int64), graph.edge_v[valid].astype(np.int64)
+    lower = rank[u] < rank[v]
+    edge_arc[valid] = arc_of(np.where(lower, u, v), np.where(lower, v, u))
+
+    return {
+        "rank": rank,
+        "etree_parent": etree_parent,
+        "up_indptr": up_indptr,
+        "up_head": up_head,
+        "arc_tail": arc_tail,
+        "arc_level": arc_level,
+        "edge_arc": edge_arc,
+        "level_arc_indptr": level_arc_indptr,
+        "level_arcs": level_arcs,
+        "tri_xa": tri_xa,
+        "tri_xb": tri_xb,
+        "tri_ab": tri_ab,
+        "level_offsets": level_offsets,
+        "target_indptr": target_indptr,
+        "target_tri": target_tri,
+        "source_indptr": source_indptr,
+        "source_tri": source_tri,
+    }
+
+
+class RouteIndex:
+    """CCH 기반 경로 탐색 (RoadGraph.route 와 같은 결과 형식)"""
+
+    def __init__(self, graph: RoadGraph, topology: dict, fingerprint: Optional[str] = None):
+        self.graph = graph
+        self.fingerprint = fingerprint or graph_fingerprint(graph)
+        for name in TOPOLOGY_ARRAYS:
+            setattr(self, name, topology[name])
+        self.num_arcs = len(self.up_head)
+        self._etree_parent = np.asarray(self.etree_parent).tolist()
+        # 소거 트리 깊이 (조상 경로 안 위치 = 출발 노드 깊이 - 조상 깊이)
+        depth = [0] * graph.num_nodes
+        for v in np.argsort(-np.asarray(self.rank), kind="stable").tolist():
+            parent = self._etree_parent[v]
+            if parent != -1:
+                depth[v] = depth[parent] + 1
+        self._depth = depth
+        self._depth_array = np.array(depth, dtype=np.int64)
+
+        # (바로가기 기본 비용, 바로가기 -> 간선 번호, 바로가기 비용)
+        # customize 가 새 튜플로 한 번에 바꾸고, 탐색은 처음 읽은 튜플만 끝까지 씀
+        self.metric = (
+            np.full(self.num_arcs, np.inf),
+            np.full(self.num_arcs, -1, dtype=np.int64),
+            np.full(self.num_arcs, np.inf),
+        )
+
+    # ---- 저장/불러오기 ----
+
+    @classmethod
+    def build(cls, graph: RoadGraph) -> "RouteIndex":
+        index = cls(graph, build_topology(graph))
+        index.customize(graph.edge_cost, incremental=False)
+        return index
+
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        for name in TOPOLOGY_ARRAYS:
+            np.save(os.path.join(path, f"{name}.npy"), np.asarray(getattr(self, name)))
+        for name, values in zip(METRIC_ARRAYS, self.metric):
+            np.save(os.path.join(path, f"{name}.npy"), values)
+        with open(os.path.join(path, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump({"graph": self.fingerprint, "num_arcs": self.num_arcs,
+                       "num_triangles": len(self.tri_ab)}, f)
+
+    @classmethod
+    def load(cls, path: str, graph: RoadGraph) -> "RouteIndex":
+        """저장된 인덱스를 메모리 매핑으로 읽고 현재 간선 비용으로 보정"""
+        with open(os.path.join(path, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        fingerprint = graph_fingerprint(graph)
+        if meta["graph"] != fingerprint:
+            raise ValueError("경로 인덱스가 현재 도로 그래프와 맞지 않습니다. route_index.py 로 다시 생성하세요.")
+
+        topology = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in TOPOLOGY_ARRAYS}
+        index = cls(graph, topology, fingerprint)
+        # 저장 당시 비용에서 시작해 달라진 간선만 반영
+        index.metric = tuple(np.load(os.path.join(path, f"{name}.npy")) for name in METRIC_ARRAYS)
+        index.customize(graph.edge_cost)
+        return index
+
+    # ---- 비용 계산 (customization) ----
+
+    def _base_weights(self, edge_cost: np.ndarray):
+        """간선 비용 -> 바로가기 기본 비용 (평행 간선은 최소 비용, 해당 간선 번호)"""
+        valid = np.nonzero(np.asarray(self.edge_arc) >= 0)[0]
+        arcs = np.asarray(self.edge_arc)[valid]
+        order = np.lexsort((edge_cost[valid], arcs))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = arcs[order][1:] != arcs[order][:-1]
+
+        base = np.full(self.num_arcs, np.inf)
+        arc_edge = np.full(self.num_arcs, -1, dtype=np.int64)
+        chosen = valid[order[first]]
+        base[arcs[order[first]]] = edge_cost[chosen]
+        arc_edge[arcs[order[first]]] = chosen
+        return base, arc_edge
+
+    def customize(self, edge_cost: np.ndarray, incremental: bool = True) -> int:
+        """간선 비용 반영, 다시 계산한 바로가기 수 반환"""
+        old_base, old_arc_edge, old_weight = self.metric
+        base, arc_edge = self._base_weights(np.asarray(edge_cost, dtype=np.float64))
+        changed = np.nonzero(base != old_base)[0]
+        if incremental and len(changed) == 0 and np.array_equal(arc_edge, old_arc_edge):
+            return 0
+
+        if incremental and len(changed) <= INCREMENTAL_LIMIT * self.num_arcs:
+            weight, count = self._customize_incremental(old_weight, base, changed)
+        else:
+            weight, count = self._customize_full(base), self.num_arcs
+
+        # 탐색 중인 요청이 서로 다른 버전의 배열을 섞어 보지 않도록 튜플 하나로 교체
+        self.metric = (base, arc_edge, weight)
+        return count
+
+    def _customize_full(self, base: np.ndarray) -> np.ndarray:
+        weight = base.copy()
+        for level in range(len(self.level_offsets) - 1):
+            # 같은 레벨의 삼각형은 서로 독립적이므로 조각으로 나눠 계산해도 결과가 같음
+            for lo in range(int(self.level_offsets[level]), int(self.level_offsets[level + 1]), TRIANGLE_CHUNK):
+                hi = min(lo + TRIANGLE_CHUNK, int(self.level_offsets[level + 1]))
+                xa, xb = self.tri_xa[lo:hi], self.tri_xb[lo:hi]
+                np.minimum.at(weight, self.tri_ab[lo:hi], weight[xa] + weight[xb])
+        return weight
+
+    def _customize_incremental(self, old_weight: np.ndarray, base: np.ndarray, changed: np.ndarray):
+        """기본 비용이 바뀐 바로가기에서 위쪽으로 영향받는 바로가기만 레벨 순서로 재계산"""
+        weight = old_weight.copy()
+        dirty = np.zeros(self.num_arcs, dtype=bool)
+        dirty[changed] = True
+        count = 0
+        if len(changed) == 0:
+            return weight, count
+
+        # 레벨 L 바로가기의 하위 삼각형은 모두 L 보다 낮은 레벨의 바로가기로만 이루어짐
+        for level in range(int(self.arc_level[changed].min()), len(self.level_arc_indptr) - 1):
+            arcs = self.level_arcs[self.level_arc_indptr[level]:self.level_arc_indptr[level + 1]]
+            arcs = arcs[dirty[arcs]]
+            if len(arcs) == 0:
+                continue
+            count += len(arcs)
+
+            values = base[arcs]
+            positions, owner = _expand(self.target_indptr, arcs)
+            if len(positions):
+                triangles = self.target_tri[positions]
+                np.minimum.at(values, owner, weight[self.tri_xa[triangles]] + weight[self.tri_xb[triangles]])
+            updated = arcs[values != weight[arcs]]
+            weight[arcs] = values
+
+            # 비용이 바뀐 바로가기를 아래 변으로 쓰는 윗변 표시
+            if len(updated):
+                positions, _ = _expand(self.source_indptr, updated)
+                dirty[self.tri_ab[self.source_tri[positions]]] = True
+        return weight, count
+
+    # ---- 경로 탐색 ----
+
+    def _upward(self, source: int, weight: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """소거 트리 조상만 따라가는 위쪽 탐색 (조상 노드, 거리, 직전 바로가기)
+
+        위쪽 바로가기는 모두 조상 노드로 향하므로, 조상 경로(탐색 공간)에서 나가는 바로가기만
+        모아 조상 순서대로 완화한다. 배열 크기는 조상 수와 그 바로가기 수로 제한된다.
+        """
+        ancestors = [source]
+        while self._etree_parent[ancestors[-1]] != -1:
+            ancestors.append(self._etree_parent[ancestors[-1]])
+        ancestors = np.array(ancestors, dtype=np.int64)
+        size = len(ancestors)
+
+        # 조상에서 나가는 바로가기 (조상 순서대로 이어 붙임)와 머리 노드의 조상 경로 안 위치
+        positions, owner = _expand(self.up_indptr, ancestors)
+        heads = self._depth[source] - self._depth_array[self.up_head[positions]]
+        costs = weight[positions]
+        bounds = np.searchsorted(owner, np.arange(size + 1)).tolist()
+
+        distance = np.full(size, np.inf)
+        distance[0] = 0.0
+        for i in range(size - 1):
+            lo, hi = bounds[i], bounds[i + 1]
+            if lo < hi:
+                targets = heads[lo:hi]
+                distance[targets] = np.minimum(distance[targets], costs[lo:hi] + distance[i])
+
+        # 직전 바로가기: 거리를 그대로 만드는 바로가기 (항상 더 아래 조상에서 오므로 출발 노드까지 이어짐)
+        tight = np.nonzero(distance[owner] + costs == distance[heads])[0][::-1]
+        parent = np.full(size, -1, dtype=np.int64)
+        parent[heads[tight]] = positions[tight]
+        return ancestors, distance, parent
+
+    def _unpack(self, arc: int, forward: bool, metric: tuple) -> List[Tuple[int, int]]:
+        """바로가기를 원래 간선 (출발 노드, 간선) 목록으로 풀기 (metric 은 탐색에 쓴 self.metric)"""
+        base, arc_edge, weight = metric
+        result = []
+        stack = [(arc, forward)]
+        while stack:
+            k, forward = stack.pop()
+            tail, head = int(self.arc_tail[k]), int(self.up_head[k])
+            if base[k] == weight[k]:
+                result.append((tail if forward else head, int(arc_edge[k])))
+                continue
+            lo, hi = self.target_indptr[k], self.target_indptr[k + 1]
+            for t in self.target_tri[lo:hi].tolist():
+                xa, xb = int(self.tri_xa[t]), int(self.tri_xb[t])
+                if weight[xa] + weight[xb] == weight[k]:
+                    break
+            else:
+                raise RuntimeError(f"바로가기 {k} 를 풀 수 없습니다.")
+            # (a -> b) = (a -> x) + (x -> b), 스택이므로 나중 구간부터 넣음
+            if forward:
+                stack.append((xb, True))
+                stack.append((xa, False))
+            else:
+                stack.append((xa, True))
+                stack.append((xb, False))
+        return result
+
+    def shortest_path(self, source: int, target: int) -> Optional[List[Tuple[int, int]]]:
+        """최적 경로 (출발 노드, 간선) 목록 - 연결되지 않으면 None"""
+        if source == target:
+            return []
+        # 탐색 도중 customize 로 비용이 바뀌어도 같은 버전의 배열만 사용
+        metric = self.metric
+        weight = metric[2]
+        forward_nodes, forward, forward_parent = self._upward(source, weight)
+        backward_nodes, backward, backward_parent = self._upward(target, weight)
+
+        # 두 조상 경로가 만나는 노드 중 합이 최소인 곳
+        common, fi, bi = np.intersect1d(forward_nodes, backward_nodes, return_indices=True)
+        if len(common) == 0:
+            return None
+        totals = forward[fi] + backward[bi]
+        best = int(np.argmin(totals))
+        if totals[best] == math.inf:
+            return None
+
+        path = []
+        position = {v: i for i, v in enumerate(forward_nodes.tolist())}
+        i = int(fi[best])
+        while i != 0:
+            k = int(forward_parent[i])
+            path[:0] = self._unpack(k, True, metric)
+            i = position[int(self.arc_tail[k])]
+        position = {v: i for i, v in enumerate(backward_nodes.tolist())}
+        i = int(bi[best])
+        while i != 0:
+            k = int(backward_parent[i])
+            path.extend(self._unpack(k, False, metric))
+            i = position[int(self.arc_tail[k])]
+        return path
+
+    def route(self, start_lat: float, start_lng: float, end_lat: float, end_lng: float):
+        """위험도 가중 최적 경로 (경유 좌표 목록, 총 길이 km) - 연결되지 않으면 None"""
+        if self.graph.num_nodes == 0:
+            return None
+        source = self.graph.nearest_node(start_lat, start_lng)
+        target = self.graph.nearest_node(end_lat, end_lng)
+        path = self.shortest_path(source, target)
+        if path is None:
+            return None
+        return self.graph.path_waypoints(start_lat, start_lng, end_lat, end_lng, path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="도로 그래프 CCH 경로 인덱스 전처리")
+    parser.add_argument("graph_path", help="road_graph.py 로 만든 .npz (또는 .osm)")
+    parser.add_argument("output_dir")
+    parser.add_argument("--zones", default=ZONE_DATA_PATH, help="위험지역 데이터 파일 (기본: ZONE_DATA_PATH, 없으면 더미 데이터)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    graph = RoadGraph.load(args.graph_path)
+    graph.set_risk_weights(load_zone_arrays(args.zones), load_risk_model())
+    index = RouteIndex.build(graph)
+    index.save(args.output_dir)
+    print(f"바로가기 {index.num_arcs}개, 삼각형 {len(index.tri_ab)}개 저장: {args.output_dir} "
+          f"({time.perf_counter() - start:.1f}s)")
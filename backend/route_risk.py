@@ -0,0 +1,121 @@
+# route_risk.py
+"""경로 위험 노출도 채점과 대안 경로 순위
+
+경로를 ROUTE_SAMPLE_SPACING_M 간격의 표본점으로 나누고, 여러 경로의 표본점을 이어 붙여
+위험도 모델(RiskModel.score)로 한 번에 채점한다. 두 값 모두 0~1 범위다.
+
+    표본점 위험도 = model.score(표본점)   (/predict-risk, 타일, 도로 간선 비용과 같은 값)
+    경로 노출도   = Σ 표본점 위험도 x 표본점이 대표하는 길이(km) / 경로 길이(km)
+                    (길이 가중 평균 위험도)
+
+대안 경로는 소요 시간과 노출도를 후보 안에서 각각 0~1 로 정규화한 뒤
+(1 - risk_tradeoff) x 시간 + risk_tradeoff x 노출도 가 작은 순으로 고른다.
+"""
+import math
+import os
+
+import numpy as np
+
+from risk import KM_PER_DEGREE, ZoneArrays, haversine_np
+from risk_model import RiskModel
+
+ROUTE_SAMPLE_SPACING_M = float(os.getenv("ROUTE_SAMPLE_SPACING_M", "25"))
+# 예상 소요 시간 계산 속도 (estimate_travel_time 과 같은 값)
+ROUTE_SPEED_KMH = 30.0
+MAX_ROUTE_ALTERNATIVES = 5
+# 도로 그래프가 없을 때 대안 후보로 쓰는 우회 거리 (출발-도착 중점에서 좌우로, km)
+DETOUR_OFFSETS_KM = (0.5, 1.0, 2.0)
+
+
+def densify(lats: np.ndarray, lngs: np.ndarray, spacing_km: float) -> tuple:
+    """경로 좌표 -> (표본 위도, 표본 경도, 표본별 대표 길이 km)
+
+    각 구간을 spacing_km 이하의 같은 길이 조각으로 나누고 조각 중점을 표본으로 쓴다.
+    """
+    if len(lats) < 2:
+        return np.empty(0), np.empty(0), np.empty(0)
+    segment = haversine_np(lats[:-1], lngs[:-1], lats[1:], lngs[1:])
+    counts = np.maximum(1, np.ceil(segment / spacing_km)).astype(np.int64)
+    owner = np.repeat(np.arange(len(segment)), counts)
+    step = np.arange(len(owner)) - np.repeat(np.cumsum(counts) - counts, counts)
+    t = (step + 0.5) / counts[owner]
+    sample_lat = lats[owner] + (lats[owner + 1] - lats[owner]) * t
+    sample_lng = lngs[owner] + (lngs[owner + 1] - lngs[owner]) * t
+    return sample_lat, sample_lng, (segment / counts)[owner]
+
+
+def score_routes(routes: list, zones: ZoneArrays, model: RiskModel, spacing_m: float = ROUTE_SAMPLE_SPACING_M) -> list:
+    """경유 좌표 목록({"lat", "lng"} 딕셔너리) 여러 개를 한 번에 채점
+
+    -> [{"distance": km, "minutes": 분, "risk_exposure": 길이 가중 평균 위험도(0~1),
+         "peak_risk": 최대 표본점 위험도(0~1)}, ...]
+    """
+    if not routes:
+        return []
+    sample_lat, sample_lng, weights, owners = [], [], [], []
+    for number, waypoints in enumerate(routes):
+        lats = np.array([point["lat"] for point in waypoints], dtype=np.float64)
+        lngs = np.array([point["lng"] for point in waypoints], dtype=np.float64)
+        route_lat, route_lng, route_weights = densify(lats, lngs, spacing_m / 1000)
+        sample_lat.append(route_lat)
+        sample_lng.append(route_lng)
+        weights.append(route_weights)
+        owners.append(np.full(len(route_lat), number, dtype=np.int64))
+
+    sample_lat, sample_lng = np.concatenate(sample_lat), np.concatenate(sample_lng)
+    weights, owners = np.concatenate(weights), np.concatenate(owners)
+    exposure = model.score(sample_lat, sample_lng, zones) if len(sample_lat) else np.empty(0)
+
+    count = len(routes)
+    distance = np.bincount(owners, weights=weights, minlength=count)
+    total = np.bincount(owners, weights=exposure * weights, minlength=count)
+    mean = np.divide(total, distance, out=np.zeros(count), where=distance > 0)
+    peak = np.zeros(count)
+    np.maximum.at(peak, owners, exposure)
+    return [
+        {
+            "distance": float(distance[i]),
+            "minutes": float(distance[i]) / ROUTE_SPEED_KMH * 60,
+            "risk_exposure": round(float(mean[i]), 6),
+            "peak_risk": round(float(peak[i]), 6),
+        }
+        for i in range(count)
+    ]
+
+
+def _normalize(values: np.ndarray) -> np.ndarray:
+    span = values.max() - values.min()
+    return (values - values.min()) / span if span > 0 else np.zeros(len(values))
+
+
+def rank_routes(scores: list, risk_tradeoff: float) -> tuple:
+    """score_routes 결과의 (좋은 순 인덱스, 인덱스별 비용) - 시간/노출도 모두 같은 후보는 하나만 남김"""
+    minutes = np.array([score["minutes"] for score in scores])
+    exposure = np.array([score["risk_exposure"] for score in scores])
+    cost = (1 - risk_tradeoff) * _normalize(minutes) + risk_tradeoff * _normalize(exposure)
+
+    order, seen = [], set()
+    for i in np.lexsort((exposure, minutes, cost)).tolist():
+        key = (round(scores[i]["distance"], 3), round(scores[i]["risk_exposure"], 3))
+        if key in seen:
+            continue
+        seen.add(key)
+        order.append(i)
+    return order, cost.tolist()
+
+
+def offset_waypoints(start_lat: float, start_lng: float, end_lat: float, end_lng: float, offset_km: float) -> list:
+    """출발-도착 중점을 진행 방향 왼쪽(+)/오른쪽(-)으로 offset_km 옮긴 점을 지나는 경로"""
+    mid_lat, mid_lng = (start_lat + end_lat) / 2, (start_lng + end_lng) / 2
+    cos_lat = max(math.cos(math.radians(mid_lat)), 1e-6)
+    # 중점 기준 평면 좌표(km)에서 진행 방향의 수직 단위 벡터
+    dx, dy = (end_lng - start_lng) * cos_lat * KM_PER_DEGREE, (end_lat - start_lat) * KM_PER_DEGREE
+    length = math.hypot(dx, dy)
+    if length == 0:
+        return [{"lat": start_lat, "lng": start_lng}, {"lat": end_lat, "lng": end_lng}]
+    nx, ny = -dy / length, dx / length
+    via = {
+        "lat": mid_lat + ny * offset_km / KM_PER_DEGREE,
+        "lng": mid_lng + nx * offset_km / (KM_PER_DEGREE * cos_lat),
+    }
+    return [{"lat": start_lat, "lng": start_lng}, via, {"lat": end_lat, "lng": end_lng}]
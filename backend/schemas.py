@@ -30,6 +30,12 @@ class RiskResponse(BaseModel):
     risk_score: float
     risk_level: str
     message: str
+    zone_version: Optional[int] = None
+
+class BatchRiskResponse(BaseModel):
+    results: List[RiskResponse]
+    total_count: int
+    zone_version: Optional[int] = None
 
 class RouteRequest(BaseModel):
     start_latitude: float
@@ -54,3 +60,38 @@ class RouteResponse(BaseModel):
     route_type: str  # "direct" or "safe_detour"
     avoided_zones: List[DangerousZone]
     message: str
+    zone_version: Optional[int] = None
+    risk_exposure: Optional[float] = None  # 경로 길이 가중 평균 위험도 0~1 (route_risk.score_routes)
+    peak_risk: Optional[float] = None  # 경로상 최대 표본점 위험도 0~1
+
+class RouteAlternativesRequest(RouteRequest):
+    alternatives: int = 3  # 돌려줄 경로 수 (최대 route_risk.MAX_ROUTE_ALTERNATIVES)
+    risk_tradeoff: float = 0.5  # 0 = 가장 빠른 경로 우선, 1 = 가장 안전한 경로 우선
+
+class RouteOption(BaseModel):
+    waypoints: List[Waypoint]
+    distance: float
+    estimated_time: int  # 분
+    route_type: str  # "direct", "safe_detour", "offset_detour", "road"
+    risk_exposure: float
+    peak_risk: float
+    tradeoff_cost: float  # 후보 내 정규화한 시간/노출도 가중합 (작을수록 좋음)
+
+class RouteAlternativesResponse(BaseModel):
+    routes: List[RouteOption]
+    risk_tradeoff: float
+    zone_version: Optional[int] = None
+
+class PredictionHistoryItem(BaseModel):
+    id: int
+    latitude: float
+    longitude: float
+    risk_score: float
+    prediction_date: datetime
+    
+    class Config:
+        from_attributes = True
+
+class PredictionHistoryResponse(BaseModel):
+    items: List[PredictionHistoryItem]
+    next_cursor: Optional[str] = None
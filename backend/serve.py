@@ -0,0 +1,129 @@
+# serve.py
+"""운영용 다중 워커 실행기 (pre-fork)
+
+부모 프로세스가 main 모듈을 한 번만 import 해서 공유 캐시(shared_cache.SharedCache)를 만들고,
+main.load_resources() 로 위험지역 데이터, 공간 인덱스, 도로 그래프, 경로 인덱스, 위험도 모델과
+지오펜스를 만든 뒤 --workers 개로 fork 한다.
+워커들은 이 객체들을 copy-on-write 로 공유하므로 메모리는 워커 수만큼 늘지 않고,
+캐시는 모든 워커가 같은 공유 메모리를 쓴다.
+(uvicorn --workers 는 워커마다 main 을 새로 import 하므로 데이터와 캐시가 워커 수만큼 생긴다.)
+
+부모는 요청을 받지 않고 리슨 소켓만 열어 워커에 넘겨주며, 비정상 종료한 워커를 다시 띄운다.
+SIGTERM/SIGINT 를 받으면 모든 워커에 SIGTERM 을 보내 진행 중인 요청과 shutdown 훅을 마치게 한다.
+
+사용법 (backend 디렉터리에서):
+    python serve.py --workers 4 --port 8000
+"""
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+import time
+
+# fork 전에 만들어야 워커 간에 공유되므로 main import 전에 설정
+os.environ.setdefault("CACHE_BACKEND", "shared")
+
+import uvicorn  # noqa: E402
+
+from structured_log import get_logger, start_logging, stop_logging  # noqa: E402
+
+log = get_logger("serve")
+
+# 워커가 이 시간 안에 죽으면 다시 띄우기 전에 잠시 기다림 (시작 직후 반복 실패 시 과부하 방지)
+RESTART_BACKOFF = 1.0  # 초
+
+
+def preload():
+    """워커들이 물려받을 상태를 부모에서 한 번 생성"""
+    import database
+    import main
+
+    # 워커 startup 훅에서도 호출하지만 이미 만든 자원은 건너뛰므로, 여기서 만든 객체를 모든 워커가 공유
+    main.init_schema()
+    main.load_resources()
+    # fork 후 부모/자식이 같은 DB 연결을 쓰지 않도록 스키마 생성에 쓴 연결을 닫음
+    database.engine.dispose()
+    # 미리 만든 객체를 GC 추적 대상에서 빼서, 워커의 GC 가 참조 정보를 건드려 공유 페이지가 복사되지 않게 함
+    gc.collect()
+    gc.freeze()
+    return main.app
+
+
+def run_worker(app, sock: socket.socket, log_level: str):
+    """워커 프로세스 본체 (uvicorn 이 자체 시그널 처리와 lifespan 훅을 실행)"""
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    config = uvicorn.Config(app, log_level=log_level, lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def spawn(app, sock: socket.socket, log_level: str) -> int:
+    # 로그 쓰기 스레드는 fork 로 복사되지 않으므로 멈췄다가 부모에서만 다시 시작 (워커는 startup 훅에서 시작)
+    stop_logging()
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            run_worker(app, sock, log_level)
+        except BaseException:
+            code = 1
+        finally:
+            os._exit(code)
+    start_logging()
+    return pid
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.getenv("WEB_CONCURRENCY", str(os.cpu_count() or 1))))
+    parser.add_argument("--backlog", type=int, default=2048)
+    parser.add_argument("--log-level", default="warning")
+    args = parser.parse_args()
+
+    sock = socket.create_server((args.host, args.port), backlog=args.backlog)
+    app = preload()
+
+    workers = {}  # pid -> 시작 시각
+    for _ in range(args.workers):
+        workers[spawn(app, sock, args.log_level)] = time.monotonic()
+    log.info("workers_started", workers=sorted(workers), host=args.host, port=args.port)
+
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in workers:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    while workers:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        started = workers.pop(pid, None)
+        if started is None or stopping:
+            continue
+        log.warning("worker_exited", pid=pid, exit_code=os.waitstatus_to_exitcode(status))
+        if time.monotonic() - started < RESTART_BACKOFF:
+            time.sleep(RESTART_BACKOFF)
+        if not stopping:
+            workers[spawn(app, sock, args.log_level)] = time.monotonic()
+
+    sock.close()
+    log.info("workers_stopped")
+    stop_logging()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
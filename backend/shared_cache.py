@@ -0,0 +1,167 @@
+# shared_cache.py
+"""여러 워커 프로세스가 함께 쓰는 공유 메모리 캐시
+
+serve.py 가 워커를 fork 하기 전에 만든 익명 공유 메모리(mmap)를 모든 워커가 물려받아 사용한다.
+워커마다 따로 캐시를 두면 메모리는 워커 수만큼 늘고 적중률은 워커 수만큼 나뉘지만,
+공유 캐시는 한 워커가 계산한 결과를 다른 워커도 바로 재사용한다.
+
+구조: 고정 크기 칸(slot_bytes)으로 된 집합 연관(set-associative) 해시 테이블
+- 키는 pickle 후 blake2b 16바이트 다이제스트로 묶음(bucket, WAYS 칸)을 고른다.
+- 값은 pickle 해서 칸에 저장하며, slot_bytes 보다 크면 저장하지 않는다(oversize).
+- 묶음이 가득 차면 가장 오래 사용하지 않은 칸을 덮어쓴다 (묶음 단위 LRU).
+- clear() 는 세대(generation) 번호만 올려 기존 칸을 모두 무효화한다.
+- 묶음별 잠금은 LOCK_STRIPES 개 프로세스 간 잠금을 나눠 쓴다.
+
+헤더(다이제스트/세대/길이/만료/사용 시각)와 값은 별도 영역에 두어, 크기 집계 시 헤더만 읽고
+값 영역은 실제로 저장한 칸의 페이지만 메모리를 차지한다.
+
+TTLCache / MemoryLRUCache 와 같은 get/set/delete/clear/stats 를 제공한다.
+fork 없이 쓰면 프로세스 내 캐시와 동일하게 동작한다.
+"""
+import hashlib
+import math
+import mmap
+import multiprocessing
+import os
+import pickle
+import struct
+import time
+from typing import Any, Hashable, Optional
+
+import numpy as np
+
+# local: 워커별 프로세스 내 캐시 / shared: 공유 메모리 캐시 (serve.py 로 fork 할 때 의미 있음)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "local")
+
+WAYS = 8
+LOCK_STRIPES = 64
+
+# 칸 헤더: 키 다이제스트, 세대, 값 길이, 만료 시각, 마지막 사용 시각 (time.monotonic 은 프로세스 간 공통)
+_HEADER = struct.Struct("<16sIIdd")
+_HEADER_DTYPE = np.dtype([
+    ("digest", "V16"), ("generation", "<u4"), ("length", "<u4"), ("expires", "<f8"), ("used", "<f8"),
+])
+_GENERATION = struct.Struct("<I")
+# 칸 1개당 값 외의 고정 비용 (메모리 예산 -> 칸 수 환산용)
+SLOT_HEADER_BYTES = _HEADER.size
+
+
+class SharedCache:
+    """프로세스 간 공유 TTL + 묶음 단위 LRU 캐시 (fork 전에 생성해야 공유됨)"""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None, slot_bytes: int = 1024):
+        self.buckets = max(1, math.ceil(maxsize / WAYS))
+        self.maxsize = self.buckets * WAYS
+        self.ttl = ttl
+        self.slot_bytes = slot_bytes
+        self._headers = mmap.mmap(-1, self.maxsize * _HEADER.size)
+        self._values = mmap.mmap(-1, self.maxsize * slot_bytes)
+        self._control = mmap.mmap(-1, _GENERATION.size)
+        _GENERATION.pack_into(self._control, 0, 1)
+        context = multiprocessing.get_context("fork")
+        self._locks = [context.Lock() for _ in range(min(LOCK_STRIPES, self.buckets))]
+        self._clear_lock = context.Lock()
+        # 적중/실패 횟수는 워커별 (/metrics 도 워커별로 수집됨)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.oversize = 0
+
+    def __len__(self):
+        headers = np.frombuffer(self._headers, dtype=_HEADER_DTYPE)
+        live = (headers["generation"] == self._generation()) & (headers["expires"] > time.monotonic())
+        return int(np.count_nonzero(live))
+
+    def _generation(self) -> int:
+        return _GENERATION.unpack_from(self._control, 0)[0]
+
+    def _locate(self, key: Hashable) -> tuple:
+        """(다이제스트, 묶음 첫 칸 번호, 잠금)"""
+        digest = hashlib.blake2b(pickle.dumps(key, protocol=pickle.HIGHEST_PROTOCOL), digest_size=16).digest()
+        bucket = int.from_bytes(digest[:8], "little") % self.buckets
+        return digest, bucket * WAYS, self._locks[bucket % len(self._locks)]
+
+    def _find(self, digest: bytes, first: int, generation: int) -> int:
+        """묶음 안에서 같은 키의 칸 번호 (없으면 -1, 잠금을 잡은 상태에서 호출)"""
+        for slot in range(first, first + WAYS):
+            slot_digest, slot_generation, _, _, _ = _HEADER.unpack_from(self._headers, slot * _HEADER.size)
+            if slot_generation == generation and slot_digest == digest:
+                return slot
+        return -1
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """값 조회 (만료된 항목은 비우고 default 반환)"""
+        digest, first, lock = self._locate(key)
+        now = time.monotonic()
+        data = None
+        with lock:
+            generation = self._generation()
+            slot = self._find(digest, first, generation)
+            if slot >= 0:
+                offset = slot * _HEADER.size
+                _, _, length, expires, _ = _HEADER.unpack_from(self._headers, offset)
+                if expires <= now:
+                    _HEADER.pack_into(self._headers, offset, b"", 0, 0, 0.0, 0.0)
+                else:
+                    _HEADER.pack_into(self._headers, offset, digest, generation, length, expires, now)
+                    data = self._values[slot * self.slot_bytes:slot * self.slot_bytes + length]
+        if data is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return pickle.loads(data)
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """값 저장 (묶음이 가득 차면 가장 오래 사용하지 않은 칸 교체, slot_bytes 초과 값은 저장하지 않음)"""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(data) > self.slot_bytes:
+            self.oversize += 1
+            return
+        ttl = self.ttl if ttl is None else ttl
+        now = time.monotonic()
+        expires = now + ttl if ttl is not None else math.inf
+        digest, first, lock = self._locate(key)
+        with lock:
+            generation = self._generation()
+            slot = self._find(digest, first, generation)
+            if slot < 0:
+                slot, oldest = first, math.inf
+                for candidate in range(first, first + WAYS):
+                    _, slot_generation, _, slot_expires, used = _HEADER.unpack_from(self._headers, candidate * _HEADER.size)
+                    if slot_generation != generation or slot_expires <= now:
+                        slot, oldest = candidate, None
+                        break
+                    if used < oldest:
+                        slot, oldest = candidate, used
+                if oldest is not None:
+                    self.evictions += 1
+            start = slot * self.slot_bytes
+            self._values[start:start + len(data)] = data
+            _HEADER.pack_into(self._headers, slot * _HEADER.size, digest, generation, len(data), expires, now)
+
+    def delete(self, key: Hashable):
+        digest, first, lock = self._locate(key)
+        with lock:
+            slot = self._find(digest, first, self._generation())
+            if slot >= 0:
+                _HEADER.pack_into(self._headers, slot * _HEADER.size, b"", 0, 0, 0.0, 0.0)
+
+    def clear(self):
+        """모든 워커의 항목 무효화 (세대 번호 증가)"""
+        with self._clear_lock:
+            # 0 은 빈 칸 표시이므로 건너뜀
+            _GENERATION.pack_into(self._control, 0, self._generation() % 0xFFFFFFFF + 1)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": "shared",
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "slot_bytes": self.slot_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "oversize": self.oversize,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
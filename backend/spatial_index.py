@@ -0,0 +1,235 @@
+# spatial_index.py
+import math
+import os
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from geo import calculate_distance, EARTH_RADIUS_KM
+from risk import ZoneArrays
+
+# 격자 한 칸에 들어갈 평균 위험지역 수 (격자 크기 자동 계산용)
+TARGET_ZONES_PER_CELL = 8
+MIN_CELL_KM = 0.05
+
+
+class LinearZoneIndex:
+    """기존 방식: 모든 위험지역을 순회하는 인덱스 (소규모 데이터/검증용)"""
+
+    def __init__(self, zones):
+        self.zones = zones.rows(range(len(zones))) if isinstance(zones, ZoneArrays) else list(zones)
+
+    def __len__(self):
+        return len(self.zones)
+
+    def nearest(self, lat: float, lng: float) -> Tuple[Optional[dict], float]:
+        """가장 가까운 위험지역과 거리(km) 반환"""
+        min_distance = float('inf')
+        nearest_zone = None
+        for zone in self.zones:
+            distance = calculate_distance(lat, lng, zone["lat"], zone["lng"])
+            if distance < min_distance:
+                min_distance = distance
+                nearest_zone = zone
+        return nearest_zone, min_distance
+
+    def within(self, lat: float, lng: float, radius_km: float) -> List[Tuple[dict, float]]:
+        """반경 내 위험지역 목록 반환 (원본 순서 유지)"""
+        result = []
+        for zone in self.zones:
+            distance = calculate_distance(lat, lng, zone["lat"], zone["lng"])
+            if distance <= radius_km:
+                result.append((zone, distance))
+        return result
+
+    def in_bbox(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> List[int]:
+        """경계 상자 안 위험지역 번호 목록 (원본 순서)"""
+        return [
+            i for i, zone in enumerate(self.zones)
+            if min_lat <= zone["lat"] <= max_lat and min_lng <= zone["lng"] <= max_lng
+        ]
+
+
+class GridZoneIndex:
+    """평면 투영 좌표 기반 균일 격자 인덱스
+
+    위경도를 기준 위도에서 등장방형(equirectangular) 투영한 뒤 cell_km 크기의
+    격자로 나눠 두고, 질의 지점의 격자에서 바깥쪽으로 링을 넓혀 가며 탐색한다.
+    최종 거리는 기존과 같은 calculate_distance 로 계산하므로 결과는 순회 방식과 동일하다.
+
+    위험지역은 ZoneArrays 컬럼(메모리 매핑 가능)을 그대로 참조하고, 격자는 칸 키 순으로 정렬한
+    위험지역 번호 배열로 보관한다. 딕셔너리는 돌려주는 위험지역에 대해서만 만든다.
+    """
+
+    def __init__(self, zones, cell_km: Optional[float] = None):
+        self.zones = zones if isinstance(zones, ZoneArrays) else ZoneArrays(zones)
+        self._lats, self._lngs = self.zones.lat, self.zones.lng
+
+        if len(self.zones):
+            self._ref_cos = math.cos(math.radians(float(self._lats.mean())))
+            self._min_cos = min(math.cos(math.radians(float(lat))) for lat in (self._lats.min(), self._lats.max()))
+        else:
+            self._ref_cos = 1.0
+            self._min_cos = 1.0
+
+        self.cell_km = cell_km or self._auto_cell_km()
+
+        if len(self.zones):
+            x, y = self._cells_of(self._lats, self._lngs)
+            self._bounds = (int(x.min()), int(y.min()), int(x.max()), int(y.max()))
+            # 칸 키 = (x - min_x) * 높이 + (y - min_y): 같은 x 열의 칸들은 키가 이어짐
+            keys = self._key(x, y)
+            self._order = np.argsort(keys, kind="stable")
+            self._keys = keys[self._order]
+        else:
+            self._bounds = (0, 0, 0, 0)
+            self._order = self._keys = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.zones)
+
+    def _project(self, lat: float, lng: float) -> Tuple[float, float]:
+        x = EARTH_RADIUS_KM * math.radians(lng) * self._ref_cos
+        y = EARTH_RADIUS_KM * math.radians(lat)
+        return x, y
+
+    def _cell_of(self, lat: float, lng: float) -> Tuple[int, int]:
+        x, y = self._project(lat, lng)
+        return math.floor(x / self.cell_km), math.floor(y / self.cell_km)
+
+    def _cells_of(self, lats: np.ndarray, lngs: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """_cell_of 의 배열 버전"""
+        x = EARTH_RADIUS_KM * np.radians(lngs) * self._ref_cos
+        y = EARTH_RADIUS_KM * np.radians(lats)
+        return np.floor(x / self.cell_km).astype(np.int64), np.floor(y / self.cell_km).astype(np.int64)
+
+    def _key(self, x, y):
+        min_x, min_y, _, max_y = self._bounds
+        return (x - min_x) * (max_y - min_y + 1) + (y - min_y)
+
+    def _column(self, x: int, low_y: int, high_y: int) -> np.ndarray:
+        """x 열에서 y 가 low_y~high_y 인 칸들의 위험지역 번호"""
+        lo = np.searchsorted(self._keys, self._key(x, low_y), side="left")
+        hi = np.searchsorted(self._keys, self._key(x, high_y), side="right")
+        return self._order[lo:hi]
+
+    def _auto_cell_km(self) -> float:
+        """데이터 범위와 개수로부터 격자 크기 결정"""
+        if len(self.zones) < 2:
+            return 1.0
+        min_x, min_y = self._project(float(self._lats.min()), float(self._lngs.min()))
+        max_x, max_y = self._project(float(self._lats.max()), float(self._lngs.max()))
+        area = max(max_x - min_x, MIN_CELL_KM) * max(max_y - min_y, MIN_CELL_KM)
+        cells = max(1.0, len(self.zones) / TARGET_ZONES_PER_CELL)
+        return max(MIN_CELL_KM, math.sqrt(area / cells))
+
+    def _scale(self, lat: float) -> float:
+        """투영 거리 대비 실제 거리의 하한 비율 (탐색 종료 조건용)"""
+        lowest = min(self._min_cos, math.cos(math.radians(lat)))
+        return min(1.0, lowest / self._ref_cos) * 0.99
+
+    def _ring(self, cx: int, cy: int, r: int):
+        """r 번째 링에 걸친 (x, low_y, high_y) 열 구간"""
+        min_x, min_y, max_x, max_y = self._bounds
+        if r == 0:
+            yield cx, cy, cy
+            return
+        for x in range(max(cx - r, min_x), min(cx + r, max_x) + 1):
+            if x in (cx - r, cx + r):
+                # 링의 왼쪽/오른쪽 변은 열 전체
+                yield x, max(cy - r, min_y), min(cy + r, max_y)
+            else:
+                if min_y <= cy - r <= max_y:
+                    yield x, cy - r, cy - r
+                if min_y <= cy + r <= max_y:
+                    yield x, cy + r, cy + r
+
+    def _candidates(self, indices: np.ndarray):
+        return zip(indices.tolist(), self._lats[indices].tolist(), self._lngs[indices].tolist())
+
+    def nearest(self, lat: float, lng: float) -> Tuple[Optional[dict], float]:
+        """가장 가까운 위험지역과 거리(km) 반환"""
+        if not len(self.zones):
+            return None, float('inf')
+
+        cx, cy = self._cell_of(lat, lng)
+        min_x, min_y, max_x, max_y = self._bounds
+        # 격자 범위 밖의 질의는 범위 경계의 링부터 탐색
+        start = max(0, cx - max_x, min_x - cx, cy - max_y, min_y - cy)
+        last = max(cx - min_x, max_x - cx, cy - min_y, max_y - cy)
+        scale = self._scale(lat)
+
+        best_distance = float('inf')
+        best_index = -1
+        for r in range(start, last + 1):
+            for x, low_y, high_y in self._ring(cx, cy, r):
+                if low_y > high_y:
+                    continue
+                for i, zone_lat, zone_lng in self._candidates(self._column(x, low_y, high_y)):
+                    distance = calculate_distance(lat, lng, zone_lat, zone_lng)
+                    # 거리가 같으면 원본 순서가 앞선 지역 우선 (순회 방식과 동일)
+                    if distance < best_distance or (distance == best_distance and i < best_index):
+                        best_distance = distance
+                        best_index = i
+            # 다음 링의 모든 지점은 최소 r * cell_km 이상 떨어져 있음
+            if best_index >= 0 and best_distance <= r * self.cell_km * scale:
+                break
+
+        return self.zones.row(best_index), best_distance
+
+    def within(self, lat: float, lng: float, radius_km: float) -> List[Tuple[dict, float]]:
+        """반경 내 위험지역 목록 반환 (원본 순서 유지)"""
+        if not len(self.zones):
+            return []
+
+        cx, cy = self._cell_of(lat, lng)
+        reach = math.ceil(radius_km / (self.cell_km * self._scale(lat))) + 1
+        min_x, min_y, max_x, max_y = self._bounds
+        low_y, high_y = max(cy - reach, min_y), min(cy + reach, max_y)
+        if low_y > high_y:
+            return []
+
+        found = []
+        for x in range(max(cx - reach, min_x), min(cx + reach, max_x) + 1):
+            for i, zone_lat, zone_lng in self._candidates(self._column(x, low_y, high_y)):
+                distance = calculate_distance(lat, lng, zone_lat, zone_lng)
+                if distance <= radius_km:
+                    found.append((i, distance))
+        found.sort()
+        rows = self.zones.rows([i for i, _ in found])
+        return [(row, distance) for row, (_, distance) in zip(rows, found)]
+
+    def in_bbox(self, min_lat: float, min_lng: float, max_lat: float, max_lng: float) -> List[int]:
+        """경계 상자 안 위험지역 번호 목록 (원본 순서)"""
+        if not len(self.zones):
+            return []
+
+        # x 는 경도, y 는 위도만으로 정해지므로 상자 모서리의 격자 범위만 보면 됨
+        low_x, low_y = self._cell_of(min_lat, min_lng)
+        high_x, high_y = self._cell_of(max_lat, max_lng)
+        min_x, min_y, max_x, max_y = self._bounds
+        low_y, high_y = max(low_y, min_y), min(high_y, max_y)
+        if low_y > high_y:
+            return []
+
+        columns = [self._column(x, low_y, high_y) for x in range(max(low_x, min_x), min(high_x, max_x) + 1)]
+        if not columns:
+            return []
+        indices = np.concatenate(columns)
+        lats, lngs = self._lats[indices], self._lngs[indices]
+        inside = (min_lat <= lats) & (lats <= max_lat) & (min_lng <= lngs) & (lngs <= max_lng)
+        return np.sort(indices[inside]).tolist()
+
+
+ZONE_INDEX_TYPES = {
+    "grid": GridZoneIndex,
+    "linear": LinearZoneIndex,
+}
+
+
+def build_zone_index(zones, kind: Optional[str] = None):
+    """설정(ZONE_INDEX 환경변수)에 따른 공간 인덱스 생성"""
+    kind = kind or os.getenv("ZONE_INDEX", "grid")
+    if kind not in ZONE_INDEX_TYPES:
+        raise ValueError(f"지원하지 않는 공간 인덱스 종류: {kind}")
+    return ZONE_INDEX_TYPES[kind](zones)
@@ -0,0 +1,107 @@
+# structured_log.py
+"""비동기(논블로킹) 구조화 로그
+
+요청 처리 코드는 QueueHandler 로 큐에 레코드만 넣고, 별도 스레드(QueueListener)가
+한 줄에 하나씩 JSON 으로 표준 에러에 쓴다. 터미널/파일 쓰기가 느려도 이벤트 루프가 멈추지 않는다.
+
+    log = get_logger("search")
+    log.info("kakao_search", query=query, results=3)
+"""
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# 쓰기 스레드가 밀릴 때 큐에 쌓아 둘 최대 레코드 수 (넘치면 버림)
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+_ROOT = "sinkhole"
+
+
+class JsonFormatter(logging.Formatter):
+    """{"ts", "level", "logger", "event", ...fields} 한 줄 JSON"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "event": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _DroppingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 기다리지 않고 버린 개수만 센다"""
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 메시지/예외는 지금 문자열로 만들어 두고 필드는 그대로 넘김 (기본 구현은 예외를 메시지에 합침)
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            type(self).dropped += 1
+
+
+_listener = None
+
+
+def start_logging(stream=None):
+    """로그 쓰기 스레드 시작 (이미 시작했으면 무시)"""
+    global _listener
+    if _listener is not None:
+        return
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(JsonFormatter())
+    log_queue = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+    root = logging.getLogger(_ROOT)
+    root.setLevel(LOG_LEVEL)
+    root.propagate = False
+    root.addHandler(_DroppingQueueHandler(log_queue))
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging():
+    """큐에 남은 로그를 모두 쓰고 쓰기 스레드 종료"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    root = logging.getLogger(_ROOT)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """log.info("이벤트", 키=값, ...) 형태로 필드를 받는 로거"""
+
+    _RESERVED = ("exc_info", "stack_info", "stacklevel", "extra")
+
+    def process(self, msg, kwargs):
+        fields = {key: kwargs.pop(key) for key in list(kwargs) if key not in self._RESERVED}
+        kwargs["extra"] = {"fields": fields}
+        return msg, kwargs
+
+
+def get_logger(name: str) -> StructuredLogger:
+    start_logging()
+    return StructuredLogger(logging.getLogger(f"{_ROOT}.{name}"), {})
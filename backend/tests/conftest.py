@@ -0,0 +1,18 @@
+# conftest.py
+"""backend 모듈을 import 할 수 있게 경로를 잡고, DB/타일 캐시/위험지역 저장소는 임시 디렉터리를 쓴다
+
+사용법 (backend 디렉터리에서):
+    python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+_workdir = tempfile.mkdtemp(prefix="sinkhole-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_workdir, 'test.db')}")
+os.environ.setdefault("RISK_TILE_CACHE_DIR", os.path.join(_workdir, "tiles"))
+os.environ.setdefault("ZONE_STORE_DIR", os.path.join(_workdir, "zone_store"))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
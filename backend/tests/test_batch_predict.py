@@ -0,0 +1,31 @@
+# test_batch_predict.py
+"""일괄 예측 본문에 NaN/inf 좌표가 있으면 형식과 관계없이 422로 거절하는지 확인"""
+import asyncio
+
+import httpx
+import numpy as np
+
+import main
+
+
+def post_batch(content: bytes, content_type: str) -> httpx.Response:
+    async def send():
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.post("/predict-risk/batch", content=content, headers={"content-type": content_type})
+
+    return asyncio.run(send())
+
+
+def test_packed_non_finite_rejected(monkeypatch):
+    monkeypatch.setattr(main, "ready", True)
+    for bad in (np.nan, np.inf, -np.inf):
+        body = np.array([[37.5665, 126.978], [bad, 126.978]], dtype="<f8").tobytes()
+        response = post_batch(body, "application/octet-stream")
+        assert response.status_code == 422
+
+
+def test_json_non_finite_rejected(monkeypatch):
+    monkeypatch.setattr(main, "ready", True)
+    response = post_batch(b'[{"latitude": 37.5665, "longitude": NaN}]', "application/json")
+    assert response.status_code == 422
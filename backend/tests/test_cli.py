@@ -0,0 +1,52 @@
+# test_cli.py
+"""오프라인 도구(타일/경로 인덱스 사전 생성)가 웹 앱 없이 실행되는지 확인"""
+import os
+import subprocess
+import sys
+
+from conftest import BACKEND_DIR
+from risk_model import TierModel
+from road_graph import RoadGraph
+
+
+def run_cli(*args, env=None):
+    return subprocess.run([sys.executable, *args], cwd=BACKEND_DIR, env={**os.environ, **(env or {})},
+                          capture_output=True, text=True, timeout=300)
+
+
+def make_graph(path: str):
+    # 명동 주변 3 x 3 격자
+    coords = {row * 3 + col: (37.560 + row * 0.005, 126.970 + col * 0.005) for row in range(3) for col in range(3)}
+    ways = [[row * 3, row * 3 + 1, row * 3 + 2] for row in range(3)] + [[col, col + 3, col + 6] for col in range(3)]
+    RoadGraph.from_ways(ways, coords).save(path)
+
+
+def test_risk_tiles_cli(tmp_path):
+    result = run_cli("risk_tiles.py", "--min-zoom", "10", "--max-zoom", "10",
+                     env={"RISK_TILE_CACHE_DIR": str(tmp_path / "tiles")})
+    assert result.returncode == 0, result.stderr
+    assert "타일 생성 완료" in result.stdout
+    assert any(name.endswith(".png") for _, _, files in os.walk(tmp_path / "tiles") for name in files)
+
+
+def test_risk_tiles_cli_zone_file(tmp_path):
+    zones = tmp_path / "zones.csv"
+    zones.write_text("lat,lng,risk,name\n37.5665,126.978,0.9,명동\n", encoding="utf-8")
+    result = run_cli("risk_tiles.py", "--min-zoom", "10", "--max-zoom", "10", "--zones", str(zones),
+                     env={"RISK_TILE_CACHE_DIR": str(tmp_path / "tiles"), "ZONE_STORE_DIR": str(tmp_path / "store")})
+    assert result.returncode == 0, result.stderr
+
+
+def test_route_index_cli(tmp_path):
+    graph_path = str(tmp_path / "graph.npz")
+    make_graph(graph_path)
+    result = run_cli("route_index.py", graph_path, str(tmp_path / "index"))
+    assert result.returncode == 0, result.stderr
+    assert os.path.exists(tmp_path / "index" / "meta.json")
+    # 저장한 인덱스를 같은 그래프로 다시 읽을 수 있어야 함
+    from route_index import RouteIndex
+    from zone_store import load_zone_arrays
+    graph = RoadGraph.load(graph_path)
+    graph.set_risk_weights(load_zone_arrays(None), TierModel())
+    index = RouteIndex.load(str(tmp_path / "index"), graph)
+    assert index.route(37.560, 126.970, 37.570, 126.980) is not None
@@ -0,0 +1,61 @@
+# test_geofence.py
+"""지오펜스 미리 계산(warm)이 위험지역 영향 거리 안의 칸을 모두 덮고 지연 계산과 같은 값을 내는지 확인"""
+import numpy as np
+
+from geofence import GeofenceIndex, TrackSession
+from risk import KM_PER_DEGREE, RISK_INFLUENCE_KM, ZoneArrays
+from risk_model import TierModel
+
+
+def make_zones(count: int, seed: int) -> ZoneArrays:
+    rng = np.random.default_rng(seed)
+    lat = rng.uniform(37.45, 37.65, count)
+    lng = rng.uniform(126.85, 127.15, count)
+    risk = rng.uniform(0.0, 1.0, count)
+    return ZoneArrays([{"lat": a, "lng": b, "risk": c} for a, b, c in zip(lat.tolist(), lng.tolist(), risk.tolist())])
+
+
+def points_near(zones: ZoneArrays, seed: int, count: int = 500):
+    """위험지역에서 영향 거리보다 조금 가까운 임의 좌표"""
+    rng = np.random.default_rng(seed)
+    pick = rng.integers(0, len(zones), count)
+    angle = rng.uniform(0, 2 * np.pi, count)
+    reach = rng.uniform(0, RISK_INFLUENCE_KM * 0.99, count) / KM_PER_DEGREE
+    lats = zones.lat[pick] + reach * np.sin(angle)
+    lngs = zones.lng[pick] + reach * np.cos(angle) / np.cos(np.radians(lats))
+    return lats.tolist(), lngs.tolist()
+
+
+def test_warm_covers_influence_radius():
+    zones = make_zones(300, seed=1)
+    index = GeofenceIndex(TierModel(), zones, version=1)
+    assert index.warm() == len(index) > 0
+
+    lazy = GeofenceIndex(TierModel(), zones, version=1)
+    for lat, lng in zip(*points_near(zones, seed=2)):
+        cell = index.cached(lat, lng)
+        assert cell is not None
+        assert cell == lazy.lookup(lat, lng)
+    assert index.computed == 0
+
+
+def test_warm_many_zones():
+    # 칸 수 x 위험지역 수가 커도 건너뛰지 않고 덮는 칸만 계산
+    zones = make_zones(5000, seed=3)
+    index = GeofenceIndex(TierModel(), zones, version=1)
+    assert index.warm() > 0
+    lats, lngs = points_near(zones, seed=4, count=200)
+    assert all(index.cached(lat, lng) is not None for lat, lng in zip(lats, lngs))
+
+
+def test_track_session_lookup_only_on_cell_change():
+    zones = make_zones(50, seed=5)
+    index = GeofenceIndex(TierModel(), zones, version=1)
+    session = TrackSession()
+    lat, lng = float(zones.lat[0]), float(zones.lng[0])
+    assert not session.contains(index, lat, lng)
+    session.enter(index, index.lookup(lat, lng))
+    assert session.contains(index, lat, lng)
+    # 다른 버전의 색인이면 같은 칸이어도 다시 조회
+    assert not session.contains(GeofenceIndex(TierModel(), zones, version=2), lat, lng)
+    assert index.cached(0.0, 0.0) is None
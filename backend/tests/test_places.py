@@ -0,0 +1,56 @@
+# test_places.py
+"""여러 워커가 같은 장소를 저장해도 Location 행이 하나만 남는지 확인"""
+import asyncio
+
+from sqlalchemy import create_engine, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from database import Base, upgrade_schema
+from gazetteer import save_places
+from models import Location
+
+PLACES = [
+    {"place_name": "명동역", "y": "37.5609", "x": "126.9863", "address_name": "서울 중구 충무로2가"},
+    {"place_name": "시청역", "y": "37.5657", "x": "126.9769"},
+]
+
+
+def location_count(engine) -> int:
+    with engine.connect() as connection:
+        return connection.execute(select(func.count()).select_from(Location.__table__)).scalar_one()
+
+
+def test_save_places_skips_duplicates(tmp_path):
+    path = tmp_path / "places.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    session_factory = async_sessionmaker(async_engine, class_=AsyncSession)
+
+    async def save_concurrently():
+        # 같은 검색 결과를 여러 워커가 동시에 저장하는 경우
+        await asyncio.gather(*(save_places(PLACES, "kakao_keyword", session_factory) for _ in range(4)))
+        await save_places(PLACES + PLACES, "kakao_keyword", session_factory)
+        await async_engine.dispose()
+
+    asyncio.run(save_concurrently())
+    assert location_count(engine) == len(PLACES)
+
+
+def test_upgrade_schema_removes_existing_duplicates(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    # 고유 인덱스가 없던 이전 스키마에 쌓인 중복 행
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE locations (id INTEGER PRIMARY KEY, name VARCHAR NOT NULL, "
+                                "latitude FLOAT NOT NULL, longitude FLOAT NOT NULL)"))
+        for name, lat, lng in [("명동역", 37.5609, 126.9863)] * 3 + [("시청역", 37.5657, 126.9769)]:
+            connection.execute(text("INSERT INTO locations (name, latitude, longitude) VALUES (:name, :lat, :lng)"),
+                               {"name": name, "lat": lat, "lng": lng})
+
+    Base.metadata.create_all(bind=engine)
+    upgrade_schema(engine, Base.metadata)
+
+    with engine.connect() as connection:
+        ids = connection.execute(text("SELECT id FROM locations ORDER BY id")).scalars().all()
+    # 키마다 가장 먼저 저장된 행만 남음
+    assert ids == [1, 4]
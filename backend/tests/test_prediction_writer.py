@@ -0,0 +1,64 @@
+# test_prediction_writer.py
+"""종료 시 저장이 실패해도 재시도하고, 끝내 실패한 행은 버린 수를 남기는지 확인"""
+import asyncio
+
+import prediction_writer
+from prediction_writer import PredictionWriter
+
+
+class FlakySession:
+    """처음 failures 번은 실패하고 그 뒤로는 저장된 행을 모으는 가짜 세션"""
+
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.rows = []
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement, rows):
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("database unavailable")
+        self.rows.extend(rows)
+
+    async def commit(self):
+        pass
+
+
+def run_stop(session: FlakySession, rows: int, timeout: float) -> PredictionWriter:
+    async def scenario():
+        # 주기 저장이 끼어들지 않도록 간격을 길게
+        writer = PredictionWriter(session_factory=session, flush_rows=10_000, flush_ms=60_000)
+        writer.start()
+        for i in range(rows):
+            writer.submit(1, 37.5 + i * 1e-4, 127.0, 0.5)
+        await writer.stop(timeout=timeout)
+        return writer
+
+    return asyncio.run(scenario())
+
+
+def test_stop_retries_failed_flush(monkeypatch):
+    monkeypatch.setattr(prediction_writer, "STOP_RETRY_DELAY", 0.01)
+    session = FlakySession(failures=3)
+    writer = run_stop(session, rows=5, timeout=5)
+    assert len(session.rows) == 5
+    assert writer.stats()["failures"] == 3 and writer.stats()["dropped"] == 0
+
+
+def test_stop_gives_up_after_deadline(monkeypatch):
+    monkeypatch.setattr(prediction_writer, "STOP_RETRY_DELAY", 0.01)
+    errors = []
+    monkeypatch.setattr(prediction_writer.log, "error", lambda event, **fields: errors.append((event, fields)))
+    session = FlakySession(failures=10_000)
+    writer = run_stop(session, rows=7, timeout=0.2)
+    assert session.rows == []
+    assert writer.stats()["pending"] == 0 and writer.stats()["dropped"] == 7
+    assert errors and errors[0][0] == "prediction_rows_lost" and errors[0][1]["rows"] == 7
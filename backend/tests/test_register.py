@@ -0,0 +1,25 @@
+# test_register.py
+"""같은 이메일로 동시에 가입해도 하나만 성공하고 나머지는 400 인지 확인"""
+import asyncio
+
+import httpx
+
+import main
+
+
+def test_concurrent_registration(monkeypatch):
+    main.init_schema()
+    monkeypatch.setattr(main, "ready", True)
+    body = {"email": "race@example.com", "name": "race", "password": "pw123456"}
+
+    async def register_all(count: int) -> list:
+        transport = httpx.ASGITransport(app=main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            # 모두 중복 확인을 통과한 뒤 해시 계산 중에 겹치도록 동시에 보냄
+            return await asyncio.gather(*(client.post("/register", json=body) for _ in range(count)))
+
+    responses = asyncio.run(register_all(5))
+    statuses = sorted(response.status_code for response in responses)
+    assert statuses == [200, 400, 400, 400, 400]
+    assert all(response.json() == {"detail": "Email already registered"}
+               for response in responses if response.status_code == 400)
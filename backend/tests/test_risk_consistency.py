@@ -0,0 +1,78 @@
+# test_risk_consistency.py
+"""위험도 타일, 경로 가중치, /predict-risk 가 같은 위험도 모델 점수를 쓰는지 확인"""
+import numpy as np
+import pytest
+
+from risk import ZoneArrays
+from risk_model import LinearModel, TierModel
+from risk_tiles import TILE_SIZE, RiskTileCache, lat_to_tile, lng_to_tile, render_tile
+from road_graph import RoadGraph
+from route_risk import densify, score_routes
+from zone_store import load_zone_arrays
+
+MODELS = [
+    TierModel(),
+    LinearModel(["nearest_distance_km", "nearest_risk", "risk_density"], [-1.5, 2.0, 0.8], bias=0.2),
+]
+
+
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: model.name)
+def test_tile_pixels_match_model_score(model):
+    zones = load_zone_arrays(None)
+    z = 13
+    x, y = int(lng_to_tile(z, 126.978)), int(lat_to_tile(z, 37.5665))
+    tile = render_tile(zones, model, z, x, y)
+
+    offsets = (np.arange(TILE_SIZE) + 0.5) / TILE_SIZE
+    lngs = (x + offsets) / (1 << z) * 360.0 - 180.0
+    lats = np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * (y + offsets) / (1 << z)))))
+    lat_grid, lng_grid = np.meshgrid(lats, lngs, indexing="ij")
+    expected = 1 + np.round(model.score(lat_grid.ravel(), lng_grid.ravel(), zones) * 254).astype(np.uint8)
+    np.testing.assert_array_equal(tile.ravel(), expected)
+
+
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: model.name)
+def test_far_tile_follows_zone_update(model, tmp_path):
+    zones = [{"lat": 37.5665, "lng": 126.978, "risk": 0.5}, {"lat": 37.50, "lng": 127.05, "risk": 0.8}]
+    cache = RiskTileCache(ZoneArrays(zones), model, str(tmp_path))
+    # 첫 위험지역에서 북쪽으로 약 3.3km, 2km 넘게 떨어진 타일
+    z = 15
+    x, y = int(lng_to_tile(z, 126.978)), int(lat_to_tile(z, 37.5965))
+    with open(cache.tile_path(z, x, y, "raw"), "rb") as f:
+        before = f.read()
+
+    updated = [dict(zones[0], risk=0.9), zones[1]]
+    cache.update_zones(ZoneArrays(updated), [zones[0], updated[0]])
+    with open(cache.tile_path(z, x, y, "raw"), "rb") as f:
+        after = f.read()
+    np.testing.assert_array_equal(np.frombuffer(after, dtype=np.uint8).reshape(TILE_SIZE, TILE_SIZE),
+                                  render_tile(ZoneArrays(updated), model, z, x, y))
+    # 거리 제한이 있는 모델(TierModel)은 영향 거리 밖 타일이 그대로, 최근접 위험도를 쓰는 모델은 달라짐
+    assert (before == after) == (model.reach_km is not None)
+
+
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: model.name)
+def test_route_weights_match_model_score(model):
+    zones = load_zone_arrays(None)
+    # 명동 위험지역 근처 간선 + 2km 넘게 떨어진 간선
+    coords = {1: (37.5630, 126.9830), 2: (37.5640, 126.9850), 3: (37.6500, 127.1000), 4: (37.6510, 127.1010)}
+    graph = RoadGraph.from_ways([[1, 2], [3, 4]], coords)
+    graph.set_risk_weights(zones, model)
+
+    point_scores = model.score(graph.geom_lat, graph.geom_lng, zones)
+    expected = np.maximum.reduceat(point_scores, graph.geom_offsets[:-1])
+    # 영향 거리 밖 간선도 /predict-risk, 타일과 같은 점수 (0 으로 가리지 않음)
+    np.testing.assert_allclose(graph.edge_risk, expected)
+    assert graph.edge_risk[0] > graph.edge_risk[1]
+
+
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: model.name)
+def test_route_scores_bounded(model):
+    zones = load_zone_arrays(None)
+    # 시청 주변 위험지역이 몰린 경로 (거리 감쇠 합으로 채점하면 1을 넘던 경로)
+    route = [{"lat": 37.57, "lng": 126.978}, {"lat": 37.56, "lng": 126.978}]
+    [score] = score_routes([route], zones, model)
+    assert 0.0 <= score["risk_exposure"] <= score["peak_risk"] <= 1.0
+
+    lats, lngs, _ = densify(np.array([37.57, 37.56]), np.array([126.978, 126.978]), 0.025)
+    assert score["peak_risk"] == pytest.approx(model.score(lats, lngs, zones).max(), abs=1e-6)
@@ -0,0 +1,89 @@
+# test_risk_features.py
+"""격자 후보로 계산한 위험도 특징/점수가 전체 거리 행렬(brute force) 계산과 같은지 확인"""
+import numpy as np
+import pytest
+
+from risk import (DENSITY_SCALE_KM, FEATURE_NAMES, NEAREST_SCAN_ZONES, RISK_INFLUENCE_KM, ZoneArrays,
+                  haversine_matrix, zone_features)
+from risk_model import LinearModel, TierModel
+
+
+def brute_force_features(lats, lngs, zones: ZoneArrays) -> np.ndarray:
+    matrix = haversine_matrix(lats, lngs, zones)
+    nearest = matrix.argmin(axis=1)
+    features = np.zeros((len(lats), len(FEATURE_NAMES)))
+    features[:, 0] = matrix[np.arange(len(lats)), nearest]
+    features[:, 1] = zones.risk[nearest]
+    features[:, 2] = (matrix < 1.0).sum(axis=1)
+    features[:, 3] = (matrix < 2.0).sum(axis=1)
+    kernel = np.where(matrix < RISK_INFLUENCE_KM, np.exp(-matrix / DENSITY_SCALE_KM), 0.0)
+    features[:, 4] = (zones.risk[None, :] * kernel).sum(axis=1)
+    return features
+
+
+def make_zones(count: int, seed: int) -> ZoneArrays:
+    rng = np.random.default_rng(seed)
+    # 서울 일부에 몰린 지역 + 흩어진 지역, 같은 좌표 중복(최근접 동률)
+    lat = np.concatenate([rng.normal(37.55, 0.01, count // 2), rng.uniform(37.42, 37.70, count - count // 2)])
+    lng = np.concatenate([rng.normal(126.98, 0.01, count // 2), rng.uniform(126.75, 127.25, count - count // 2)])
+    lat[1], lng[1] = lat[0], lng[0]
+    risk = rng.uniform(0.0, 1.0, count)
+    return ZoneArrays([{"lat": a, "lng": b, "risk": c} for a, b, c in zip(lat.tolist(), lng.tolist(), risk.tolist())])
+
+
+def make_points(zones: ZoneArrays, seed: int):
+    rng = np.random.default_rng(seed)
+    lats = np.concatenate([
+        rng.uniform(37.40, 37.72, 400),
+        zones.lat[:20] + rng.normal(0, 0.005, 20),
+        zones.lat[:1],  # 중복 지역 좌표 그대로
+        [37.0, 38.5, 0.0, -33.9],  # 격자 범위 밖
+    ])
+    lngs = np.concatenate([
+        rng.uniform(126.70, 127.30, 400),
+        zones.lng[:20] + rng.normal(0, 0.005, 20),
+        zones.lng[:1],
+        [127.0, 126.9, 0.0, 151.2],
+    ])
+    return lats, lngs
+
+
+@pytest.mark.parametrize("count", [20, NEAREST_SCAN_ZONES + 1, 3000])
+def test_features_match_brute_force(count):
+    zones = make_zones(count, seed=count)
+    lats, lngs = make_points(zones, seed=1)
+    expected = brute_force_features(lats, lngs, zones)
+    actual = zone_features(lats, lngs, zones)
+    np.testing.assert_array_equal(actual[:, :4], expected[:, :4])
+    np.testing.assert_allclose(actual[:, 4], expected[:, 4], rtol=1e-12, atol=1e-12)
+
+
+@pytest.mark.parametrize("model", [
+    TierModel(),
+    LinearModel(list(FEATURE_NAMES), [-1.5, 2.0, 0.05, 0.02, 0.3], bias=0.1),
+])
+def test_scores_match_brute_force(model):
+    zones = make_zones(3000, seed=7)
+    lats, lngs = make_points(zones, seed=2)
+    expected = np.clip(model.predict(brute_force_features(lats, lngs, zones)), 0.0, 1.0)
+    actual = model.score(lats, lngs, zones)
+    if isinstance(model, TierModel):
+        # 2km 밖 지점은 칸별 고정 값으로 채워짐
+        near = ~np.isnan(expected)
+        np.testing.assert_array_equal(actual[near], expected[near])
+        assert ((actual[~near] >= 0.1) & (actual[~near] <= 0.3)).all()
+    else:
+        np.testing.assert_allclose(actual, expected, rtol=1e-12, atol=1e-12)
+
+
+def test_features_independent_of_batch():
+    zones = make_zones(3000, seed=3)
+    lats, lngs = make_points(zones, seed=3)
+    together = zone_features(lats, lngs, zones)
+    for i in range(0, len(lats), 97):
+        np.testing.assert_array_equal(zone_features(lats[i:i + 1], lngs[i:i + 1], zones), together[i:i + 1])
+
+
+def test_no_zones():
+    features = zone_features(np.array([37.5]), np.array([127.0]), ZoneArrays([]))
+    assert features[0, 0] == 100.0 and (features[0, 1:] == 0).all()
@@ -0,0 +1,53 @@
+# test_route_index.py
+"""경로 탐색 중에 간선 비용이 바뀌어도(customize) 한 버전의 비용으로 계산한 최적 경로가 나오는지 확인"""
+import threading
+
+import numpy as np
+
+from road_graph import RoadGraph
+from route_index import RouteIndex
+
+SIZE = 12
+
+
+def make_grid() -> RoadGraph:
+    coords = {row * SIZE + col: (37.50 + row * 0.002, 126.95 + col * 0.002) for row in range(SIZE) for col in range(SIZE)}
+    ways = [[row * SIZE + col for col in range(SIZE)] for row in range(SIZE)]
+    ways += [[row * SIZE + col for row in range(SIZE)] for col in range(SIZE)]
+    return RoadGraph.from_ways(ways, coords)
+
+
+def path_cost(path: list, edge_cost: np.ndarray) -> float:
+    return float(sum(edge_cost[edge] for _, edge in path))
+
+
+def test_route_during_customize():
+    graph = make_grid()
+    rng = np.random.default_rng(7)
+    costs = [graph.edge_length * rng.uniform(1, 5, graph.num_edges) for _ in range(2)]
+    index = RouteIndex.build(graph)
+    pairs = [tuple(rng.integers(0, graph.num_nodes, 2).tolist()) for _ in range(30)]
+
+    best = []
+    for edge_cost in costs:
+        index.customize(edge_cost)
+        best.append([path_cost(index.shortest_path(s, t), edge_cost) for s, t in pairs])
+
+    stop = threading.Event()
+
+    def flip():
+        turn = 0
+        while not stop.is_set():
+            index.customize(costs[turn % 2])
+            turn += 1
+
+    worker = threading.Thread(target=flip)
+    worker.start()
+    try:
+        for _ in range(20):
+            for i, (s, t) in enumerate(pairs):
+                path = index.shortest_path(s, t)
+                assert any(np.isclose(path_cost(path, costs[k]), best[k][i]) for k in range(2))
+    finally:
+        stop.set()
+        worker.join()
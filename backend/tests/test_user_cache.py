@@ -0,0 +1,21 @@
+# test_user_cache.py
+"""CACHE_BACKEND=shared 인 사용자 캐시를 한 워커에서 무효화하면 다른 워커에도 반영되는지 확인"""
+import multiprocessing
+
+import auth
+from models import User
+from shared_cache import SharedCache
+
+
+def test_invalidation_reaches_other_workers(monkeypatch):
+    cache = SharedCache(maxsize=64, ttl=60, slot_bytes=auth.USER_CACHE_SLOT_BYTES)
+    monkeypatch.setattr(auth, "user_cache", cache)
+    cache.set("a@example.com", User(id=1, email="a@example.com", name="a", hashed_password="x", is_active=True))
+    assert cache.get("a@example.com").id == 1
+
+    # fork 한 워커에서 사용자 변경 이벤트로 무효화
+    worker = multiprocessing.get_context("fork").Process(target=auth.invalidate_user, args=("a@example.com",))
+    worker.start()
+    worker.join(timeout=30)
+    assert worker.exitcode == 0
+    assert cache.get("a@example.com") is None
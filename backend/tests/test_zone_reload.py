@@ -0,0 +1,51 @@
+# test_zone_reload.py
+"""위험지역 데이터 교체가 이벤트 루프를 막지 않고 한 번에 바뀌는지 확인"""
+import asyncio
+import random
+import time
+
+import main
+from risk import ZoneArrays
+
+
+def make_zones(count: int, seed: int) -> ZoneArrays:
+    rng = random.Random(seed)
+    return ZoneArrays([{"lat": rng.uniform(37.45, 37.65), "lng": rng.uniform(126.85, 127.15),
+                        "risk": rng.uniform(0.0, 1.0), "name": f"zone-{i}"} for i in range(count)])
+
+
+def test_update_risk_zones_swaps_state_off_loop():
+    main.load_resources()
+    previous = main.zone_state
+    zones = make_zones(2000, seed=3)
+
+    async def reload():
+        gaps, done = [], False
+
+        async def ticker():
+            last = time.perf_counter()
+            while not done:
+                await asyncio.sleep(0.005)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        task = asyncio.create_task(ticker())
+        await main.update_risk_zones(zones)
+        done = True
+        await task
+        return gaps
+
+    try:
+        gaps = asyncio.run(reload())
+        state = main.zone_state
+        assert state is not previous
+        assert state.version == previous.version + 1
+        assert state.arrays is zones and len(state.index) == len(zones)
+        assert state.geofence.version == state.version and state.geofence.zones is state.arrays
+        # 이전 상태는 그대로 (이미 읽어 간 요청은 한 버전만 봄)
+        assert len(previous.index) == len(previous.arrays)
+        # 재구성하는 동안에도 루프가 계속 돌아야 함
+        assert len(gaps) > 1 and max(gaps) < 0.5
+    finally:
+        asyncio.run(main.update_risk_zones(previous.arrays, version=previous.version))
@@ -0,0 +1,216 @@
+# zone_store.py
+"""버전이 붙은 위험지역 데이터셋 (CSV / Parquet / GeoJSON)
+
+원본 파일을 읽어 컬럼별 NumPy 배열(.npy)로 버전 디렉터리(v1, v2, ...)에 저장하고,
+CURRENT 파일이 현재 버전을 가리킨다. 각 uvicorn 워커는 같은 .npy 파일을 메모리 매핑으로
+공유하며, 원본이 바뀌면 먼저 확인한 워커가 새 버전을 만든 뒤 CURRENT 를 원자적으로 교체한다.
+
+파일 형식:
+    CSV      lat,lng,risk,name 헤더
+    Parquet  lat, lng, risk, name 컬럼 (pyarrow 필요)
+    GeoJSON  Point 피처, properties 에 risk, name
+"""
+import csv
+import json
+import os
+import shutil
+import tempfile
+from typing import Optional
+
+import numpy as np
+
+from risk import ZoneArrays
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# 위험지역 데이터 파일 (설정 시 더미 데이터 대신 사용, 서버는 파일이 바뀌면 자동 교체)
+ZONE_DATA_PATH = os.getenv("ZONE_DATA_PATH")
+ZONE_STORE_DIR = os.getenv("ZONE_STORE_DIR", "./zone_store")
+ZONE_RELOAD_INTERVAL = float(os.getenv("ZONE_RELOAD_INTERVAL", "5"))  # 초
+ZONE_COLUMNS = ("lat", "lng", "risk", "name")
+# 다른 워커가 아직 매핑 중일 수 있으므로 최근 버전 몇 개는 남겨 둠
+KEEP_VERSIONS = 3
+
+# 서울시 더미 위험지역 데이터 (실제 좌표 기반)
+DUMMY_RISK_ZONES = [
+    {"lat": 37.5665, "lng": 126.9780, "risk": 0.85, "name": "중구 명동"},
+    {"lat": 37.5663, "lng": 126.9779, "risk": 0.90, "name": "중구 명동 인근"},
+    {"lat": 37.5519, "lng": 126.9918, "risk": 0.78, "name": "강남구 논현동"},
+    {"lat": 37.5172, "lng": 127.0473, "risk": 0.82, "name": "강남구 삼성동"},
+    {"lat": 37.5794, "lng": 126.9770, "risk": 0.75, "name": "종로구 종로1가"},
+    {"lat": 37.5512, "lng": 126.9882, "risk": 0.88, "name": "서초구 서초동"},
+    {"lat": 37.5326, "lng": 126.9026, "risk": 0.73, "name": "영등포구 여의도동"},
+    {"lat": 37.5838, "lng": 127.0580, "risk": 0.80, "name": "성동구 성수동"},
+    {"lat": 37.5145, "lng": 126.9061, "risk": 0.77, "name": "관악구 신림동"},
+    {"lat": 37.6065, "lng": 127.0921, "risk": 0.84, "name": "동대문구 청량리동"},
+]
+
+
+def _read_csv(path: str) -> list:
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return [(row["lat"], row["lng"], row["risk"], row.get("name") or "") for row in csv.DictReader(f)]
+
+
+def _read_parquet(path: str) -> list:
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise RuntimeError("Parquet 파일을 읽으려면 pyarrow 를 설치하세요.")
+    table = pq.read_table(path).to_pydict()
+    names = table.get("name") or [""] * len(table["lat"])
+    return list(zip(table["lat"], table["lng"], table["risk"], names))
+
+
+def _read_geojson(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    rows = []
+    for feature in data.get("features", []):
+        geometry = feature.get("geometry") or {}
+        if geometry.get("type") != "Point":
+            continue
+        lng, lat = geometry["coordinates"][:2]
+        properties = feature.get("properties") or {}
+        rows.append((lat, lng, properties["risk"], properties.get("name") or ""))
+    return rows
+
+
+ZONE_READERS = {
+    ".csv": _read_csv,
+    ".parquet": _read_parquet,
+    ".geojson": _read_geojson,
+    ".json": _read_geojson,
+}
+
+
+def read_zone_file(path: str) -> dict:
+    """위험지역 파일 -> 컬럼 배열 (lat, lng, risk: float64, name: 유니코드 문자열)"""
+    ext = os.path.splitext(path)[1].lower()
+    if ext not in ZONE_READERS:
+        raise ValueError(f"지원하지 않는 위험지역 파일 형식입니다: {ext}")
+
+    rows = ZONE_READERS[ext](path)
+    columns = {
+        "lat": np.array([float(row[0]) for row in rows], dtype=np.float64),
+        "lng": np.array([float(row[1]) for row in rows], dtype=np.float64),
+        "risk": np.array([float(row[2]) for row in rows], dtype=np.float64),
+        "name": np.array([str(row[3]) for row in rows], dtype=np.str_),
+    }
+    for name in ("lat", "lng", "risk"):
+        if not np.isfinite(columns[name]).all():
+            raise ValueError(f"위험지역 {name} 값에 숫자가 아닌 값이 있습니다.")
+    if ((columns["risk"] < 0) | (columns["risk"] > 1)).any():
+        raise ValueError("위험도(risk)는 0~1 사이여야 합니다.")
+    return columns
+
+
+class ZoneSnapshot:
+    """한 버전의 위험지역 데이터 (컬럼 배열은 읽기 전용 메모리 매핑)"""
+
+    def __init__(self, version: int, columns: dict):
+        self.version = version
+        self.lat = columns["lat"]
+        self.lng = columns["lng"]
+        self.risk = columns["risk"]
+        self.name = columns["name"]
+        self.arrays = ZoneArrays.from_columns(self.lat, self.lng, self.risk, self.name)
+
+    def __len__(self):
+        return len(self.lat)
+
+
+class ZoneStore:
+    """원본 파일 변경을 감지해 새 버전을 만들고 워커 간 공유하는 위험지역 저장소"""
+
+    def __init__(self, source: str, store_dir: str = ZONE_STORE_DIR):
+        self.source = source
+        self.store_dir = store_dir
+        self.snapshot: Optional[ZoneSnapshot] = None
+        os.makedirs(store_dir, exist_ok=True)
+
+    def _version_dir(self, version: int) -> str:
+        return os.path.join(self.store_dir, f"v{version}")
+
+    def current_version(self) -> Optional[int]:
+        try:
+            with open(os.path.join(self.store_dir, "CURRENT"), encoding="utf-8") as f:
+                return int(f.read().strip())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def _source_signature(self) -> dict:
+        stat = os.stat(self.source)
+        return {"source": os.path.abspath(self.source), "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+    def _published_signature(self, version: Optional[int]) -> Optional[dict]:
+        if version is None:
+            return None
+        try:
+            with open(os.path.join(self._version_dir(version), "meta.json"), encoding="utf-8") as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            return None
+        return {key: meta.get(key) for key in ("source", "mtime_ns", "size")}
+
+    def publish(self) -> int:
+        """원본이 바뀌었으면 새 버전 스냅샷을 만들고 CURRENT 교체, 현재 버전 반환"""
+        with open(os.path.join(self.store_dir, ".lock"), "w") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+
+            # 잠금을 기다리는 동안 다른 워커가 이미 만들었을 수 있음
+            current = self.current_version()
+            signature = self._source_signature()
+            if current is not None and self._published_signature(current) == signature:
+                return current
+
+            columns = read_zone_file(self.source)
+            version = (current or 0) + 1
+            tmp_dir = tempfile.mkdtemp(dir=self.store_dir, prefix=".tmp-")
+            for name in ZONE_COLUMNS:
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), columns[name])
+            with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+                json.dump({"version": version, "count": len(columns["lat"]), **signature}, f)
+            shutil.rmtree(self._version_dir(version), ignore_errors=True)
+            os.replace(tmp_dir, self._version_dir(version))
+
+            fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, prefix=".tmp-")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(str(version))
+            os.replace(tmp_path, os.path.join(self.store_dir, "CURRENT"))
+
+            for old in range(version - KEEP_VERSIONS, 0, -1):
+                if not os.path.isdir(self._version_dir(old)):
+                    break
+                shutil.rmtree(self._version_dir(old), ignore_errors=True)
+            return version
+
+    def load(self, version: int) -> ZoneSnapshot:
+        path = self._version_dir(version)
+        columns = {name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r") for name in ZONE_COLUMNS}
+        return ZoneSnapshot(version, columns)
+
+    def refresh(self) -> bool:
+        """원본/CURRENT 변경 확인 후 새 스냅샷으로 교체 (교체했으면 True)"""
+        current = self.current_version()
+        if self._published_signature(current) != self._source_signature():
+            current = self.publish()
+        if self.snapshot is not None and self.snapshot.version == current:
+            return False
+        self.snapshot = self.load(current)
+        return True
+
+
+def load_zone_arrays(source: Optional[str] = ZONE_DATA_PATH) -> ZoneArrays:
+    """현재 위험지역 배열 (source 가 있으면 저장소의 최신 버전, 없으면 더미 데이터)
+
+    타일/경로 인덱스 사전 생성 같은 오프라인 도구용 (웹 앱을 import 하지 않음)
+    """
+    if not source:
+        return ZoneArrays(DUMMY_RISK_ZONES)
+    store = ZoneStore(source)
+    store.refresh()
+    return store.snapshot.arrays
@@ -123,6 +123,14 @@ const RiskMap = () => {
             url="https://{s}.tile.openstreetmap.org/{z}/{x}/{y}.png"
             attribution='&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors'
           />
+
+          {/* 서버에서 미리 계산한 위험도 타일 */}
+          <TileLayer
+            url="/risk-tiles/{z}/{x}/{y}"
+            minZoom={8}
+            maxNativeZoom={16}
+            opacity={0.5}
+          />
           
           <LocationMarker onLocationFound={setSelectedLocation} />
           